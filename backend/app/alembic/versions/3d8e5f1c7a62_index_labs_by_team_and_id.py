@@ -0,0 +1,43 @@
+"""Index labs by team and id
+
+Revision ID: 3d8e5f1c7a62
+Revises: b7f3c2a91d04
+Create Date: 2026-10-17 14:03:27.551904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8e5f1c7a62'
+down_revision = 'b7f3c2a91d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (team_id, lab_id) serves keyset pages of a team's labs and supersedes
+    # the single-column team_id index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_labs_team_id_lab_id', 'labs', ['team_id', 'lab_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_labs_team_id', table_name='labs',
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_labs_team_id', 'labs', ['team_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_labs_team_id_lab_id', table_name='labs',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,136 @@
+"""User item timestamps to timestamptz
+
+Revision ID: 5c1e7d9f3b28
+Revises: 9a4c6b2d8e17
+Create Date: 2026-10-17 16:02:44.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7d9f3b28'
+down_revision = '9a4c6b2d8e17'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10_000
+
+# Session-local, so nothing is left behind in the schema. Unparseable values
+# come back as NULL instead of aborting a batch halfway through the table.
+# STABLE rather than IMMUTABLE: strings without an offset are read in the
+# session time zone.
+TRY_TIMESTAMPTZ = """
+    CREATE FUNCTION pg_temp.try_timestamptz(value text) RETURNS timestamptz
+    LANGUAGE plpgsql STABLE AS $$
+    BEGIN
+        RETURN value::timestamptz;
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END
+    $$
+"""
+
+CONVERT = """
+    borrowed_at_tz = pg_temp.try_timestamptz(borrowed_at),
+    returned_at_tz = pg_temp.try_timestamptz(NULLIF(returned_at, ''))
+"""
+
+
+def upgrade():
+    conn = op.get_bind()
+    # Strings without an offset were written by the API in UTC
+    op.execute("SET TIME ZONE 'UTC'")
+    op.execute(TRY_TIMESTAMPTZ)
+
+    # Refuse before writing anything rather than invent timestamps
+    invalid = conn.execute(sa.text("""
+        SELECT user_item_id FROM user_items
+        WHERE pg_temp.try_timestamptz(borrowed_at) IS NULL
+           OR (NULLIF(returned_at, '') IS NOT NULL
+               AND pg_temp.try_timestamptz(returned_at) IS NULL)
+        LIMIT 10
+    """)).scalars().all()
+    if invalid:
+        raise RuntimeError(
+            'user_items rows with unparseable borrowed_at/returned_at, fix them '
+            'and rerun: ' + ', '.join(str(user_item_id) for user_item_id in invalid)
+        )
+
+    op.add_column('user_items', sa.Column('borrowed_at_tz', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('user_items', sa.Column('returned_at_tz', sa.DateTime(timezone=True), nullable=True))
+
+    # Fill the new columns in primary key order, one short transaction per
+    # batch, so no lock is held on the whole table while rows are rewritten
+    with op.get_context().autocommit_block():
+        last_id = None
+        while True:
+            batch = conn.execute(
+                sa.text("""
+                    WITH batch AS (
+                        SELECT user_item_id FROM user_items
+                        WHERE CAST(:last_id AS uuid) IS NULL OR user_item_id > :last_id
+                        ORDER BY user_item_id
+                        LIMIT :batch_size
+                    )
+                    UPDATE user_items SET """ + CONVERT + """
+                    FROM batch
+                    WHERE user_items.user_item_id = batch.user_item_id
+                    RETURNING user_items.user_item_id
+                """),
+                {'last_id': last_id, 'batch_size': BATCH_SIZE},
+            ).scalars().all()
+            if not batch:
+                break
+            last_id = max(batch)
+
+    # Rows borrowed or returned while the batches ran are caught up under a
+    # lock that blocks writers, then the columns are swapped
+    op.execute('LOCK TABLE user_items IN SHARE ROW EXCLUSIVE MODE')
+    op.execute("""
+        UPDATE user_items SET """ + CONVERT + """
+        WHERE borrowed_at_tz IS NULL
+           OR (returned_at_tz IS NULL AND NULLIF(returned_at, '') IS NOT NULL)
+    """)
+    op.drop_column('user_items', 'borrowed_at')
+    op.drop_column('user_items', 'returned_at')
+    op.alter_column('user_items', 'borrowed_at_tz', new_column_name='borrowed_at', nullable=False)
+    op.alter_column('user_items', 'returned_at_tz', new_column_name='returned_at')
+
+    # Open loans by age for open-loan and overdue queries, and all loans by
+    # age for history ranges
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_items_open_borrowed_at', 'user_items', ['borrowed_at'],
+            postgresql_where=sa.text('returned_at IS NULL'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_items_borrowed_at', 'user_items', ['borrowed_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_items_borrowed_at', table_name='user_items',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_user_items_open_borrowed_at', table_name='user_items',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.execute("SET TIME ZONE 'UTC'")
+    op.alter_column(
+        'user_items', 'borrowed_at',
+        type_=sqlmodel.sql.sqltypes.AutoString(),
+        postgresql_using='to_char(borrowed_at, \'YYYY-MM-DD"T"HH24:MI:SS.USOF:"00"\')',
+    )
+    op.alter_column(
+        'user_items', 'returned_at',
+        type_=sqlmodel.sql.sqltypes.AutoString(),
+        postgresql_using='to_char(returned_at, \'YYYY-MM-DD"T"HH24:MI:SS.USOF:"00"\')',
+    )
@@ -0,0 +1,111 @@
+"""Item params to jsonb
+
+Revision ID: 7f2d4a8c1e93
+Revises: e4b9a2c7d150
+Create Date: 2026-10-17 18:24:05.317942
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7f2d4a8c1e93'
+down_revision = 'e4b9a2c7d150'
+branch_labels = None
+depends_on = None
+
+# "voltage=5, size: M; calibrated" -> {"voltage": 5, "size": "M", "notes": "calibrated"}.
+# Pairs are split on , or ; and keys from values on = or :; numeric values
+# become JSON numbers and anything that is not a pair is kept under "notes".
+PARAMS_TO_JSONB = r"""
+    CREATE FUNCTION pg_temp.params_to_jsonb(value text) RETURNS jsonb
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT CASE WHEN count(*) = 0 THEN NULL ELSE
+            coalesce(
+                jsonb_object_agg(
+                    pair[1],
+                    CASE WHEN pair[2] ~ '^-?\d+(\.\d+)?$' THEN to_jsonb(pair[2]::numeric)
+                         ELSE to_jsonb(pair[2]) END
+                ) FILTER (WHERE pair IS NOT NULL),
+                '{}'
+            )
+            || CASE WHEN bool_or(pair IS NULL)
+                    THEN jsonb_build_object('notes', string_agg(part, ', ') FILTER (WHERE pair IS NULL))
+                    ELSE '{}' END
+        END
+        FROM (
+            SELECT part, regexp_match(part, '^([^=:]*[^=:\s])\s*[=:]\s*(.*)$') AS pair
+            FROM (SELECT trim(part) AS part FROM regexp_split_to_table(value, '[,;]') AS part) AS parts
+            WHERE part <> ''
+        ) AS pairs
+    $$
+"""
+
+JSONB_TO_PARAMS = """
+    CREATE FUNCTION pg_temp.jsonb_to_params(value jsonb) RETURNS varchar
+    LANGUAGE sql IMMUTABLE AS $$
+        SELECT left(string_agg(key || '=' || (item #>> '{}'), ', '), 255)
+        FROM jsonb_each(value) AS params(key, item)
+    $$
+"""
+
+
+def search_vector(params_document):
+    return sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(item_name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(item_vendor, '')), 'B') || "
+            f"setweight({params_document}, 'C')",
+            persisted=True,
+        ),
+    )
+
+
+def upgrade():
+    # The generated search column reads item_params, so it is rebuilt
+    # around the type change; both rewrite the table under an exclusive lock
+    op.drop_index('ix_items_search_vector', table_name='items', if_exists=True)
+    op.drop_column('items', 'search_vector')
+    op.execute(PARAMS_TO_JSONB)
+    op.alter_column(
+        'items', 'item_params',
+        type_=postgresql.JSONB(),
+        postgresql_using='pg_temp.params_to_jsonb(item_params)',
+    )
+    op.add_column('items', search_vector(
+        "jsonb_to_tsvector('english', coalesce(item_params, '{}'), "
+        "'[\"string\", \"numeric\", \"key\"]')"
+    ))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_search_vector', 'items', ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_items_item_params', 'items', ['item_params'],
+            postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade():
+    op.drop_index('ix_items_item_params', table_name='items', if_exists=True)
+    op.drop_index('ix_items_search_vector', table_name='items', if_exists=True)
+    op.drop_column('items', 'search_vector')
+    op.execute(JSONB_TO_PARAMS)
+    op.alter_column(
+        'items', 'item_params',
+        type_=sa.String(length=255),
+        postgresql_using='pg_temp.jsonb_to_params(item_params)',
+    )
+    op.add_column('items', search_vector("to_tsvector('english', coalesce(item_params, ''))"))
+    op.create_index(
+        'ix_items_search_vector', 'items', ['search_vector'], postgresql_using='gin',
+    )
@@ -0,0 +1,43 @@
+"""Add item on_loan counter
+
+Revision ID: 9a4c6b2d8e17
+Revises: 3d8e5f1c7a62
+Create Date: 2026-10-17 15:21:09.402716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c6b2d8e17'
+down_revision = '3d8e5f1c7a62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant default does not rewrite the table
+    op.add_column(
+        'items',
+        sa.Column('on_loan', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute("""
+        UPDATE items SET on_loan = open_loans.count
+        FROM (
+            SELECT item_id, count(*) AS count
+            FROM user_items
+            WHERE returned_at IS NULL
+            GROUP BY item_id
+        ) AS open_loans
+        WHERE items.item_id = open_loans.item_id
+    """)
+    op.create_check_constraint(
+        'ck_items_on_loan_non_negative', 'items', 'on_loan >= 0'
+    )
+
+
+def downgrade():
+    op.drop_constraint('ck_items_on_loan_non_negative', 'items', type_='check')
+    op.drop_column('items', 'on_loan')
@@ -0,0 +1,69 @@
+"""Add foreign key and membership indexes
+
+Revision ID: b7f3c2a91d04
+Revises: 1a31ce608336
+Create Date: 2026-10-17 10:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f3c2a91d04'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns). user_team.user_id is covered by the leading
+# column of the (user_id, team_id) unique index below.
+INDEXES = [
+    ('ix_teams_owner_id', 'teams', ['owner_id']),
+    ('ix_user_team_team_id', 'user_team', ['team_id']),
+    ('ix_items_team_id', 'items', ['team_id']),
+    ('ix_labs_team_id', 'labs', ['team_id']),
+    ('ix_labs_owner_id', 'labs', ['owner_id']),
+    ('ix_user_items_user_id', 'user_items', ['user_id']),
+    ('ix_user_items_item_id', 'user_items', ['item_id']),
+    ('ix_user_items_lab_id', 'user_items', ['lab_id']),
+]
+
+
+def upgrade():
+    # Drop duplicate memberships so the unique index can be built
+    op.execute("""
+        DELETE FROM user_team a
+        USING user_team b
+        WHERE a.user_id = b.user_id
+          AND a.team_id = b.team_id
+          AND a.user_team_id > b.user_team_id
+    """)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.create_index(
+            'uq_user_team_user_id_team_id', 'user_team', ['user_id', 'team_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    op.execute(
+        'ALTER TABLE user_team ADD CONSTRAINT uq_user_team_user_id_team_id '
+        'UNIQUE USING INDEX uq_user_team_user_id_team_id'
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_user_team_user_id_team_id', 'user_team', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
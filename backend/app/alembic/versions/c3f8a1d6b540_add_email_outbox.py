@@ -0,0 +1,43 @@
+"""Add email outbox
+
+Revision ID: c3f8a1d6b540
+Revises: 7f2d4a8c1e93
+Create Date: 2026-10-17 09:41:12.530914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d6b540'
+down_revision = '7f2d4a8c1e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('email_id', sa.Uuid(), nullable=False),
+        sa.Column('email_to', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('html_content', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint('email_id'),
+    )
+    # Due emails for the worker; sent ones drop out of the index
+    op.create_index(
+        'ix_email_outbox_pending_next_attempt_at', 'email_outbox', ['next_attempt_at'],
+        postgresql_where=sa.text('sent_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_pending_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
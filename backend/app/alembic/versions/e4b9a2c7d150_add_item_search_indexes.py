@@ -0,0 +1,75 @@
+"""Add item search indexes
+
+Revision ID: e4b9a2c7d150
+Revises: 5c1e7d9f3b28
+Create Date: 2026-10-17 17:10:52.664021
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b9a2c7d150'
+down_revision = '5c1e7d9f3b28'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade():
+    conn = op.get_bind()
+    # A stored generated column is computed for every row, which rewrites
+    # the table under an exclusive lock
+    op.add_column(
+        'items',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(item_name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(item_vendor, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(item_params, '')), 'C')",
+                persisted=True,
+            ),
+        ),
+    )
+    has_trgm = conn.execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).first() is not None
+    if has_trgm:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    else:
+        logger.warning('pg_trgm is not available, item search will not be typo tolerant')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_search_vector', 'items', ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        if has_trgm:
+            op.create_index(
+                'ix_items_item_name_trgm', 'items', ['item_name'],
+                postgresql_using='gin',
+                postgresql_ops={'item_name': 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_items_item_name_trgm', table_name='items',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_items_search_vector', table_name='items',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('items', 'search_vector')
@@ -1,17 +1,23 @@
-from collections.abc import Generator
-from typing import Annotated
+import uuid
+from collections.abc import AsyncGenerator, Callable, Coroutine, Generator
+from typing import Annotated, Any
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import Session, and_, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
+from app.core.cache import membership_cache, user_cache
 from app.core.config import settings
-from app.core.db import engine
-from app.models import TokenPayload, User
+from app.core.db import async_engine, engine
+from app.core.replicas import replica_set
+from app.core.response_cache import CachedResponse, response_cache
+from app.models import Team, TeamMembership, TokenPayload, User, UserTeam
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -23,11 +29,36 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # Attributes stay loaded after commit: lazy loads are not allowed outside
+    # of an awaited call, so routes refresh explicitly where needed
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+async def _get_user_cached(session: AsyncSession, user_id: str | None) -> User | None:
+    if user_id is None:
+        return None
+    cached = user_cache.get(user_id)
+    if cached is None:
+        user = await session.get(User, user_id)
+        if user:
+            user_cache.set(user_id, user.model_dump())
+        return user
+    # Rebuild a fresh instance per request and attach it as an already
+    # persisted row, so the session neither queries nor re-inserts it
+    user = User.model_validate(cached)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> User:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -38,7 +69,7 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+    user = await _get_user_cached(session, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -49,9 +80,123 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
+async def get_read_db(
+    session: AsyncSessionDep, token: TokenDep
+) -> AsyncGenerator[AsyncSession, None]:
+    # Reads go to a healthy replica unless this token wrote recently, in
+    # which case they stay on the primary to see their own writes
+    replica = None if replica_set.recently_wrote(token) else replica_set.pick()
+    if replica is None:
+        yield session
+        return
+    async with AsyncSession(replica.engine, expire_on_commit=False) as read_session:
+        yield read_session
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+def get_cached_response(request: Request, current_user: CurrentUser) -> CachedResponse:
+    # Every superuser is answered alike; anyone else only sees what their
+    # own memberships allow
+    scope = "superuser" if current_user.is_superuser else f"user:{current_user.user_id}"
+    return response_cache.for_request(request, scope)
+
+
+CachedResponseDep = Annotated[CachedResponse, Depends(get_cached_response)]
+
+
 def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+
+async def _load_team_membership(
+    session: AsyncSession, team_id: uuid.UUID, user_id: uuid.UUID
+) -> TeamMembership | None:
+    key = (str(team_id), str(user_id))
+    cached = membership_cache.get(key)
+    if cached is not None:
+        return TeamMembership.model_validate(cached)
+    row = (
+        await session.exec(
+            select(Team.owner_id, UserTeam)
+            .outerjoin(
+                UserTeam,
+                and_(
+                    col(UserTeam.team_id) == Team.team_id, UserTeam.user_id == user_id
+                ),
+            )
+            .where(Team.team_id == team_id)
+        )
+    ).first()
+    if row is None:
+        return None
+    owner_id, user_team = row
+    membership = TeamMembership(
+        team_id=team_id,
+        owner_id=owner_id,
+        is_member=user_team is not None,
+        can_edit_labs=bool(user_team and user_team.can_edit_labs),
+        can_edit_items=bool(user_team and user_team.can_edit_items),
+        can_edit_users=bool(user_team and user_team.can_edit_users),
+    )
+    if membership.is_member:
+        membership_cache.set(key, membership.model_dump())
+    return membership
+
+
+async def get_team_membership(
+    session: AsyncSessionDep, current_user: CurrentUser, team_id: uuid.UUID
+) -> TeamMembership:
+    """
+    Resolve the `team_id` path parameter and the caller's permissions in it.
+
+    Resolved once per request and shared by every dependency that needs it.
+    Superusers get every permission whether or not they are members.
+    """
+    membership = await _load_team_membership(session, team_id, current_user.user_id)
+    if membership is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The team with this ID does not exist in the system.",
+        )
+    if current_user.is_superuser:
+        return membership.model_copy(
+            update={
+                "can_edit_labs": True,
+                "can_edit_items": True,
+                "can_edit_users": True,
+            }
+        )
+    if not membership.is_member:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to perform this action.",
+        )
+    return membership
+
+
+TeamMemberDep = Annotated[TeamMembership, Depends(get_team_membership)]
+
+
+def require_team_permission(
+    permission: str,
+) -> Callable[[TeamMembership], Coroutine[Any, Any, TeamMembership]]:
+    async def check_permission(membership: TeamMemberDep) -> TeamMembership:
+        if not getattr(membership, permission):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to perform this action.",
+            )
+        return membership
+
+    return check_permission
+
+
+# For routes that only need the check, as dependencies=[Depends(...)]
+require_team_users_editor = require_team_permission("can_edit_users")
+require_team_labs_editor = require_team_permission("can_edit_labs")
@@ -0,0 +1,321 @@
+import codecs
+import csv
+import json
+import uuid
+from collections.abc import AsyncIterator
+from enum import Enum
+from typing import Any
+
+import psycopg
+from psycopg.types.json import Jsonb
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.db import async_engine
+from app.core.response_cache import item_write_tags, response_cache
+from app.models import ItemCreate
+
+# Imports stream: the request body is read chunk by chunk, rows are
+# validated and COPYed into a temporary staging table CHUNK_SIZE at a time,
+# and the staged rows are merged into items in the same transaction. Memory
+# use is bounded by one chunk of rows and one record of text, whatever the
+# size of the file.
+
+CHUNK_SIZE = 1_000
+MAX_RECORD_LENGTH = 1 << 20
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+MEDIA_TYPES = {
+    "text/csv": ImportFormat.csv,
+    "application/x-ndjson": ImportFormat.ndjson,
+    "application/jsonl": ImportFormat.ndjson,
+}
+
+STAGING_COLUMNS = [
+    "line",
+    "item_id",
+    "item_name",
+    "quantity",
+    "item_img_url",
+    "item_vendor",
+    "item_params",
+]
+
+CREATE_STAGING_SQL = text("""
+    CREATE TEMPORARY TABLE item_import (
+        line integer PRIMARY KEY,
+        item_id uuid,
+        item_name varchar NOT NULL,
+        quantity integer NOT NULL,
+        item_img_url varchar,
+        item_vendor varchar,
+        item_params jsonb
+    ) ON COMMIT DROP
+""")
+
+# Rows the merge cannot apply, removed from staging and reported
+REJECT_SQL = text("""
+    DELETE FROM item_import
+    USING (
+        SELECT line, 'item_id: already given on line ' || first_line AS error
+        FROM (
+            SELECT line, min(line) OVER (PARTITION BY item_id) AS first_line
+            FROM item_import
+            WHERE item_id IS NOT NULL
+        ) AS repeated
+        WHERE line <> first_line
+        UNION ALL
+        SELECT item_import.line, 'item_id: Item not found'
+        FROM item_import JOIN items USING (item_id)
+        WHERE items.team_id <> :team_id
+    ) AS rejected
+    WHERE item_import.line = rejected.line
+    RETURNING item_import.line, rejected.error
+""")
+
+UPDATE_SQL = text("""
+    UPDATE items
+    SET item_name = item_import.item_name,
+        quantity = item_import.quantity,
+        item_img_url = item_import.item_img_url,
+        item_vendor = item_import.item_vendor,
+        item_params = item_import.item_params
+    FROM item_import
+    WHERE items.item_id = item_import.item_id AND items.team_id = :team_id
+""")
+
+INSERT_SQL = text("""
+    INSERT INTO items (item_id, team_id, item_name, quantity, item_img_url, item_vendor, item_params)
+    SELECT coalesce(item_id, gen_random_uuid()), :team_id,
+           item_name, quantity, item_img_url, item_vendor, item_params
+    FROM item_import
+    WHERE item_id IS NULL
+       OR NOT EXISTS (SELECT 1 FROM items WHERE items.item_id = item_import.item_id)
+    ORDER BY line
+""")
+
+
+class ImportFailed(Exception):
+    pass
+
+
+class ImportResponse(StreamingResponse):
+    """
+    A streaming response that can be sent while the request body is still
+    being read.
+
+    StreamingResponse reads `receive` to notice a client disconnect, which
+    would swallow the body chunks the import is waiting for. Here a
+    disconnect surfaces from the body stream itself, as ClientDisconnect.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+
+def _event(**fields: Any) -> bytes:
+    return (json.dumps(fields) + "\n").encode()
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in body:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.removesuffix("\r")
+            if len(pending) > MAX_RECORD_LENGTH:
+                raise ImportFailed(
+                    f"A line is longer than {MAX_RECORD_LENGTH} characters"
+                )
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ImportFailed("The file is not UTF-8 encoded")
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _records(
+    lines: AsyncIterator[str], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """
+    Yield (line number, fields) per record, or (line number, error) for a
+    record that cannot be parsed.
+    """
+    line_number = 0
+    if import_format == ImportFormat.ndjson:
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                fields = json.loads(line)
+            except ValueError as e:
+                yield line_number, f"Invalid JSON: {e}"
+                continue
+            yield (
+                line_number,
+                fields if isinstance(fields, dict) else "Expected a JSON object",
+            )
+        return
+
+    header: list[str] | None = None
+    record: list[str] = []
+    start = 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        # A quoted field may span lines: the record ends on an even quote count
+        joined = "\n".join(record)
+        if joined.count('"') % 2:
+            if len(joined) > MAX_RECORD_LENGTH:
+                raise ImportFailed(
+                    f"Unterminated quoted field starting on line {start}"
+                )
+            continue
+        record = []
+        if not joined.strip():
+            continue
+        values = next(csv.reader([joined]))
+        if header is None:
+            header = [name.strip() for name in values]
+            if "item_name" not in header:
+                raise ImportFailed("The CSV header has no item_name column")
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} fields, found {len(values)}"
+            continue
+        # Empty cells take the field's default
+        cells: dict[str, Any] = {
+            name: value
+            for name, value in zip(header, values, strict=True)
+            if value != ""
+        }
+        if "item_params" in cells:
+            try:
+                cells["item_params"] = json.loads(cells["item_params"])
+            except ValueError:
+                yield start, "item_params: Invalid JSON"
+                continue
+        yield start, cells
+    if record:
+        yield start, "Unterminated quoted field"
+
+
+def _validate(line: int, fields: dict[str, Any]) -> tuple[Any, ...] | list[str]:
+    errors = []
+    item_id = None
+    if fields.get("item_id") is not None:
+        try:
+            item_id = uuid.UUID(str(fields["item_id"]))
+        except ValueError:
+            errors.append("item_id: Input should be a valid UUID")
+    try:
+        item_in = ItemCreate.model_validate(fields)
+    except ValidationError as e:
+        errors.extend(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        )
+    if errors:
+        return errors
+    return (
+        line,
+        item_id,
+        item_in.item_name,
+        item_in.quantity,
+        item_in.item_img_url,
+        item_in.item_vendor,
+        Jsonb(item_in.item_params) if item_in.item_params is not None else None,
+    )
+
+
+def _database_error(e: psycopg.Error | DBAPIError) -> str:
+    error = e.orig if isinstance(e, DBAPIError) else e
+    message = getattr(getattr(error, "diag", None), "message_primary", None)
+    return f"The database refused the import: {message or error}"
+
+
+async def _copy(
+    connection: psycopg.AsyncConnection[Any], rows: list[tuple[Any, ...]]
+) -> None:
+    async with connection.cursor() as cursor:
+        async with cursor.copy(
+            f"COPY item_import ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                await copy.write_row(row)
+
+
+async def import_items(
+    body: AsyncIterator[bytes], import_format: ImportFormat, team_id: uuid.UUID
+) -> AsyncIterator[bytes]:
+    """
+    Import items into a team, yielding NDJSON events: `error` per rejected
+    row, `progress` per chunk and `done` (or `failed`) at the end.
+
+    Rows with the item_id of an item of the team replace its fields; other
+    rows create items. Rejected rows are skipped, the rest are committed
+    together.
+    """
+    rows = rejected = 0
+    # Opened here rather than through a dependency: the session of a
+    # dependency is closed before a streaming response starts
+    async with async_engine.connect() as connection:
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        # Only None once the connection is invalidated, which it is not yet
+        assert driver_connection is not None
+        try:
+            await connection.execute(CREATE_STAGING_SQL)
+            chunk: list[tuple[Any, ...]] = []
+            async for line, fields in _records(_lines(body), import_format):
+                rows += 1
+                staged = (
+                    [fields] if isinstance(fields, str) else _validate(line, fields)
+                )
+                if isinstance(staged, list):
+                    rejected += 1
+                    yield _event(event="error", line=line, errors=staged)
+                else:
+                    chunk.append(staged)
+                if len(chunk) == CHUNK_SIZE:
+                    await _copy(driver_connection, chunk)
+                    chunk = []
+                    yield _event(event="progress", rows=rows, rejected=rejected)
+            await _copy(driver_connection, chunk)
+            yield _event(event="progress", rows=rows, rejected=rejected)
+
+            await connection.execute(text("ANALYZE item_import"))
+            params = {"team_id": team_id}
+            for line, error in await connection.execute(REJECT_SQL, params):
+                rejected += 1
+                yield _event(event="error", line=line, errors=[error])
+            updated = (await connection.execute(UPDATE_SQL, params)).rowcount
+            created = (await connection.execute(INSERT_SQL, params)).rowcount
+            await connection.commit()
+            await response_cache.invalidate(*item_write_tags(team_id))
+        except ImportFailed as e:
+            await connection.rollback()
+            yield _event(event="failed", detail=str(e), rows=rows)
+            return
+        except (psycopg.Error, DBAPIError) as e:
+            # Validated rows can still be refused by the table, e.g. a NUL in
+            # item_params, or an item_id inserted by another request meanwhile
+            await connection.rollback()
+            yield _event(event="failed", detail=_database_error(e), rows=rows)
+            return
+    yield _event(
+        event="done", rows=rows, created=created, updated=updated, rejected=rejected
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import items, login, users, utils, teams
+from app.api.routes import exports, items, labs, login, user_items, users, utils, teams
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -8,3 +8,6 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(utils.router, prefix="/utils", tags=["utils"])
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
+api_router.include_router(labs.router, prefix="/labs", tags=["labs"])
+api_router.include_router(user_items.router, prefix="/user-items", tags=["user-items"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
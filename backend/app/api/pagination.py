@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import Table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapped
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.cache import count_cache
+
+T = TypeVar("T")
+
+# Cursors are opaque to clients: the urlsafe base64 of the last row's key.
+# Rows are ordered by that key, so following a cursor costs one index range
+# scan regardless of depth and never skips or repeats existing rows.
+
+
+def encode_cursor(key: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(key.bytes).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(
+            bytes=base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    statement: SelectOfScalar[T],
+    key: Mapped[uuid.UUID],
+    *,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+) -> SelectOfScalar[T]:
+    """
+    Order `statement` by `key` and select one page, by cursor when given and
+    by offset otherwise.
+    """
+    statement = statement.order_by(key).limit(limit)
+    if cursor is not None:
+        return statement.where(key > decode_cursor(cursor))
+    return statement.offset(skip)
+
+
+def next_cursor(rows: Sequence[Any], key_name: str, limit: int) -> str | None:
+    if not rows or len(rows) < limit:
+        return None
+    return encode_cursor(getattr(rows[-1], key_name))
+
+
+class CountStrategy(str, Enum):
+    """How list endpoints compute `count`."""
+
+    exact = "exact"
+    # pg_class.reltuples for a whole table, the planner's row estimate otherwise
+    estimated = "estimated"
+    # exact, reused per worker for COUNT_CACHE_TTL_SECONDS
+    cached = "cached"
+    # skip counting; use next_cursor to tell whether more rows exist
+    none = "none"
+
+
+def _literal_sql(statement: SelectOfScalar[Any]) -> str:
+    # SQLAlchemy leaves dialect constructors unannotated
+    dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+    return str(
+        statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    )
+
+
+async def _exact_count(session: AsyncSession, statement: SelectOfScalar[Any]) -> int:
+    subquery = statement.order_by(None).subquery()
+    return (await session.exec(select(func.count()).select_from(subquery))).one()
+
+
+async def _estimated_count(
+    session: AsyncSession, statement: SelectOfScalar[Any]
+) -> int:
+    froms = statement.get_final_froms()
+    if (
+        statement.whereclause is None
+        and len(froms) == 1
+        and isinstance(froms[0], Table)
+    ):
+        reltuples = (
+            await session.exec(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),  # type: ignore
+                params={"table": froms[0].name},
+            )
+        ).scalar()
+        # reltuples is -1 until the table is first vacuumed or analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+    # EXPLAIN takes the statement's own bound parameters, so filter values
+    # are never spliced into the SQL text
+    connection = await session.connection()
+    compiled = statement.order_by(None).compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    row = (
+        await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        )
+    ).one()
+    plan = row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession, statement: SelectOfScalar[Any], strategy: CountStrategy
+) -> int | None:
+    """
+    Count the rows `statement` selects, before pagination, using `strategy`.
+    """
+    if strategy == CountStrategy.none:
+        return None
+    if strategy == CountStrategy.estimated:
+        return await _estimated_count(session, statement)
+    if strategy == CountStrategy.cached:
+        key = _literal_sql(statement)
+        count = count_cache.get(key)
+        if count is None:
+            count = await _exact_count(session, statement)
+            count_cache.set(key, count)
+        return count
+    return await _exact_count(session, statement)
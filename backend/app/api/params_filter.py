@@ -0,0 +1,80 @@
+import json
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, SQLColumnExpression, cast, literal
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+
+# Query parameters that filter on a JSONB column, e.g. for item_params:
+#
+#   params.voltage=5              equal to 5 (a JSON number, "\"5\"" for the string)
+#   params.voltage[gte]=3         range, with gt, gte, lt and lte; repeat to bound both sides
+#   params.voltage[exists]=true   key present (false: absent)
+#   params.dims.width=10          dotted keys reach into nested objects
+#
+# Equality compiles to containment (@>) and ranges and existence to a
+# jsonpath match (@?); a GIN index on the column serves both.
+
+PREFIX = "params."
+RANGE_OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+_KEY = re.compile(r"^(?P<path>[^\[\]]+?)(?:\[(?P<operator>[a-z]+)\])?$")
+
+
+def _invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Invalid params filter: {detail}")
+
+
+def _parse_value(raw: str) -> Any:
+    # JSON scalars are taken as such; anything else is a bare string
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return raw
+    return raw if isinstance(value, dict | list) else value
+
+
+def _jsonpath(path: list[str]) -> str:
+    return "$" + "".join("." + json.dumps(key) for key in path)
+
+
+def params_filters(
+    column: SQLColumnExpression[Any], query: Iterable[tuple[str, str]]
+) -> list[ColumnElement[bool]]:
+    """
+    Compile the `params.*` entries of `query` into conditions on `column`.
+    """
+    conditions: list[ColumnElement[bool]] = []
+    for name, raw in query:
+        if not name.startswith(PREFIX):
+            continue
+        match = _KEY.match(name[len(PREFIX) :])
+        if not match:
+            raise _invalid(name)
+        path = match["path"].split(".")
+        if not all(path):
+            raise _invalid(name)
+        operator = match["operator"]
+
+        if operator is None:
+            document: Any = _parse_value(raw)
+            for key in reversed(path):
+                document = {key: document}
+            conditions.append(
+                column.op("@>")(cast(literal(json.dumps(document)), JSONB))
+            )
+        elif operator == "exists":
+            if raw not in ("true", "false"):
+                raise _invalid(f"{name} must be true or false")
+            condition = column.op("@?")(cast(literal(_jsonpath(path)), JSONPATH))
+            conditions.append(condition if raw == "true" else ~condition)
+        elif operator in RANGE_OPERATORS:
+            value = _parse_value(raw)
+            if isinstance(value, bool) or not isinstance(value, int | float | str):
+                raise _invalid(f"{name} must be a number or a string")
+            jsonpath = f"{_jsonpath(path)} ? (@ {RANGE_OPERATORS[operator]} {json.dumps(value)})"
+            conditions.append(column.op("@?")(cast(literal(jsonpath), JSONPATH)))
+        else:
+            raise _invalid(f"unknown operator {operator}")
+    return conditions
@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+# FastAPI hands the response class plain dicts and lists, already converted
+# from the response model; json.dumps of a large list costs more than that
+# conversion did. pydantic-core encodes them about three times faster, and
+# writes datetimes and UUIDs as pydantic does.
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    The application's default response class: JSON, encoded natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
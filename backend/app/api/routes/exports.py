@@ -0,0 +1,194 @@
+import zlib
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from enum import Enum
+from typing import Any
+
+import anyio
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, Text, cast, literal
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel import SQLModel, func, select
+from starlette.types import Send
+
+from app.api.deps import get_current_active_superuser
+from app.core.db import async_engine
+from app.core.replicas import replica_set
+from app.models import (
+    Item,
+    ItemPublic,
+    User,
+    UserItem,
+    UserItemPublic,
+    UserPublic,
+)
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+# Exports stream: rows are read through a server-side cursor (NDJSON) or
+# COPY (CSV) and sent BATCH_SIZE rows per chunk, so memory is bounded by a
+# batch however large the table, and the first chunk leaves as soon as the
+# first rows do
+BATCH_SIZE = 1_000
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+class ExportResponse(StreamingResponse):
+    """
+    A streaming response that closes its export when interrupted.
+
+    StreamingResponse leaves a body iterator cut short by a disconnect to
+    the garbage collector, with its connection still checked out and mid
+    COPY; here it is closed at once.
+    """
+
+    body_iterator: AsyncGenerator[bytes, None]
+
+    async def stream_response(self, send: Send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+def _columns(table: type[SQLModel], public: type[SQLModel]) -> list[ColumnElement[Any]]:
+    # The fields of the public model, so private columns such as
+    # hashed_password are never exported
+    return [getattr(table, name) for name in public.model_fields]
+
+
+async def _ndjson(
+    connection: AsyncConnection, columns: list[ColumnElement[Any]]
+) -> AsyncGenerator[bytes, None]:
+    # Postgres renders each row as JSON text: decoding uuids and jsonb into
+    # Python objects only to encode them again costs more than the fetch
+    row = cast(
+        func.json_build_object(
+            *(part for column in columns for part in (literal(column.key), column))
+        ),
+        Text,
+    )
+    result = await connection.stream(
+        select(row).execution_options(yield_per=BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        yield "".join(f"{line}\n" for (line,) in rows).encode()
+
+
+async def _csv(
+    connection: AsyncConnection, columns: list[ColumnElement[Any]]
+) -> AsyncGenerator[bytes, None]:
+    # COPY streams the CSV in chunks of about a row each, header first;
+    # they are joined up to a batch's worth before being sent
+    query = select(*columns).compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    # Only None once the connection is invalidated, which it is not yet
+    assert driver_connection is not None
+    async with driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+        ) as copy:
+            chunk: list[bytes] = []
+            async for data in copy:
+                chunk.append(bytes(data))
+                if len(chunk) == BATCH_SIZE:
+                    yield b"".join(chunk)
+                    chunk = []
+            yield b"".join(chunk)
+
+
+async def _export(
+    engine: AsyncEngine,
+    columns: list[ColumnElement[Any]],
+    export_format: ExportFormat,
+    gzip: bool,
+) -> AsyncGenerator[bytes, None]:
+    # gzip framing (wbits=31), flushed after every batch so the client can
+    # decompress as it downloads
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    batches = _csv if export_format == ExportFormat.csv else _ndjson
+    # Opened here rather than through a dependency: the session of a
+    # dependency is closed before a streaming response starts
+    async with (
+        engine.connect() as connection,
+        aclosing(batches(connection, columns)) as stream,
+    ):
+        try:
+            async for data in stream:
+                if compressor is not None:
+                    data = compressor.compress(data) + compressor.flush(
+                        zlib.Z_SYNC_FLUSH
+                    )
+                if data:
+                    yield data
+        except BaseException:
+            # Cut short, by the client going away most often: the connection
+            # may be mid COPY or fetch, so close it rather than pool it
+            with anyio.CancelScope(shield=True):
+                await connection.invalidate()
+            raise
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def _response(
+    name: str,
+    columns: list[ColumnElement[Any]],
+    export_format: ExportFormat,
+    gzip: bool,
+) -> ExportResponse:
+    # Long sequential reads are what replicas are for
+    replica = replica_set.pick()
+    engine = replica.engine if replica else async_engine
+    filename = f"{name}.{export_format.value}" + (".gz" if gzip else "")
+    return ExportResponse(
+        _export(engine, columns, export_format, gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/users", response_class=ExportResponse)
+async def export_users(
+    format: ExportFormat = ExportFormat.ndjson, gzip: bool = False
+) -> Any:
+    """
+    Export every user as NDJSON or CSV, optionally gzipped.
+    """
+    return _response("users", _columns(User, UserPublic), format, gzip)
+
+
+@router.get("/items", response_class=ExportResponse)
+async def export_items(
+    format: ExportFormat = ExportFormat.ndjson, gzip: bool = False
+) -> Any:
+    """
+    Export every item as NDJSON or CSV, optionally gzipped.
+
+    The CSV can be imported back through POST /items/import.
+    """
+    return _response("items", _columns(Item, ItemPublic), format, gzip)
+
+
+@router.get("/user-items", response_class=ExportResponse)
+async def export_user_items(
+    format: ExportFormat = ExportFormat.ndjson, gzip: bool = False
+) -> Any:
+    """
+    Export every loan as NDJSON or CSV, optionally gzipped.
+    """
+    return _response("user_items", _columns(UserItem, UserItemPublic), format, gzip)
@@ -1,77 +1,483 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Integer,
+    String,
+    TableValuedAlias,
+    Uuid,
+    any_,
+    bindparam,
+    case,
+    desc,
+    insert,
+    literal,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.types import TypeEngine
+from sqlmodel import col, delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
 
-from app.api.deps import CurrentUser, SessionDep
-from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
+from app import async_crud
+from app.api import item_import
+from app.api.deps import (
+    AsyncSessionDep,
+    CachedResponseDep,
+    CurrentUser,
+    ReadSessionDep,
+    get_team_membership,
+)
+from app.api.pagination import CountStrategy, count_rows, next_cursor, paginate
+from app.api.params_filter import params_filters
+from app.core.response_cache import (
+    ITEMS_TAG,
+    item_tag,
+    item_write_tags,
+    response_cache,
+    team_item_lists_tag,
+    team_items_tag,
+    user_teams_tag,
+)
+from app.models import (
+    Item,
+    ItemBatchOperation,
+    ItemBatchResult,
+    ItemBatchStatus,
+    ItemCreate,
+    ItemPublic,
+    ItemsBatch,
+    ItemsBatchPublic,
+    ItemSearchPublic,
+    ItemsPublic,
+    ItemsSearchPublic,
+    ItemUpdate,
+    Message,
+    User,
+    UserTeam,
+)
 
 router = APIRouter()
 
+# Must match the configuration of Item.search_vector
+SEARCH_CONFIG = "english"
+
+_trigram_available: bool | None = None
+
+
+async def _check_team_access(
+    session: AsyncSession, user: User, team_id: uuid.UUID, *, edit: bool = False
+) -> None:
+    if user.is_superuser:
+        return
+    user_team = (
+        await session.exec(
+            select(UserTeam).where(
+                UserTeam.user_id == user.user_id, UserTeam.team_id == team_id
+            )
+        )
+    ).first()
+    if not user_team or (edit and not user_team.can_edit_items):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
 
 @router.get("/", response_model=ItemsPublic)
-def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_items(
+    request: Request,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    cached: CachedResponseDep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_strategy: CountStrategy = CountStrategy.exact,
 ) -> Any:
     """
     Retrieve items.
+
+    Filter on item_params with `params.<key>=<value>`, `params.<key>[gte]=<value>`
+    (also gt, lt, lte) and `params.<key>[exists]=true`.
     """
+    if response := await cached.get():
+        return response
 
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
+        statement = select(Item)
+        tags = [ITEMS_TAG]
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.user_id)
-        )
-        count = session.exec(count_statement).one()
+        team_ids = (
+            await session.exec(
+                select(UserTeam.team_id).where(UserTeam.user_id == current_user.user_id)
+            )
+        ).all()
+        tags = [
+            user_teams_tag(current_user.user_id),
+            *(team_item_lists_tag(team_id) for team_id in team_ids),
+        ]
         statement = (
             select(Item)
-            .where(Item.owner_id == current_user.user_id)
-            .offset(skip)
-            .limit(limit)
+            .join(UserTeam, col(UserTeam.team_id) == Item.team_id)
+            .where(UserTeam.user_id == current_user.user_id)
+        )
+    statement = statement.where(
+        *params_filters(col(Item.item_params), request.query_params.multi_items())
+    )
+    count = await count_rows(session, statement, count_strategy)
+    statement = paginate(
+        statement, col(Item.item_id), cursor=cursor, skip=skip, limit=limit
+    )
+    items = (await session.exec(statement)).all()
+
+    return await cached.store(
+        ItemsPublic,
+        ItemsPublic(
+            data=items, count=count, next_cursor=next_cursor(items, "item_id", limit)
+        ),
+        tags=tags,
+    )
+
+
+async def _has_trigram(session: AsyncSession) -> bool:
+    # Checked once per worker; pg_trgm is installed by the search migration
+    # where the server ships it
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = (
+            await session.exec(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")  # type: ignore
+            )
+        ).first() is not None
+    return _trigram_available
+
+
+@router.get("/search", response_model=ItemsSearchPublic)
+async def search_items(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    q: str = Query(min_length=1, max_length=255),
+    team_id: uuid.UUID | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Any:
+    """
+    Search items by name, vendor and params, best matches first.
+
+    `q` accepts web search syntax (quoted phrases, `or`, `-word`). Where the
+    database has pg_trgm and nothing matches `q` as words, item names within
+    a typo of `q` match instead.
+    """
+
+    def ranked(
+        matches: ColumnElement[bool], rank: ColumnElement[Any]
+    ) -> Select[tuple[Item, Any]]:
+        statement = select(Item, rank.label("rank")).where(matches)
+        if not current_user.is_superuser:
+            # team_id = ANY(ARRAY(SELECT ...)) is evaluated once up front: the
+            # search index is scanned once and intersected with the caller's
+            # teams, where a join would rescan it for every team
+            member_team_ids = (
+                select(UserTeam.team_id)
+                .where(UserTeam.user_id == current_user.user_id)
+                .scalar_subquery()
+            )
+            statement = statement.where(
+                col(Item.team_id) == any_(func.array(member_team_ids))
+            )
+        if team_id is not None:
+            statement = statement.where(Item.team_id == team_id)
+        return statement.order_by(desc("rank"), col(Item.item_id)).limit(limit)
+
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    statement = ranked(
+        col(Item.search_vector).op("@@")(query),
+        func.ts_rank_cd(Item.search_vector, query),
+    )
+    rows = (await session.exec(statement)).all()
+    if not rows and await _has_trigram(session):
+        # `<%`: some word of item_name is similar to q, served by the trigram
+        # index. Only tried when full-text search finds nothing: OR-ed into
+        # every search it more than doubles the p95 of common words
+        statement = ranked(
+            literal(q).op("<%")(Item.item_name),
+            func.word_similarity(q, Item.item_name),
         )
-        items = session.exec(statement).all()
+        rows = (await session.exec(statement)).all()
+    if not rows and team_id is not None:
+        await get_team_membership(session, current_user, team_id)
 
-    return ItemsPublic(data=items, count=count)
+    return ItemsSearchPublic(
+        data=[
+            ItemSearchPublic.model_validate(item, update={"rank": item_rank})
+            for item, item_rank in rows
+        ]
+    )
 
 
-@router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID) -> Any:
+@router.get("/{item_id}", response_model=ItemPublic)
+async def read_item(
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    cached: CachedResponseDep,
+    item_id: uuid.UUID,
+) -> Any:
     """
     Get item by ID.
     """
-    item = session.get(Item, item_id)
+    # Cached per caller once access was checked; losing it is a membership
+    # change, which evicts the entry
+    if response := await cached.get():
+        return response
+    item = await session.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    return item
+    await _check_team_access(session, current_user, item.team_id)
+    tags = [item_tag(item_id), team_items_tag(item.team_id)]
+    if not current_user.is_superuser:
+        tags.append(user_teams_tag(current_user.user_id))
+    return await cached.store(ItemPublic, item, tags=tags)
 
 
 @router.post("/", response_model=ItemPublic)
-def create_item(
-    *, session: SessionDep, current_user: CurrentUser, item_in: ItemCreate
+async def create_item(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    team_id: uuid.UUID,
+    item_in: ItemCreate,
 ) -> Any:
     """
-    Create new item.
+    Create new item in a team.
     """
-    item = Item.model_validate(item_in, update={"owner_id": current_user.user_id})
-    session.add(item)
-    session.commit()
-    session.refresh(item)
+    await _check_team_access(session, current_user, team_id, edit=True)
+    item = await async_crud.create_item(
+        session=session, item_in=item_in, team_id=team_id
+    )
+    await response_cache.invalidate(*item_write_tags(team_id, []))
     return item
 
 
-@router.put("/{id}", response_model=ItemPublic)
-def update_item(
+# Item columns written by batch create and update, with their element types
+BATCH_COLUMNS: dict[str, TypeEngine[Any]] = {
+    "item_name": String(),
+    "quantity": Integer(),
+    "item_img_url": String(),
+    "item_vendor": String(),
+    # SQL NULL rather than a JSON null, as for single-row writes. JSONB's
+    # constructor has no annotations
+    "item_params": JSONB(none_as_null=True),  # type: ignore[no-untyped-call]
+}
+
+
+def _unnest_rows(
+    name: str, arrays: dict[str, tuple[list[Any], TypeEngine[Any]]]
+) -> TableValuedAlias:
+    # One array per column keeps the statement and its parameter count
+    # fixed however many rows are written
+    return (
+        func.unnest(
+            *(
+                bindparam(f"{name}_{column}", values, type_=ARRAY(type_))
+                for column, (values, type_) in arrays.items()
+            )
+        )
+        .table_valued(*arrays)
+        .render_derived(name=name)
+    )
+
+
+@router.post("/batch", response_model=ItemsBatchPublic)
+async def batch_items(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    team_id: uuid.UUID,
+    batch_in: ItemsBatch,
+    response: Response,
+) -> Any:
+    """
+    Create, update and delete many items of a team in one transaction.
+
+    Every row gets an outcome. Updates and deletes of an item outside the
+    team, or of an item already named earlier in the batch, fail; when the
+    batch is `atomic` any failure rejects it whole with a 409.
+    """
+    await _check_team_access(session, current_user, team_id, edit=True)
+
+    # Lock the named items up front, in key order so that overlapping
+    # batches queue instead of deadlocking: every outcome is known before
+    # anything is written and holds until commit
+    named = [row.item_id for row in batch_in.update] + batch_in.delete
+    existing: set[uuid.UUID] = set()
+    if named:
+        existing = set(
+            (
+                await session.exec(
+                    select(Item.item_id)
+                    .where(
+                        col(Item.item_id)
+                        == any_(bindparam("item_ids", named, type_=ARRAY(Uuid))),
+                        Item.team_id == team_id,
+                    )
+                    .order_by(col(Item.item_id))
+                    .with_for_update()
+                )
+            ).all()
+        )
+
+    results: list[ItemBatchResult] = []
+    create_ids = [uuid.uuid4() for _ in batch_in.create]
+    results.extend(
+        ItemBatchResult(
+            operation=ItemBatchOperation.create,
+            index=index,
+            item_id=item_id,
+            status=ItemBatchStatus.created,
+        )
+        for index, item_id in enumerate(create_ids)
+    )
+
+    seen: set[uuid.UUID] = set()
+
+    def outcome(
+        operation: ItemBatchOperation,
+        index: int,
+        item_id: uuid.UUID,
+        result: ItemBatchStatus,
+    ) -> bool:
+        if item_id in seen:
+            result = ItemBatchStatus.duplicate
+        elif item_id not in existing:
+            result = ItemBatchStatus.not_found
+        seen.add(item_id)
+        results.append(
+            ItemBatchResult(
+                operation=operation, index=index, item_id=item_id, status=result
+            )
+        )
+        return result not in (ItemBatchStatus.duplicate, ItemBatchStatus.not_found)
+
+    updates = [
+        row.model_dump(exclude_unset=True)
+        for index, row in enumerate(batch_in.update)
+        if outcome(
+            ItemBatchOperation.update, index, row.item_id, ItemBatchStatus.updated
+        )
+    ]
+    deletes = [
+        item_id
+        for index, item_id in enumerate(batch_in.delete)
+        if outcome(ItemBatchOperation.delete, index, item_id, ItemBatchStatus.deleted)
+    ]
+
+    if batch_in.atomic and len(updates) + len(deletes) < len(named):
+        await session.rollback()
+        response.status_code = status.HTTP_409_CONFLICT
+        return ItemsBatchPublic(data=results, applied=False)
+
+    # Each write is a single statement over unnested arrays, whatever the
+    # number of rows
+    if create_ids:
+        rows = _unnest_rows(
+            "new_items",
+            {
+                "item_id": (create_ids, Uuid()),
+                **{
+                    name: (
+                        [getattr(item_in, name) for item_in in batch_in.create],
+                        type_,
+                    )
+                    for name, type_ in BATCH_COLUMNS.items()
+                },
+            },
+        )
+        await session.exec(  # type: ignore
+            insert(Item).from_select(
+                ["item_id", "team_id", *BATCH_COLUMNS],
+                select(
+                    rows.c.item_id,
+                    literal(team_id, Uuid),
+                    *(rows.c[name] for name in BATCH_COLUMNS),
+                ),
+            )
+        )
+    # Rows update different subsets of columns: each column comes with a
+    # flag array saying which rows set it
+    updated_columns = [
+        name for name in BATCH_COLUMNS if any(name in row for row in updates)
+    ]
+    if updated_columns:
+        arrays: dict[str, tuple[list[Any], TypeEngine[Any]]] = {
+            "item_id": ([row["item_id"] for row in updates], Uuid())
+        }
+        for name in updated_columns:
+            arrays[name] = ([row.get(name) for row in updates], BATCH_COLUMNS[name])
+            arrays[f"set_{name}"] = ([name in row for row in updates], Boolean())
+        rows = _unnest_rows("changes", arrays)
+        await session.exec(  # type: ignore
+            update(Item)
+            .where(col(Item.item_id) == rows.c.item_id)
+            .values(
+                {
+                    name: case(
+                        (rows.c[f"set_{name}"], rows.c[name]), else_=getattr(Item, name)
+                    )
+                    for name in updated_columns
+                }
+            )
+        )
+    if deletes:
+        # Loans of the items go with them through ON DELETE CASCADE
+        await session.exec(  # type: ignore
+            delete(Item).where(
+                col(Item.item_id)
+                == any_(bindparam("deletes", deletes, type_=ARRAY(Uuid)))
+            )
+        )
+    await session.commit()
+    await response_cache.invalidate(
+        *item_write_tags(team_id, [row["item_id"] for row in updates] + deletes)
+    )
+    return ItemsBatchPublic(data=results, applied=True)
+
+
+@router.post("/import", response_class=item_import.ImportResponse)
+async def import_items(
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    team_id: uuid.UUID,
+) -> Any:
+    """
+    Import items into a team from a CSV (`text/csv`, with a header row) or
+    NDJSON (`application/x-ndjson`) request body.
+
+    Columns or keys are those of an item, plus an optional `item_id`: rows
+    with the id of an item of the team replace its fields, other rows create
+    items. The response streams NDJSON events as the file is read: `error`
+    for each rejected row, `progress` per chunk and a final `done`, or
+    `failed` when the file cannot be read and nothing was imported.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    import_format = item_import.MEDIA_TYPES.get(media_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload text/csv or application/x-ndjson",
+        )
+    await _check_team_access(session, current_user, team_id, edit=True)
+    return item_import.ImportResponse(
+        item_import.import_items(request.stream(), import_format, team_id),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.put("/{item_id}", response_model=ItemPublic)
+async def update_item(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     item_id: uuid.UUID,
     item_in: ItemUpdate,
@@ -79,31 +485,33 @@ def update_item(
     """
     Update an item.
     """
-    item = session.get(Item, item_id)
+    item = await session.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
+    await _check_team_access(session, current_user, item.team_id, edit=True)
     update_dict = item_in.model_dump(exclude_unset=True)
     item.sqlmodel_update(update_dict)
     session.add(item)
-    session.commit()
-    session.refresh(item)
+    await session.commit()
+    await session.refresh(item)
+    await response_cache.invalidate(*item_write_tags(item.team_id, [item_id]))
     return item
 
 
-@router.delete("/{id}")
-def delete_item(
-    session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID
+@router.delete("/{item_id}")
+async def delete_item(
+    session: AsyncSessionDep, current_user: CurrentUser, item_id: uuid.UUID
 ) -> Message:
     """
     Delete an item.
     """
-    item = session.get(Item, item_id)
+    item = await session.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(item)
-    session.commit()
+    await _check_team_access(session, current_user, item.team_id, edit=True)
+    # Loans of the item go with it through ON DELETE CASCADE
+    statement = delete(Item).where(col(Item.item_id) == item_id)
+    await session.exec(statement)  # type: ignore
+    await session.commit()
+    await response_cache.invalidate(*item_write_tags(item.team_id, [item_id]))
     return Message(message="Item deleted successfully")
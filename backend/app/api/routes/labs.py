@@ -0,0 +1,183 @@
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import and_, col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import async_crud
+from app.api.deps import (
+    AsyncSessionDep,
+    CurrentUser,
+    ReadSessionDep,
+    get_team_membership,
+    require_team_labs_editor,
+)
+from app.api.pagination import CountStrategy, count_rows, next_cursor, paginate
+from app.core.response_cache import item_write_tags, response_cache
+from app.models import (
+    Lab,
+    LabCreate,
+    LabPublic,
+    LabsPublic,
+    LabUpdate,
+    Message,
+    User,
+    UserTeam,
+)
+
+router = APIRouter()
+
+
+async def _get_lab(
+    session: AsyncSession, user: User, lab_id: uuid.UUID, *, edit: bool = False
+) -> Lab:
+    # The lab and the caller's permissions in its team, in one query
+    row = (
+        await session.exec(
+            select(Lab, UserTeam.can_edit_labs)
+            .outerjoin(
+                UserTeam,
+                and_(
+                    col(UserTeam.team_id) == Lab.team_id,
+                    UserTeam.user_id == user.user_id,
+                ),
+            )
+            .where(Lab.lab_id == lab_id)
+        )
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Lab not found")
+    lab, can_edit_labs = row
+    if not user.is_superuser and (
+        can_edit_labs is None or (edit and not can_edit_labs)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to perform this action.",
+        )
+    return lab
+
+
+@router.get("/", response_model=LabsPublic)
+async def read_labs(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    team_id: uuid.UUID | None = None,
+    lab_university: str | None = None,
+    lab_place: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_strategy: CountStrategy = CountStrategy.exact,
+) -> Any:
+    """
+    Retrieve labs.
+
+    Lists the labs of `team_id`, or of every team the caller belongs to.
+    """
+    statement = select(Lab)
+    if not current_user.is_superuser:
+        # Membership is enforced by the join, so no separate lookup is needed
+        statement = statement.join(
+            UserTeam,
+            and_(
+                col(UserTeam.team_id) == Lab.team_id,
+                UserTeam.user_id == current_user.user_id,
+            ),
+        )
+    if team_id is not None:
+        statement = statement.where(Lab.team_id == team_id)
+    if lab_university is not None:
+        statement = statement.where(Lab.lab_university == lab_university)
+    if lab_place is not None:
+        statement = statement.where(Lab.lab_place == lab_place)
+
+    labs = (
+        await session.exec(
+            paginate(statement, col(Lab.lab_id), cursor=cursor, skip=skip, limit=limit)
+        )
+    ).all()
+
+    # A missing team and a caller outside it also come back empty; only then
+    # is it worth the extra lookup to tell those apart from an empty page
+    if not labs and team_id is not None:
+        await get_team_membership(session, current_user, team_id)
+
+    return LabsPublic(
+        data=labs,
+        count=await count_rows(session, statement, count_strategy),
+        next_cursor=next_cursor(labs, "lab_id", limit),
+    )
+
+
+@router.get("/{lab_id}", response_model=LabPublic)
+async def read_lab(
+    session: ReadSessionDep, current_user: CurrentUser, lab_id: uuid.UUID
+) -> Any:
+    """
+    Get lab by ID.
+    """
+    return await _get_lab(session, current_user, lab_id)
+
+
+@router.post(
+    "/", dependencies=[Depends(require_team_labs_editor)], response_model=LabPublic
+)
+async def create_lab(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    team_id: uuid.UUID,
+    lab_in: LabCreate,
+) -> Any:
+    """
+    Create new lab.
+    """
+    return await async_crud.create_lab(
+        session=session, lab_in=lab_in, owner_id=current_user.user_id, team_id=team_id
+    )
+
+
+@router.put("/{lab_id}", response_model=LabPublic)
+async def update_lab(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    lab_id: uuid.UUID,
+    lab_in: LabUpdate,
+) -> Any:
+    """
+    Update a lab.
+    """
+    lab = await _get_lab(session, current_user, lab_id, edit=True)
+    update_dict = lab_in.model_dump(exclude_unset=True)
+    lab.sqlmodel_update(update_dict)
+    session.add(lab)
+    await session.commit()
+    await session.refresh(lab)
+    return lab
+
+
+@router.delete("/{lab_id}")
+async def delete_lab(
+    session: AsyncSessionDep, current_user: CurrentUser, lab_id: uuid.UUID
+) -> Message:
+    """
+    Delete a lab.
+    """
+    await _get_lab(session, current_user, lab_id, edit=True)
+    # Loans recorded in the lab go with it through ON DELETE CASCADE; the
+    # open ones first return their units
+    released = await async_crud.release_open_loans(session=session, lab_id=lab_id)
+    statement = delete(Lab).where(col(Lab.lab_id) == lab_id)
+    await session.exec(statement)  # type: ignore
+    await session.commit()
+    await response_cache.invalidate(
+        *(
+            tag
+            for team_id, item_id in released
+            for tag in item_write_tags(team_id, [item_id])
+        )
+    )
+    return Message(message="Lab deleted successfully")
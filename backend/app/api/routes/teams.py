@@ -2,36 +2,61 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import col, delete, func, select
+from sqlalchemy import Boolean, Uuid, bindparam, literal
+from sqlalchemy import select as sa_select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import col, delete, func, select, update
 
-from app import crud
 from app.api.deps import (
+    AsyncSessionDep,
+    CachedResponseDep,
     CurrentUser,
-    SessionDep,
-    get_current_active_superuser,
+    ReadSessionDep,
+    get_team_membership,
+    require_team_users_editor,
+)
+from app.api.pagination import CountStrategy, count_rows, next_cursor, paginate
+from app.core.cache import invalidate_membership, invalidate_team
+from app.core.response_cache import (
+    TEAMS_TAG,
+    response_cache,
+    team_delete_tags,
+    team_members_tag,
+    team_tag,
+    user_tag,
+    user_teams_tag,
 )
-from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
-from app.api.deps import CurrentUser, SessionDep
 from app.models import (
     Message,
     User,
     Team,
     TeamCreate,
     TeamUpdate,
-    TeamBase,
     TeamPublic,
     TeamsPublic,
     UserTeam,
+    UserTeamBulkResult,
+    UserTeamBulkStatus,
     UserTeamCreate,
+    UserTeamsBulkCreate,
+    UserTeamsBulkPublic,
+    UserTeamsPublic,
     UserWithPermissions,
 )
-from app.utils import generate_new_account_email, send_email
 
 router = APIRouter()
 
+
 @router.get("/", response_model=TeamsPublic)
-def read_teams(session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100) -> Any:
+async def read_teams(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    cached: CachedResponseDep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_strategy: CountStrategy = CountStrategy.exact,
+) -> Any:
     """
     Retrieve teams.
     """
@@ -40,21 +65,41 @@ def read_teams(session: SessionDep, current_user: CurrentUser, skip: int = 0, li
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to perform this action.",
         )
+    if response := await cached.get():
+        return response
 
-    count_statement = select(func.count()).select_from(Team)
-    count = session.exec(count_statement).one()
+    count = await count_rows(session, select(Team), count_strategy)
 
-    statement = select(Team).offset(skip).limit(limit)
-    teams = session.exec(statement).all()
+    statement = paginate(
+        select(Team), col(Team.team_id), cursor=cursor, skip=skip, limit=limit
+    )
+    teams = (await session.exec(statement)).all()
+
+    return await cached.store(
+        TeamsPublic,
+        TeamsPublic(
+            data=teams, count=count, next_cursor=next_cursor(teams, "team_id", limit)
+        ),
+        tags=[TEAMS_TAG],
+    )
 
-    return TeamsPublic(data=teams, count=count)
 
 @router.get("/{team_id}", response_model=TeamPublic)
-def read_team(*, session: SessionDep, team_id: int, current_user: CurrentUser) -> Any:
+async def read_team(
+    *,
+    session: AsyncSessionDep,
+    team_id: uuid.UUID,
+    current_user: CurrentUser,
+    cached: CachedResponseDep,
+) -> Any:
     """
     Retrieve team by ID.
     """
-    team = session.get(Team, team_id)
+    # Cached per caller, so a hit was allowed when it was stored and the
+    # team's edits, owner changes included, evict it
+    if response := await cached.get():
+        return response
+    team = await session.get(Team, team_id)
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -66,10 +111,13 @@ def read_team(*, session: SessionDep, team_id: int, current_user: CurrentUser) -
             detail="You do not have permission to perform this action.",
         )
 
-    return team
+    return await cached.store(TeamPublic, team, tags=[team_tag(team_id)])
+
 
 @router.post("/", response_model=TeamPublic)
-def create_team(*, session: SessionDep, team_in: TeamCreate, current_user: CurrentUser) -> Any:
+async def create_team(
+    *, session: AsyncSessionDep, team_in: TeamCreate, current_user: CurrentUser
+) -> Any:
     """
     Create new team.
     """
@@ -78,32 +126,39 @@ def create_team(*, session: SessionDep, team_in: TeamCreate, current_user: Curre
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to perform this action.",
         )
-    
+
     team = Team.model_validate(team_in, update={"owner_id": current_user.user_id})
     session.add(team)
-    session.commit()
-    session.refresh(team)
+    await session.flush()
 
     user_team = UserTeam(
         user_id=current_user.user_id,
         team_id=team.team_id,
-        can_edit_labs = True,
-        can_edit_users = True,
-        can_edit_items = True,
+        can_edit_labs=True,
+        can_edit_users=True,
+        can_edit_items=True,
     )
 
     session.add(user_team)
-    session.commit()
-    session.refresh(user_team)
+    await session.commit()
+    await session.refresh(team)
+    await response_cache.invalidate(TEAMS_TAG, user_teams_tag(current_user.user_id))
 
     return team
 
+
 @router.put("/{team_id}", response_model=TeamPublic)
-def update_team(*, session: SessionDep, team_id: int, team_in: TeamUpdate, current_user: CurrentUser) -> Any:
+async def update_team(
+    *,
+    session: AsyncSessionDep,
+    team_id: uuid.UUID,
+    team_in: TeamUpdate,
+    current_user: CurrentUser,
+) -> Any:
     """
     Update team by ID.
     """
-    team = session.get(Team, team_id)
+    team = await session.get(Team, team_id)
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,19 +170,23 @@ def update_team(*, session: SessionDep, team_id: int, team_in: TeamUpdate, curre
             detail="You do not have permission to perform this action.",
         )
 
-    team = Team.model_validate(team_in, update={"team_id": team_id})
+    team.sqlmodel_update(team_in.model_dump(exclude_unset=True))
     session.add(team)
-    session.commit()
-    session.refresh(team)
+    await session.commit()
+    await session.refresh(team)
+    await response_cache.invalidate(TEAMS_TAG, team_tag(team_id))
 
     return team
 
+
 @router.delete("/{team_id}", response_model=Message)
-def delete_team(*, session: SessionDep, team_id: int, current_user: CurrentUser) -> Any:
+async def delete_team(
+    *, session: AsyncSessionDep, team_id: uuid.UUID, current_user: CurrentUser
+) -> Any:
     """
     Delete team by ID.
     """
-    team = session.get(Team, team_id)
+    team = await session.get(Team, team_id)
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -139,273 +198,327 @@ def delete_team(*, session: SessionDep, team_id: int, current_user: CurrentUser)
             detail="You do not have permission to perform this action.",
         )
 
-    session.delete(team)
-    session.commit()
+    # Memberships, items and labs go with it through ON DELETE CASCADE
+    await session.exec(delete(Team).where(col(Team.team_id) == team_id))  # type: ignore
+    await session.commit()
+    invalidate_team(team_id)
+    await response_cache.invalidate(*team_delete_tags(team_id))
 
     return Message(message="Team deleted successfully.")
 
-@router.get("/{team_id}/add-users", response_model=Message)
-def add_user_to_team(
-    *, session: SessionDep, team_id: int, add_user_in: UserTeamCreate, current_user: CurrentUser
+
+@router.get(
+    "/{team_id}/add-users",
+    dependencies=[Depends(require_team_users_editor)],
+    response_model=Message,
+)
+async def add_user_to_team(
+    *, session: AsyncSessionDep, team_id: uuid.UUID, add_user_in: UserTeamCreate
 ) -> Any:
     """
     Add a user to a team by providing an email and their permissions.
     """
-    team = session.get(Team, team_id)
-    if not team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The team with this ID does not exist in the system.",
-        )
-    
-    if not current_user.is_superuser:
-        user_team = session.exec(
-            select(UserTeam).where(
-                UserTeam.user_id == current_user.user_id,
-                UserTeam.team_id == team_id
-            )
-        ).first()
-
-        if not user_team or not user_team.can_edit_users:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to perform this action.",
-            )
-        
     email = add_user_in.email
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="The user with this email does not exist in the system.",
         )
-    
-    user_team = UserTeam(
-        user_id=user.user_id,
-        team_id=team_id,
-        can_edit_labs=add_user_in.can_edit_labs,
-        can_edit_users=add_user_in.can_edit_users,
-        can_edit_items=add_user_in.can_edit_items,
+
+    statement = (
+        insert(UserTeam)
+        .values(
+            user_id=user.user_id,
+            team_id=team_id,
+            can_edit_labs=add_user_in.can_edit_labs,
+            can_edit_users=add_user_in.can_edit_users,
+            can_edit_items=add_user_in.can_edit_items,
+        )
+        .on_conflict_do_nothing(constraint="uq_user_team_user_id_team_id")
+        .returning(col(UserTeam.user_team_id))
+    )
+    added = (await session.exec(statement)).first()  # type: ignore
+    if added is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The user is already a member of this team.",
+        )
+    await session.commit()
+    invalidate_membership(team_id, user.user_id)
+    await response_cache.invalidate(
+        team_members_tag(team_id), user_teams_tag(user.user_id)
     )
-    session.add(user_team)
-    session.commit()
 
     return Message(message="User added to team successfully.")
 
-@router.get("/{team_id}/users/{user_id}", response_model=UserWithPermissions)
-def view_user_in_team(
-    *, session: SessionDep, current_user: CurrentUser, team_id: uuid.UUID, user_id: uuid.UUID
+
+@router.post(
+    "/{team_id}/users",
+    dependencies=[Depends(require_team_users_editor)],
+    response_model=UserTeamsBulkPublic,
+)
+async def add_users_to_team(
+    *, session: AsyncSessionDep, team_id: uuid.UUID, users_in: UserTeamsBulkCreate
 ) -> Any:
     """
-    View a specific user in a team.
+    Add many users to a team at once by email, each with their permissions.
+
+    Unknown emails and existing members are reported rather than rejected.
     """
-    # Check if the current user is part of the team
-    team = session.get(Team, team_id)
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
+    # The first entry wins when an email is listed twice
+    members_in: dict[str, UserTeamCreate] = {}
+    for user_in in users_in.users:
+        members_in.setdefault(user_in.email, user_in)
+
+    user_ids = dict(
+        (
+            await session.exec(
+                select(User.email, User.user_id).where(col(User.email).in_(members_in))
+            )
+        ).all()
+    )
 
-    # Check if the current user is part of the lab
-    current_user_team = session.exec(
-        select(UserTeam).where(
-            UserTeam.team_id == team_id,
-            UserTeam.user_id == current_user.user_id
+    added: set[uuid.UUID] = set()
+    if user_ids:
+        new_members = [
+            (user_ids[email], user_in)
+            for email, user_in in members_in.items()
+            if email in user_ids
+        ]
+        # One array per column keeps the statement and its parameter count
+        # fixed however many rows are inserted
+        rows = (
+            func.unnest(
+                bindparam(
+                    "user_ids",
+                    [user_id for user_id, _ in new_members],
+                    type_=ARRAY(Uuid),
+                ),
+                bindparam(
+                    "labs",
+                    [m.can_edit_labs for _, m in new_members],
+                    type_=ARRAY(Boolean),
+                ),
+                bindparam(
+                    "items",
+                    [m.can_edit_items for _, m in new_members],
+                    type_=ARRAY(Boolean),
+                ),
+                bindparam(
+                    "users",
+                    [m.can_edit_users for _, m in new_members],
+                    type_=ARRAY(Boolean),
+                ),
+            )
+            .table_valued(
+                "user_id", "can_edit_labs", "can_edit_items", "can_edit_users"
+            )
+            .render_derived(name="new_members")
+        )
+        statement = (
+            insert(UserTeam)
+            .from_select(
+                [
+                    "user_team_id",
+                    "team_id",
+                    "user_id",
+                    "can_edit_labs",
+                    "can_edit_items",
+                    "can_edit_users",
+                ],
+                sa_select(
+                    func.gen_random_uuid(),
+                    literal(team_id, Uuid),
+                    rows.c.user_id,
+                    rows.c.can_edit_labs,
+                    rows.c.can_edit_items,
+                    rows.c.can_edit_users,
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uq_user_team_user_id_team_id")
+            .returning(col(UserTeam.user_id))
+        )
+        added = set((await session.exec(statement)).scalars())  # type: ignore
+        await session.commit()
+        for user_id in added:
+            invalidate_membership(team_id, user_id)
+        await response_cache.invalidate(
+            team_members_tag(team_id), *(user_teams_tag(user_id) for user_id in added)
+        )
+
+    results = []
+    for email in members_in:
+        member_id = user_ids.get(email)
+        if member_id is None:
+            result_status = UserTeamBulkStatus.user_not_found
+        elif member_id in added:
+            result_status = UserTeamBulkStatus.added
+        else:
+            result_status = UserTeamBulkStatus.already_member
+        results.append(
+            UserTeamBulkResult(email=email, status=result_status, user_id=member_id)
         )
-    ).first()
 
-    if not current_user_team:
-        raise HTTPException(status_code=403, detail="You are not part of this team")
+    return UserTeamsBulkPublic(data=results, added=len(added))
 
-    # Find the user by their user ID
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail=f"User with ID {user_id} not found")
 
-    # Check if the user is part of the team
-    user_team = session.exec(
-        select(UserTeam).where(
-            UserTeam.team_id == team_id,
-            UserTeam.user_id == user.user_id
+@router.get(
+    "/{team_id}/users/{user_id}",
+    dependencies=[Depends(get_team_membership)],
+    response_model=UserWithPermissions,
+)
+async def view_user_in_team(
+    *, session: ReadSessionDep, team_id: uuid.UUID, user_id: uuid.UUID
+) -> Any:
+    """
+    View a specific user in a team.
+    """
+    row = (
+        await session.exec(
+            team_roster_statement(team_id).where(User.user_id == user_id)
         )
     ).first()
 
-    if not user_team:
-        raise HTTPException(status_code=404, detail=f"User with ID {user.user_id} is not associated with this team")
-
-    # Construct the UserWithPermissions object
-    user_with_permissions = UserWithPermissions(
-        email=user.email,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        full_name=user.full_name,
-        user_id=user.user_id,
-        can_edit_labs=user_team.can_edit_labs,
-        can_edit_items=user_team.can_edit_items,
-        can_edit_users=user_team.can_edit_users
-    )
+    if not row:
+        raise HTTPException(
+            status_code=404,
+            detail=f"User with ID {user_id} is not associated with this team",
+        )
+
+    return UserWithPermissions.model_validate(row._mapping)
 
-    return user_with_permissions
 
-@router.delete("/{team_id}/users/{user_id}/remove-user", response_model=Message)
-def remove_user_from_team(
-    *, session: SessionDep, team_id: int, user_id: int, current_user: CurrentUser
+@router.delete(
+    "/{team_id}/users/{user_id}/remove-user",
+    dependencies=[Depends(require_team_users_editor)],
+    response_model=Message,
+)
+async def remove_user_from_team(
+    *, session: AsyncSessionDep, team_id: uuid.UUID, user_id: uuid.UUID
 ) -> Any:
     """
     Remove a user from a team.
     """
-    team = session.get(Team, team_id)
-    if not team:
+    result = await session.exec(  # type: ignore
+        delete(UserTeam).where(
+            col(UserTeam.team_id) == team_id, col(UserTeam.user_id) == user_id
+        )
+    )
+    if not result.rowcount:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="The team with this ID does not exist in the system.",
+            detail="The user is not part of this team.",
         )
+    await session.commit()
+    invalidate_membership(team_id, user_id)
+    await response_cache.invalidate(team_members_tag(team_id), user_teams_tag(user_id))
 
-    if not current_user.is_superuser:
-        user_team = session.exec(
-            select(UserTeam).where(
-                UserTeam.user_id == current_user.user_id,
-                UserTeam.team_id == team_id
-            )
-        ).first()
+    return Message(message="User removed from team successfully.")
 
-        if not user_team or not user_team.can_edit_users:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to perform this action.",
-            )
-    
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The user with this ID does not exist in the system.",
-        )
-    
-    user_team_to_delete = session.exec(
-        select(UserTeam).where(
-            UserTeam.team_id == team_id,
-            UserTeam.user_id == user.user_id
-            )
-        ).first()
 
-    if not user_team_to_delete:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The user is not part of this team.",
+def team_roster_statement(team_id: uuid.UUID) -> Any:
+    """
+    Members of a team with their permissions, as UserWithPermissions columns.
+    """
+    # SQLModel's select is typed for up to four columns; SQLAlchemy's for ten
+    return (
+        sa_select(
+            col(User.email),
+            col(User.is_active),
+            col(User.is_superuser),
+            col(User.full_name),
+            col(User.user_id),
+            col(UserTeam.can_edit_labs),
+            col(UserTeam.can_edit_items),
+            col(UserTeam.can_edit_users),
         )
+        .join(UserTeam, col(UserTeam.user_id) == User.user_id)
+        .where(col(UserTeam.team_id) == team_id)
+    )
 
-    session.delete(user_team_to_delete)
-    session.commit()
-
-    return Message(message="User removed from team successfully.")
 
-@router.get("/{team_id}/users", response_model=list[UserWithPermissions])
-def view_team_users(
-    *, session: SessionDep, team_id: int, current_user: CurrentUser
+@router.get(
+    "/{team_id}/users",
+    dependencies=[Depends(get_team_membership)],
+    response_model=UserTeamsPublic,
+)
+async def view_team_users(
+    *,
+    session: ReadSessionDep,
+    team_id: uuid.UUID,
+    cached: CachedResponseDep,
+    limit: int = 100,
+    cursor: str | None = None,
+    can_edit_labs: bool | None = None,
+    can_edit_items: bool | None = None,
+    can_edit_users: bool | None = None,
+    count_strategy: CountStrategy = CountStrategy.exact,
 ) -> Any:
     """
     View users in a team.
     """
-    team = session.get(Team, team_id)
-    if not team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The team with this ID does not exist in the system.",
-        )
-    
-    user_team = session.exec(
-        select(UserTeam).where(
-            UserTeam.user_id == current_user.user_id,
-            UserTeam.team_id == team_id
+    if response := await cached.get():
+        return response
+    statement = team_roster_statement(team_id)
+    if can_edit_labs is not None:
+        statement = statement.where(UserTeam.can_edit_labs == can_edit_labs)
+    if can_edit_items is not None:
+        statement = statement.where(UserTeam.can_edit_items == can_edit_items)
+    if can_edit_users is not None:
+        statement = statement.where(UserTeam.can_edit_users == can_edit_users)
+
+    rows = (
+        await session.exec(
+            paginate(statement, col(User.user_id), cursor=cursor, skip=0, limit=limit)
         )
-    ).first()
-
-    if not user_team:
-        raise HTTPException(status_code=400, detail="Not enough permissions")
-    
-    users_team = session.exec(
-        select(UserTeam).where(
-            UserTeam.team_id == team_id)
     ).all()
 
-    user_ids = [user_team.user_id for user_team in users_team]
-    users = session.exec(
-        select(User).where(
-            User.user_id.in_(user_ids)
-            )
-        ).all()
-
-    users_with_permissions = []
-    for user in users:
-        user_team = next((ut for ut in users_team if ut.user_id == user.user_id), None)
-        if user_team:
-            user_with_permissions = UserWithPermissions(
-                email=user.email,
-                is_active=user.is_active,
-                is_superuser=user.is_superuser,
-                full_name=user.full_name,
-                user_id=user.user_id,
-                can_edit_labs=user_team.can_edit_labs,
-                can_edit_items=user_team.can_edit_items,
-                can_edit_users=user_team.can_edit_users,
-            )
-            users_with_permissions.append(user_with_permissions)
+    users = [UserWithPermissions.model_validate(row._mapping) for row in rows]
+    return await cached.store(
+        UserTeamsPublic,
+        UserTeamsPublic(
+            data=users,
+            count=await count_rows(session, statement, count_strategy),
+            next_cursor=next_cursor(rows, "user_id", limit),
+        ),
+        # Evicted by the roster's changes and by edits of the users listed
+        tags=[team_members_tag(team_id), *(user_tag(user.user_id) for user in users)],
+    )
 
-    return users_with_permissions
 
-@router.put("/{team_id}/users/{user_id}/update-permissions", response_model=Message)
-def update_user_permissions(
-    *, session: SessionDep, team_id: int, user_id: int, user_team_in: UserTeamCreate, current_user: CurrentUser
+@router.put(
+    "/{team_id}/users/{user_id}/update-permissions",
+    dependencies=[Depends(require_team_users_editor)],
+    response_model=Message,
+)
+async def update_user_permissions(
+    *,
+    session: AsyncSessionDep,
+    team_id: uuid.UUID,
+    user_id: uuid.UUID,
+    user_team_in: UserTeamCreate,
 ) -> Any:
     """
     Update user permissions in a team.
     """
-    team = session.get(Team, team_id)
-    if not team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The team with this ID does not exist in the system.",
+    result = await session.exec(  # type: ignore
+        update(UserTeam)
+        .where(col(UserTeam.team_id) == team_id, col(UserTeam.user_id) == user_id)
+        .values(
+            can_edit_labs=user_team_in.can_edit_labs,
+            can_edit_items=user_team_in.can_edit_items,
+            can_edit_users=user_team_in.can_edit_users,
         )
-
-    if not current_user.is_superuser:
-        user_team = session.exec(
-            select(UserTeam).where(
-                UserTeam.user_id == current_user.user_id,
-                UserTeam.team_id == team_id
-            )
-        ).first()
-
-        if not user_team or not user_team.can_edit_users:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to perform this action.",
-            )
-
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The user with this ID does not exist in the system.",
-        )
-
-    user_team = session.exec(
-        select(UserTeam).where(
-            UserTeam.team_id == team_id,
-            UserTeam.user_id == user.user_id
-        )
-    ).first()
-
-    if not user_team:
+    )
+    if not result.rowcount:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="The user is not part of this team.",
         )
-
-    user_team.can_edit_labs = user_team_in.can_edit_labs
-    user_team.can_edit_items = user_team_in.can_edit_items
-    user_team.can_edit_users = user_team_in.can_edit_users
-
-    session.add(user_team)
-    session.commit()
+    await session.commit()
+    invalidate_membership(team_id, user_id)
+    await response_cache.invalidate(team_members_tag(team_id), user_teams_tag(user_id))
 
     return Message(message="User permissions updated")
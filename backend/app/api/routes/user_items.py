@@ -0,0 +1,191 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, status
+from sqlmodel import and_, col, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import AsyncSessionDep, CurrentUser
+from app.core.response_cache import item_write_tags, response_cache
+from app.models import (
+    Item,
+    Lab,
+    User,
+    UserItem,
+    UserItemCheckout,
+    UserItemPublic,
+    UserTeam,
+)
+
+router = APIRouter()
+
+BORROWED = "borrowed"
+RETURNED = "returned"
+
+
+async def _checkout_refusal(
+    session: AsyncSession, user: User, checkout_in: UserItemCheckout
+) -> HTTPException:
+    # Only run once the checkout matched nothing, to say why
+    row = (
+        await session.exec(
+            select(UserTeam.user_team_id, Lab.lab_id)
+            .select_from(Item)
+            .outerjoin(
+                UserTeam,
+                and_(
+                    col(UserTeam.team_id) == Item.team_id,
+                    UserTeam.user_id == user.user_id,
+                ),
+            )
+            .outerjoin(
+                Lab,
+                and_(
+                    col(Lab.team_id) == Item.team_id, Lab.lab_id == checkout_in.lab_id
+                ),
+            )
+            .where(Item.item_id == checkout_in.item_id)
+        )
+    ).first()
+    if not row:
+        return HTTPException(status_code=404, detail="Item not found")
+    user_team_id, lab_id = row
+    if not user.is_superuser and user_team_id is None:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to perform this action.",
+        )
+    if lab_id is None:
+        return HTTPException(status_code=404, detail="Lab not found in the item's team")
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="No units of this item are available.",
+    )
+
+
+@router.post("/checkout", response_model=UserItemPublic)
+async def checkout_item(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    checkout_in: UserItemCheckout,
+) -> Any:
+    """
+    Borrow one unit of an item into a lab of the same team.
+    """
+    lab_in_team = (
+        select(Lab.lab_id)
+        .where(Lab.lab_id == checkout_in.lab_id, col(Lab.team_id) == Item.team_id)
+        .exists()
+    )
+    # A single conditional UPDATE claims the unit. Concurrent checkouts of
+    # the item queue on its row and re-check on_loan < quantity against the
+    # committed value, so the last unit goes to exactly one of them; other
+    # items are unaffected.
+    statement = (
+        update(Item)
+        .where(
+            col(Item.item_id) == checkout_in.item_id,
+            col(Item.on_loan) < Item.quantity,
+            lab_in_team,
+        )
+        .values(on_loan=col(Item.on_loan) + 1)
+        .returning(col(Item.team_id))
+        .execution_options(synchronize_session=False)
+    )
+    if not current_user.is_superuser:
+        is_member = (
+            select(UserTeam.user_team_id)
+            .where(
+                col(UserTeam.team_id) == Item.team_id,
+                UserTeam.user_id == current_user.user_id,
+            )
+            .exists()
+        )
+        statement = statement.where(is_member)
+
+    team_id = (await session.exec(statement)).scalar()  # type: ignore
+    if team_id is None:
+        raise await _checkout_refusal(session, current_user, checkout_in)
+
+    user_item = UserItem(
+        user_id=current_user.user_id,
+        item_id=checkout_in.item_id,
+        lab_id=checkout_in.lab_id,
+        borrowed_at=datetime.now(timezone.utc),
+        table_name=checkout_in.table_name,
+        system_name=checkout_in.system_name,
+        item_status=BORROWED,
+    )
+    session.add(user_item)
+    await session.commit()
+    # on_loan changed
+    await response_cache.invalidate(*item_write_tags(team_id, [checkout_in.item_id]))
+    return user_item
+
+
+@router.post("/{user_item_id}/return", response_model=UserItemPublic)
+async def return_item(
+    *, session: AsyncSessionDep, current_user: CurrentUser, user_item_id: uuid.UUID
+) -> Any:
+    """
+    Return a borrowed item.
+
+    Allowed for the borrower and for team members who can edit items.
+    """
+    statement = (
+        update(UserItem)
+        .where(
+            col(UserItem.user_item_id) == user_item_id,
+            col(UserItem.returned_at).is_(None),
+        )
+        .values(returned_at=datetime.now(timezone.utc), item_status=RETURNED)
+        .returning(UserItem)
+    )
+    if not current_user.is_superuser:
+        can_edit_items = (
+            select(UserTeam.user_team_id)
+            .join(Item, col(Item.team_id) == UserTeam.team_id)
+            .where(
+                col(Item.item_id) == UserItem.item_id,
+                UserTeam.user_id == current_user.user_id,
+                col(UserTeam.can_edit_items).is_(True),
+            )
+            .exists()
+        )
+        statement = statement.where(
+            or_(col(UserItem.user_id) == current_user.user_id, can_edit_items)
+        )
+
+    # A single conditional UPDATE: of two concurrent returns only one matches
+    user_item = (await session.exec(statement)).scalars().first()  # type: ignore
+    if user_item:
+        team_id = (
+            await session.exec(  # type: ignore
+                update(Item)
+                .where(col(Item.item_id) == user_item.item_id, col(Item.on_loan) > 0)
+                .values(on_loan=col(Item.on_loan) - 1)
+                .returning(col(Item.team_id))
+                .execution_options(synchronize_session=False)
+            )
+        ).scalar()
+        await session.commit()
+        if team_id is not None:
+            await response_cache.invalidate(
+                *item_write_tags(team_id, [user_item.item_id])
+            )
+        return user_item
+
+    existing = await session.get(UserItem, user_item_id)
+    if not existing:
+        raise HTTPException(status_code=404, detail="User item not found")
+    if existing.returned_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This item has already been returned.",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="You do not have permission to perform this action.",
+    )
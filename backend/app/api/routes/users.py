@@ -2,19 +2,32 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from sqlmodel import col, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app import crud
+from app import async_crud
 from app.api.deps import (
+    AsyncSessionDep,
+    CachedResponseDep,
     CurrentUser,
-    SessionDep,
+    ReadSessionDep,
     get_current_active_superuser,
 )
+from app.api.pagination import CountStrategy, count_rows, next_cursor, paginate
+from app.core import hashing
+from app.core.cache import invalidate_user
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.response_cache import (
+    USERS_TAG,
+    item_write_tags,
+    response_cache,
+    team_delete_tags,
+    user_tag,
+    user_teams_tag,
+)
 from app.models import (
-    Item,
     Message,
+    Team,
     UpdatePassword,
     User,
     UserCreate,
@@ -24,65 +37,113 @@ from app.models import (
     UserUpdate,
     UserUpdateMe,
 )
-from app.utils import generate_new_account_email, send_email
+from app.utils import enqueue_email, generate_new_account_email
 
 router = APIRouter()
 
 
+async def _delete_user(session: AsyncSession, user_id: uuid.UUID) -> None:
+    # Teams, memberships, labs and loans go with it through ON DELETE CASCADE;
+    # its open loans, and those in the labs deleted with it, first return
+    # their units
+    team_ids = (
+        await session.exec(select(Team.team_id).where(Team.owner_id == user_id))
+    ).all()
+    released = await async_crud.release_open_loans(session=session, user_id=user_id)
+    statement = delete(User).where(col(User.user_id) == user_id)
+    await session.exec(statement)  # type: ignore
+    await session.commit()
+    invalidate_user(user_id)
+    await response_cache.invalidate(
+        USERS_TAG,
+        user_tag(user_id),
+        user_teams_tag(user_id),
+        *(tag for team_id in team_ids for tag in team_delete_tags(team_id)),
+        *(
+            tag
+            for team_id, item_id in released
+            for tag in item_write_tags(team_id, [item_id])
+        ),
+    )
+
+
 @router.get(
-    "/", dependencies=[Depends(get_current_active_superuser)], response_model=UsersPublic,
+    "/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_users(
+    session: ReadSessionDep,
+    cached: CachedResponseDep,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_strategy: CountStrategy = CountStrategy.exact,
+) -> Any:
     """
     Retrieve users.
     """
+    if response := await cached.get():
+        return response
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    count = await count_rows(session, select(User), count_strategy)
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    statement = paginate(
+        select(User), col(User.user_id), cursor=cursor, skip=skip, limit=limit
+    )
+    users = (await session.exec(statement)).all()
 
-    return UsersPublic(data=users, count=count)
+    return await cached.store(
+        UsersPublic,
+        UsersPublic(
+            data=users, count=count, next_cursor=next_cursor(users, "user_id", limit)
+        ),
+        tags=[USERS_TAG],
+    )
 
 
 @router.post(
     "/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: AsyncSessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await async_crud.get_user_by_email(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
+        # Committed with the user
+        enqueue_email(
+            session,
             email_to=user_in.email,
             subject=email_data.subject,
             html_content=email_data.html_content,
         )
+    user = await async_crud.create_user(session=session, user_create=user_in)
+    await response_cache.invalidate(USERS_TAG)
     return user
 
 
 @router.patch("/me", response_model=UserPublic)
-def update_user_me(
-    *, session: SessionDep, user_in: UserUpdateMe, current_user: CurrentUser
+async def update_user_me(
+    *, session: AsyncSessionDep, user_in: UserUpdateMe, current_user: CurrentUser
 ) -> Any:
     """
     Update own user.
     """
 
     if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
+        existing_user = await async_crud.get_user_by_email(
+            session=session, email=user_in.email
+        )
         if existing_user and existing_user.user_id != current_user.user_id:
             raise HTTPException(
                 status_code=409, detail="User with this email already exists"
@@ -90,33 +151,38 @@ def update_user_me(
     user_data = user_in.model_dump(exclude_unset=True)
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await session.commit()
+    invalidate_user(current_user.user_id)
+    await response_cache.invalidate(USERS_TAG, user_tag(current_user.user_id))
+    await session.refresh(current_user)
     return current_user
 
 
 @router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
+async def update_password_me(
+    *, session: AsyncSessionDep, body: UpdatePassword, current_user: CurrentUser
 ) -> Any:
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await hashing.verify_password(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await hashing.hash_password(body.new_password)
     current_user.hashed_password = hashed_password
     session.add(current_user)
-    session.commit()
+    await session.commit()
+    invalidate_user(current_user.user_id)
     return Message(message="Password updated successfully")
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+async def read_user_me(current_user: CurrentUser) -> Any:
     """
     Get current user.
     """
@@ -124,7 +190,7 @@ def read_user_me(current_user: CurrentUser) -> Any:
 
 
 @router.delete("/me", response_model=Message)
-def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
+async def delete_user_me(session: AsyncSessionDep, current_user: CurrentUser) -> Any:
     """
     Delete own user.
     """
@@ -132,45 +198,48 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == current_user.user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(current_user)
-    session.commit()
+    await _delete_user(session, current_user.user_id)
     return Message(message="User deleted successfully")
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: AsyncSessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await async_crud.get_user_by_email(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = crud.create_user(session=session, user_create=user_create)
+    user = await async_crud.create_user(session=session, user_create=user_create)
+    await response_cache.invalidate(USERS_TAG)
     return user
 
 
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+async def read_user_by_id(
+    user_id: uuid.UUID,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    cached: CachedResponseDep,
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = session.get(User, user_id)
-    if user == current_user:
-        return user
-    if not current_user.is_superuser:
+    if response := await cached.get():
+        return response
+    user = await session.get(User, user_id)
+    if user != current_user and not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges",
         )
-    return user
+    if user is None:
+        return user
+    return await cached.store(UserPublic, user, tags=[user_tag(user_id)])
 
 
 @router.patch(
@@ -178,9 +247,9 @@ def read_user_by_id(
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UserPublic,
 )
-def update_user(
+async def update_user(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     user_id: uuid.UUID,
     user_in: UserUpdate,
 ) -> Any:
@@ -188,39 +257,41 @@ def update_user(
     Update a user.
     """
 
-    db_user = session.get(User, user_id)
+    db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
     if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
+        existing_user = await async_crud.get_user_by_email(
+            session=session, email=user_in.email
+        )
         if existing_user and existing_user.user_id != user_id:
             raise HTTPException(
                 status_code=409, detail="User with this email already exists"
             )
 
-    db_user = crud.update_user(session=session, db_user=db_user, user_in=user_in)
+    db_user = await async_crud.update_user(
+        session=session, db_user=db_user, user_in=user_in
+    )
+    await response_cache.invalidate(USERS_TAG, user_tag(user_id))
     return db_user
 
 
 @router.delete("/{user_id}", dependencies=[Depends(get_current_active_superuser)])
-def delete_user(
-    session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID
+async def delete_user(
+    session: AsyncSessionDep, current_user: CurrentUser, user_id: uuid.UUID
 ) -> Message:
     """
     Delete a user.
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user == current_user:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
+    await _delete_user(session, user_id)
     return Message(message="User deleted successfully")
@@ -2,6 +2,10 @@ from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.cache import CacheStats, user_cache
+from app.core.db import PoolStats, get_pool_stats
+from app.core.invalidation import InvalidationStats, invalidation_bus
+from app.core.response_cache import RouteCacheStats, response_cache
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -26,6 +30,52 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/user-cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def user_cache_stats() -> CacheStats:
+    """
+    Hit/miss counters of this worker's authenticated user cache.
+    """
+    return user_cache.stats()
+
+
+@router.get(
+    "/db-pool-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def db_pool_stats() -> list[PoolStats]:
+    """
+    Connection pool usage and checkout wait times of this worker.
+    """
+    return get_pool_stats()
+
+
+@router.get(
+    "/response-cache-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def response_cache_stats() -> list[RouteCacheStats]:
+    """
+    Hit ratio and serving latency of cached responses per route, in this
+    worker.
+    """
+    return response_cache.stats()
+
+
+@router.get(
+    "/cache-invalidation-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def cache_invalidation_stats() -> InvalidationStats:
+    """
+    Cache invalidations this worker broadcast and received, and how long
+    they took to arrive.
+    """
+    return invalidation_bus.stats()
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -0,0 +1,193 @@
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import hashing
+from app.core.cache import invalidate_membership, invalidate_user
+from app.models import (
+    Item,
+    ItemCreate,
+    Lab,
+    LabCreate,
+    Team,
+    TeamCreate,
+    User,
+    UserCreate,
+    UserItem,
+    UserItemCreate,
+    UserTeam,
+    UserTeamCreate,
+    UserUpdate,
+)
+
+# Async counterparts of app.crud, used by the API routes. Password hashing
+# is awaited on the hashing process pool instead of blocking the event loop.
+
+
+async def create_user(*, session: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await hashing.hash_password(user_create.password)
+    db_obj = User.model_validate(
+        user_create, update={"hashed_password": hashed_password}
+    )
+    session.add(db_obj)
+    await session.commit()
+    await session.refresh(db_obj)
+    return db_obj
+
+
+async def update_user(
+    *, session: AsyncSession, db_user: User, user_in: UserUpdate
+) -> Any:
+    user_data = user_in.model_dump(exclude_unset=True)
+    extra_data = {}
+    if "password" in user_data:
+        password = user_data["password"]
+        hashed_password = await hashing.hash_password(password)
+        extra_data["hashed_password"] = hashed_password
+    db_user.sqlmodel_update(user_data, update=extra_data)
+    session.add(db_user)
+    await session.commit()
+    invalidate_user(db_user.user_id)
+    await session.refresh(db_user)
+    return db_user
+
+
+async def get_user_by_email(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    session_user = (await session.exec(statement)).first()
+    return session_user
+
+
+async def authenticate(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    db_user = await get_user_by_email(session=session, email=email)
+    if not db_user:
+        return None
+    if not await hashing.verify_password(password, db_user.hashed_password):
+        return None
+    return db_user
+
+
+async def create_team(
+    *, session: AsyncSession, team_in: TeamCreate, owner_id: uuid.UUID
+) -> Team:
+    db_team = Team.model_validate(team_in, update={"owner_id": owner_id})
+    session.add(db_team)
+    await session.commit()
+    await session.refresh(db_team)
+    return db_team
+
+
+async def create_user_team(
+    *,
+    session: AsyncSession,
+    user_team_in: UserTeamCreate,
+    user_id: uuid.UUID,
+    team_id: uuid.UUID,
+) -> UserTeam:
+    db_user_team = UserTeam.model_validate(
+        user_team_in, update={"user_id": user_id, "team_id": team_id}
+    )
+    session.add(db_user_team)
+    await session.commit()
+    invalidate_membership(team_id, user_id)
+    await session.refresh(db_user_team)
+    return db_user_team
+
+
+async def create_item(
+    *, session: AsyncSession, item_in: ItemCreate, team_id: uuid.UUID
+) -> Item:
+    db_item = Item.model_validate(item_in, update={"team_id": team_id})
+    session.add(db_item)
+    await session.commit()
+    await session.refresh(db_item)
+    return db_item
+
+
+async def create_user_item(
+    *,
+    session: AsyncSession,
+    user_item_in: UserItemCreate,
+    user_id: uuid.UUID,
+    item_id: uuid.UUID,
+    lab_id: uuid.UUID,
+) -> UserItem:
+    db_user_item = UserItem.model_validate(
+        user_item_in, update={"user_id": user_id, "item_id": item_id, "lab_id": lab_id}
+    )
+    session.add(db_user_item)
+    await session.commit()
+    await session.refresh(db_user_item)
+    return db_user_item
+
+
+async def create_lab(
+    *, session: AsyncSession, lab_in: LabCreate, owner_id: uuid.UUID, team_id: uuid.UUID
+) -> Lab:
+    db_lab = Lab.model_validate(
+        lab_in, update={"owner_id": owner_id, "team_id": team_id}
+    )
+    session.add(db_lab)
+    await session.commit()
+    await session.refresh(db_lab)
+    return db_lab
+
+
+# Open loans removed by ON DELETE CASCADE would stay counted in
+# Item.on_loan. Deleting them here first, in the caller's transaction,
+# returns their units; the DELETE re-checks returned_at, so a concurrent
+# return is not counted twice.
+RELEASE_LOANS_SQL = """
+    WITH released AS (
+        DELETE FROM user_items
+        WHERE returned_at IS NULL AND ({scope})
+        RETURNING item_id
+    ), released_counts AS (
+        SELECT item_id, count(*) AS loans FROM released GROUP BY item_id
+    )
+    UPDATE items SET on_loan = greatest(items.on_loan - released_counts.loans, 0)
+    FROM released_counts
+    WHERE items.item_id = released_counts.item_id
+    RETURNING items.team_id, items.item_id
+"""
+LAB_LOANS_SCOPE = "lab_id = :lab_id"
+# Loans of the user, and in the labs deleted with them: their own and
+# those of the teams they own
+USER_LOANS_SCOPE = """
+    user_id = :user_id OR lab_id IN (
+        SELECT lab_id FROM labs
+        WHERE owner_id = :user_id
+           OR team_id IN (SELECT team_id FROM teams WHERE owner_id = :user_id)
+    )
+"""
+
+
+async def release_open_loans(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID | None = None,
+    lab_id: uuid.UUID | None = None,
+) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """
+    Delete the open loans that deleting the user or lab would cascade to,
+    returning their units to on_loan. Does not commit: call it in the
+    transaction that deletes the user or lab.
+
+    Returns the (team_id, item_id) of each item whose counter changed.
+    """
+    if lab_id is not None:
+        scope, params = LAB_LOANS_SCOPE, {"lab_id": lab_id}
+    elif user_id is not None:
+        scope, params = USER_LOANS_SCOPE, {"user_id": user_id}
+    else:
+        raise ValueError("Pass user_id or lab_id")
+    rows = await session.exec(
+        text(RELEASE_LOANS_SQL.format(scope=scope)),  # type: ignore
+        params=params,
+    )
+    return [(row.team_id, row.item_id) for row in rows]
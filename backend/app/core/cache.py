@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded, thread-safe LRU cache whose entries expire after `ttl_seconds`.
+
+    The cache is per process, so each uvicorn worker keeps its own copy.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._data),
+                max_size=self.max_size,
+                ttl_seconds=self.ttl_seconds,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+
+# Column snapshots of authenticated users, keyed by the token subject (user_id)
+user_cache: TTLCache[dict[str, Any]] = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+count_cache: TTLCache[int] = TTLCache(
+    max_size=settings.COUNT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+# Snapshots of a team and the caller's permissions in it, keyed by
+# (team_id, user_id); only existing memberships are cached
+membership_cache: TTLCache[dict[str, Any]] = TTLCache(
+    max_size=settings.TEAM_MEMBERSHIP_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TEAM_MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+def _evict_users(user_ids: list[str]) -> None:
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+
+def _evict_memberships(keys: list[str]) -> None:
+    for key in keys:
+        team_id, _, user_id = key.partition(":")
+        membership_cache.invalidate((team_id, user_id))
+
+
+def _evict_teams(team_ids: list[str]) -> None:
+    ids = set(team_ids)
+    membership_cache.invalidate_where(
+        lambda key: isinstance(key, tuple) and key[0] in ids
+    )
+
+
+invalidation_bus.subscribe("user", _evict_users, user_cache.clear)
+invalidation_bus.subscribe("membership", _evict_memberships, membership_cache.clear)
+invalidation_bus.subscribe("team", _evict_teams, membership_cache.clear)
+
+
+# Call these once the write committed: other workers evict the key too
+
+
+def invalidate_user(user_id: Any) -> None:
+    _evict_users([str(user_id)])
+    invalidation_bus.publish("user", [str(user_id)])
+
+
+def invalidate_membership(team_id: Any, user_id: Any) -> None:
+    key = f"{team_id}:{user_id}"
+    _evict_memberships([key])
+    invalidation_bus.publish("membership", [key])
+
+
+def invalidate_team(team_id: Any) -> None:
+    _evict_teams([str(team_id)])
+    invalidation_bus.publish("team", [str(team_id)])
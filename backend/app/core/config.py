@@ -56,6 +56,13 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Connection pool, per uvicorn worker
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -68,6 +75,14 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional read replicas for GET endpoints, as comma separated
+    # postgresql+psycopg:// DSNs
+    POSTGRES_REPLICA_URIS: Annotated[
+        list[PostgresDsn] | str, BeforeValidator(parse_cors)
+    ] = []
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    POSTGRES_REPLICA_CHECK_INTERVAL: float = 5.0
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -86,6 +101,45 @@ class Settings(BaseSettings):
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
+    # Email templates are compiled once per worker. In local mode a template
+    # is recompiled when its file changes, unless this is turned off
+    EMAIL_TEMPLATES_RELOAD: bool = True
+    # Compiled templates shared by workers and restarts; None for a
+    # directory under the system temporary directory
+    EMAIL_TEMPLATES_CACHE_DIR: str | None = None
+
+    # bcrypt runs in a dedicated process pool per worker; requests beyond
+    # PASSWORD_HASH_MAX_PENDING in flight are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Per-worker cache of authenticated users resolved in get_current_user
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Per-worker cache of list totals served with count_strategy=cached
+    COUNT_CACHE_MAX_SIZE: int = 1_000
+    COUNT_CACHE_TTL_SECONDS: float = 10.0
+
+    # Per-worker cache of the caller's team permissions
+    TEAM_MEMBERSHIP_CACHE_MAX_SIZE: int = 10_000
+    TEAM_MEMBERSHIP_CACHE_TTL_SECONDS: float = 5.0
+
+    # Cache of GET responses, evicted by the API's own writes. "local" keeps
+    # them per worker; "shared" keeps them in the Redis server at
+    # RESPONSE_CACHE_URL (install the "redis" extra), or in an in-process
+    # stand-in when it is unset
+    RESPONSE_CACHE_BACKEND: Literal["none", "local", "shared"] = "local"
+    RESPONSE_CACHE_URL: str | None = None
+    RESPONSE_CACHE_MAX_SIZE: int = 10_000
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0
+
+    # Workers broadcast the keys they evict from the per-worker caches above,
+    # and the tokens they pin to the primary, on this LISTEN/NOTIFY channel
+    # so that every worker applies them; TTLs bound what a worker misses
+    # while it is not listening
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
@@ -1,10 +1,124 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+class PoolWaitStats:
+    """
+    Time spent by this process waiting to check a connection out of the pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+
+class InstrumentedQueuePool(QueuePool):
+    wait_stats = PoolWaitStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return entry
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    wait_stats = PoolWaitStats()
+
+
+def engine_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **engine_options(),
+)
+
+# Used by the API routes; the sync engine above serves scripts, Alembic and tests
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **engine_options(),
+)
+
+
+@dataclass
+class PoolStats:
+    engine: str
+    pid: int
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+def _pool_stats(name: str, db_engine: Engine) -> PoolStats:
+    pool = db_engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    wait = pool.wait_stats
+    attempts = wait.checkouts + wait.timeouts
+    return PoolStats(
+        engine=name,
+        pid=os.getpid(),
+        pool_size=pool.size(),
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        # QueuePool counts negative overflow while below pool_size
+        overflow=max(pool.overflow(), 0),
+        checkouts=wait.checkouts,
+        timeouts=wait.timeouts,
+        avg_wait_ms=wait.total_wait / attempts * 1000 if attempts else 0.0,
+        max_wait_ms=wait.max_wait * 1000,
+    )
+
+
+def get_pool_stats() -> list[PoolStats]:
+    return [
+        _pool_stats("async", async_engine.sync_engine),
+        _pool_stats("sync", engine),
+    ]
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.core.config import settings
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "email-templates" / "build"
+
+
+class EmailTemplates:
+    """
+    Email templates compiled once into a shared jinja2 Environment.
+
+    Compiled templates are also cached on disk as bytecode, so other
+    workers and restarts load them without compiling. With `auto_reload`,
+    a template whose file changed is recompiled on its next render, at the
+    cost of a stat per render.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        auto_reload: bool = False,
+        cache_dir: str | None = None,
+    ) -> None:
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+            auto_reload=auto_reload,
+            # Never evict: there are only a handful
+            cache_size=-1,
+        )
+
+    def load(self) -> list[str]:
+        """
+        Compile every template now rather than on its first render.
+        """
+        names = self.environment.list_templates(extensions=["html"])
+        for name in names:
+            self.environment.get_template(name)
+        return names
+
+    def render(self, template_name: str, context: dict[str, Any]) -> str:
+        return self.environment.get_template(template_name).render(context)
+
+
+email_templates = EmailTemplates(
+    TEMPLATES_DIR,
+    auto_reload=settings.ENVIRONMENT == "local" and settings.EMAIL_TEMPLATES_RELOAD,
+    cache_dir=settings.EMAIL_TEMPLATES_CACHE_DIR,
+)
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import psycopg
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Each worker caches users, memberships and responses in process. Whoever
+# evicts a key also publishes it with pg_notify once the write committed;
+# every other worker LISTENs on one connection and evicts the same keys,
+# typically a millisecond or two later. Notifications sent while a worker
+# is not listening are lost to it, so it clears its caches when it
+# reconnects.
+
+NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+# pg_notify rejects payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7_000
+RECONNECT_MIN_SECONDS = 0.5
+RECONNECT_MAX_SECONDS = 30.0
+# A listening connection that sees no traffic is pinged this often, so a
+# dead one is noticed rather than waited on forever
+HEARTBEAT_SECONDS = 10.0
+DELAY_SAMPLES = 1_000
+
+
+@dataclass
+class InvalidationStats:
+    listening: bool
+    published: int
+    received: int
+    reconnects: int
+    # From pg_notify to eviction, over the last DELAY_SAMPLES notifications
+    mean_delay_ms: float | None
+    max_delay_ms: float | None
+
+
+@dataclass
+class _Subscriber:
+    evict: Callable[[list[str]], None]
+    clear: Callable[[], None]
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache evictions to the other workers, and applies theirs.
+
+    Caches `subscribe` a kind of key; `publish` queues keys already evicted
+    here for the background task, which sends them in as few notifications
+    as fit. Without a running bus (scripts, tests) they are sent at once.
+    """
+
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._subscribers: dict[str, _Subscriber] = {}
+        self._pending: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._listening = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+        self._delays: deque[float] = deque(maxlen=DELAY_SAMPLES)
+
+    def subscribe(
+        self, kind: str, evict: Callable[[list[str]], None], clear: Callable[[], None]
+    ) -> None:
+        self._subscribers[kind] = _Subscriber(evict, clear)
+
+    def publish(self, kind: str, keys: Iterable[str]) -> None:
+        """
+        Have the other workers evict `keys` of `kind`. Call it after commit.
+        """
+        events = [(kind, key) for key in keys]
+        if not events:
+            return
+        loop = self._loop
+        if loop is None:
+            self._send_now(events)
+            return
+        with self._lock:
+            self._pending.extend(events)
+        # Publishers may be threadpool threads
+        loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _payloads(self, events: list[tuple[str, str]]) -> list[str]:
+        payloads = []
+        keys: dict[str, list[str]] = {}
+        size = 0
+        for kind, key in events:
+            if size + len(kind) + len(key) > MAX_PAYLOAD_BYTES:
+                payloads.append(self._payload(keys))
+                keys, size = {}, 0
+            keys.setdefault(kind, []).append(key)
+            size += len(kind) + len(key) + 8
+        if keys:
+            payloads.append(self._payload(keys))
+        return payloads
+
+    def _payload(self, keys: dict[str, list[str]]) -> str:
+        return json.dumps({"origin": self.origin, "sent_at": time.time(), "keys": keys})
+
+    def _send_now(self, events: list[tuple[str, str]]) -> None:
+        # Imported late: app.core.db imports crud, which imports the caches
+        # that subscribe here
+        from app.core.db import engine
+
+        try:
+            with engine.connect() as connection:
+                for payload in self._payloads(events):
+                    connection.execute(
+                        NOTIFY_SQL, {"channel": self.channel, "payload": payload}
+                    )
+                connection.commit()
+        except Exception:
+            logger.exception("Could not publish cache invalidations")
+            return
+        self.published += len(events)
+
+    async def _publish_pending(self) -> None:
+        from app.core.db import async_engine
+
+        assert self._wakeup is not None
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                events, self._pending = self._pending, []
+            if not events:
+                continue
+            try:
+                async with async_engine.connect() as connection:
+                    for payload in self._payloads(events):
+                        await connection.execute(
+                            NOTIFY_SQL, {"channel": self.channel, "payload": payload}
+                        )
+                    await connection.commit()
+            except Exception as e:
+                # Keep them for the next attempt: the database is away, and
+                # the other workers' listeners with it
+                logger.warning("Could not publish cache invalidations: %s", e)
+                with self._lock:
+                    self._pending[:0] = events
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+                self._wakeup.set()
+            else:
+                self.published += len(events)
+                delay = RECONNECT_MIN_SECONDS
+
+    def receive(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message["origin"] == self.origin:
+            return
+        for kind, keys in message["keys"].items():
+            subscriber = self._subscribers.get(kind)
+            if subscriber is not None:
+                subscriber.evict(keys)
+        self.received += 1
+        self._delays.append(max(0.0, time.time() - message["sent_at"]))
+
+    def clear_all(self) -> None:
+        for subscriber in self._subscribers.values():
+            subscriber.clear()
+
+    async def _listen(self) -> None:
+        conninfo = str(settings.SQLALCHEMY_DATABASE_URI).replace(
+            "postgresql+psycopg://", "postgresql://", 1
+        )
+        delay = RECONNECT_MIN_SECONDS
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f'LISTEN "{self.channel}"')
+                    if connected_before:
+                        # What was published meanwhile never reached us
+                        self.reconnects += 1
+                        self.clear_all()
+                        logger.info("Cache invalidation listener reconnected")
+                    connected_before = True
+                    delay = RECONNECT_MIN_SECONDS
+                    self._listening.set()
+                    while True:
+                        async for notify in connection.notifies(
+                            timeout=HEARTBEAT_SECONDS
+                        ):
+                            self.receive(notify.payload)
+                        await connection.execute("SELECT 1")
+            except Exception as e:
+                self._listening.clear()
+                logger.warning("Cache invalidation listener disconnected: %s", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._listening = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._publish_pending()),
+        ]
+        # Evictions from the first requests onwards are heard
+        try:
+            await asyncio.wait_for(self._listening.wait(), RECONNECT_MIN_SECONDS * 4)
+        except asyncio.TimeoutError:
+            logger.warning("Cache invalidation listener is not connected yet")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        self._wakeup = None
+        with self._lock:
+            events, self._pending = self._pending, []
+        if events:
+            await asyncio.to_thread(self._send_now, events)
+
+    def stats(self) -> InvalidationStats:
+        delays = list(self._delays)
+        return InvalidationStats(
+            listening=self._listening.is_set(),
+            published=self.published,
+            received=self.received,
+            reconnects=self.reconnects,
+            mean_delay_ms=round(sum(delays) / len(delays) * 1000, 3)
+            if delays
+            else None,
+            max_delay_ms=round(max(delays) * 1000, 3) if delays else None,
+        )
+
+
+invalidation_bus = InvalidationBus(settings.CACHE_INVALIDATION_CHANNEL)
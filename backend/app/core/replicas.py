@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import InstrumentedAsyncAdaptedQueuePool, engine_options
+from app.core.invalidation import InvalidationBus, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction; 0 when the server is not a
+# standby, or has replayed all the WAL it received: while the primary is
+# idle the last replayed transaction only grows older
+LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: float | None = None
+    last_checked: float | None = None
+    last_error: str | None = None
+
+
+class ReplicaSet:
+    """
+    Read replicas of one worker, picked round-robin among the healthy ones.
+
+    A background task re-checks every replica each
+    POSTGRES_REPLICA_CHECK_INTERVAL seconds; replicas that fail the check or
+    lag more than POSTGRES_REPLICA_MAX_LAG_SECONDS leave the rotation until
+    a later check passes.
+
+    A token that writes is pinned to the primary in every worker: the pin
+    is broadcast on `bus`, so a request that follows the write reads it
+    from a replica only if it reaches another worker within the millisecond
+    or two the notification takes, or while that worker is not listening.
+    """
+
+    def __init__(self, uris: list[str], bus: InvalidationBus | None = None) -> None:
+        self.replicas = [
+            Replica(
+                name=f"replica-{i}",
+                engine=create_async_engine(
+                    uri, poolclass=InstrumentedAsyncAdaptedQueuePool, **engine_options()
+                ),
+            )
+            for i, uri in enumerate(uris)
+        ]
+        self._counter = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+        # Tokens that recently wrote, pinned to the primary so they read
+        # their own writes while the replicas catch up
+        self._recent_writers: TTLCache[bool] = TTLCache(
+            max_size=settings.USER_CACHE_MAX_SIZE,
+            ttl_seconds=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+        )
+        self._bus = bus
+        if bus is not None:
+            # Pins missed while disconnected cannot be recovered; they would
+            # have expired within POSTGRES_REPLICA_MAX_LAG_SECONDS anyway
+            bus.subscribe("writer", self._pin, lambda: None)
+
+    def pick(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _pin(self, keys: list[str]) -> None:
+        for key in keys:
+            self._recent_writers.set(key, True)
+
+    def mark_write(self, token: str) -> None:
+        key = self._token_key(token)
+        self._pin([key])
+        if self._bus is not None:
+            self._bus.publish("writer", [key])
+
+    def recently_wrote(self, token: str) -> bool:
+        return self._recent_writers.get(self._token_key(token)) is not None
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float((await conn.execute(LAG_QUERY)).scalar_one())
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(
+                    "Read replica %s failed health check: %s", replica.name, e
+                )
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.last_error = str(e)
+        else:
+            replica.lag_seconds = lag
+            replica.last_error = None
+            replica.healthy = lag <= settings.POSTGRES_REPLICA_MAX_LAG_SECONDS
+            if not replica.healthy:
+                logger.warning("Read replica %s is %.1fs behind", replica.name, lag)
+        replica.last_checked = time.time()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.POSTGRES_REPLICA_CHECK_INTERVAL)
+            await self.check_all()
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        await self.check_all()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_set = ReplicaSet(
+    [str(uri) for uri in settings.POSTGRES_REPLICA_URIS], bus=invalidation_bus
+)
@@ -0,0 +1,431 @@
+import builtins
+import fnmatch
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Any, Protocol
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+# GET responses are cached as the JSON they were sent as, keyed by path,
+# query string and principal scope, and tagged with the rows they were built
+# from. Writers evict by tag once they commit: a team edit evicts the
+# entries tagged with that team and nothing else. TTL bounds what tags miss,
+# such as writes made outside the API.
+
+ITEMS_TAG = "items"
+TEAMS_TAG = "teams"
+USERS_TAG = "users"
+
+
+def item_tag(item_id: Any) -> str:
+    return f"item:{item_id}"
+
+
+def team_tag(team_id: Any) -> str:
+    return f"team:{team_id}"
+
+
+def team_items_tag(team_id: Any) -> str:
+    # Every entry built from the team's items
+    return f"team:{team_id}:items"
+
+
+def team_item_lists_tag(team_id: Any) -> str:
+    # Lists of items including the team's
+    return f"team:{team_id}:item-lists"
+
+
+def team_members_tag(team_id: Any) -> str:
+    return f"team:{team_id}:members"
+
+
+def user_tag(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def user_teams_tag(user_id: Any) -> str:
+    # Entries whose visibility follows the user's memberships
+    return f"user:{user_id}:teams"
+
+
+def item_write_tags(team_id: Any, item_ids: Iterable[Any] | None = None) -> list[str]:
+    """
+    The tags to evict once items of a team are written: those of `item_ids`,
+    or of every item of the team when they are not known.
+    """
+    tags = [ITEMS_TAG, team_item_lists_tag(team_id)]
+    if item_ids is None:
+        return [*tags, team_items_tag(team_id)]
+    return [*tags, *(item_tag(item_id) for item_id in item_ids)]
+
+
+def team_delete_tags(team_id: Any) -> list[str]:
+    # Its items and memberships go with it
+    return [
+        TEAMS_TAG,
+        team_tag(team_id),
+        team_members_tag(team_id),
+        *item_write_tags(team_id),
+    ]
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None: ...
+
+    async def invalidate(self, tags: Iterable[str]) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class LocalBackend:
+    """
+    Bounded LRU of responses in this process, each expiring after
+    `ttl_seconds`; other workers keep their own, evicted alike through the
+    invalidation bus.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = (
+            OrderedDict()
+        )
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag[tag]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+    async def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        if self.max_size <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (self._clock() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_size:
+                self._remove(next(iter(self._data)))
+
+    def evict(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+
+    def evict_all(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._keys_by_tag.clear()
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        self.evict(tags)
+
+    async def clear(self) -> None:
+        self.evict_all()
+
+
+class KeyValueStore(Protocol):
+    """
+    The commands SharedBackend needs, as named by redis.asyncio.Redis.
+    """
+
+    async def get(self, name: str) -> bytes | None: ...
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> Any: ...
+
+    async def sadd(self, name: str, *values: str) -> Any: ...
+
+    async def smembers(self, name: str) -> builtins.set[bytes]: ...
+
+    async def expire(self, name: str, time: int) -> Any: ...
+
+    async def delete(self, *names: str) -> Any: ...
+
+    def scan_iter(self, match: str | None = None) -> AsyncIterator[bytes]: ...
+
+
+class InMemoryStore:
+    """
+    Stand-in for a Redis server, in this process, for local runs and tests
+    of SharedBackend.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._values: dict[str, tuple[float | None, Any]] = {}
+
+    def _live(self, name: str) -> Any:
+        entry = self._values.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._values[name]
+            return None
+        return value
+
+    async def get(self, name: str) -> bytes | None:
+        value = self._live(name)
+        return value if isinstance(value, bytes) else None
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> bool:
+        self._values[name] = (None if ex is None else self._clock() + ex, value)
+        return True
+
+    async def sadd(self, name: str, *values: str) -> int:
+        members = self._live(name)
+        if not isinstance(members, set):
+            members = set()
+            self._values[name] = (None, members)
+        added = {value.encode() for value in values} - members
+        members |= added
+        return len(added)
+
+    async def smembers(self, name: str) -> builtins.set[bytes]:
+        members = self._live(name)
+        return set(members) if isinstance(members, set) else set()
+
+    async def expire(self, name: str, time: int) -> bool:
+        if self._live(name) is None:
+            return False
+        self._values[name] = (self._clock() + time, self._values[name][1])
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._values.pop(name, None) is not None for name in names)
+
+    async def scan_iter(self, match: str | None = None) -> AsyncIterator[bytes]:
+        for name in list(self._values):
+            if self._live(name) is not None and (
+                match is None or fnmatch.fnmatchcase(name, match)
+            ):
+                yield name.encode()
+
+
+# Keys removed per DEL by SharedBackend.clear, so as not to hold up the
+# server on a large cache
+CLEAR_BATCH_SIZE = 1_000
+
+
+class SharedBackend:
+    """
+    Responses in a store shared by every worker and replica, so a write
+    evicts them everywhere at once. Each tag is a set of the keys tagged
+    with it.
+    """
+
+    def __init__(
+        self, store: KeyValueStore, *, ttl_seconds: float, prefix: str = "response"
+    ) -> None:
+        self.store = store
+        self.ttl_seconds = max(1, round(ttl_seconds))
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.store.get(f"{self.prefix}:{key}")
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        name = f"{self.prefix}:{key}"
+        # Tag first: an invalidation racing this write then finds the key
+        for tag in tags:
+            tag_name = f"{self.prefix}-tag:{tag}"
+            await self.store.sadd(tag_name, name)
+            await self.store.expire(tag_name, self.ttl_seconds)
+        await self.store.set(name, value, ex=self.ttl_seconds)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_name = f"{self.prefix}-tag:{tag}"
+            names = [name.decode() for name in await self.store.smembers(tag_name)]
+            await self.store.delete(*names, tag_name)
+
+    async def clear(self) -> None:
+        # Only our own keys: the store may be shared with other data
+        for pattern in (f"{self.prefix}:*", f"{self.prefix}-tag:*"):
+            names = [name.decode() async for name in self.store.scan_iter(pattern)]
+            for start in range(0, len(names), CLEAR_BATCH_SIZE):
+                await self.store.delete(*names[start : start + CLEAR_BATCH_SIZE])
+
+
+class DisabledBackend:
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        pass
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+class RouteCacheStats(BaseModel):
+    route: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    # Over the last LATENCY_SAMPLES lookups of each kind, in milliseconds
+    hit_p50_ms: float | None
+    hit_p95_ms: float | None
+    miss_p50_ms: float | None
+    miss_p95_ms: float | None
+
+
+LATENCY_SAMPLES = 1_000
+
+
+def _percentile(samples: deque[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+
+class _RouteMetrics:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.miss_seconds: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+
+class CachedResponse:
+    """
+    The cache entry of one request: `get` it, and on a miss build the
+    response and `store` it.
+    """
+
+    def __init__(self, cache: "ResponseCache", route: str, key: str) -> None:
+        self.cache = cache
+        self.route = route
+        self.key = key
+        self._started = time.perf_counter()
+
+    async def get(self) -> Response | None:
+        self._started = time.perf_counter()
+        body = await self.cache.backend.get(self.key)
+        metrics = self.cache.metrics(self.route)
+        if body is None:
+            metrics.misses += 1
+            return None
+        metrics.hits += 1
+        metrics.hit_seconds.append(time.perf_counter() - self._started)
+        return Response(content=body, media_type="application/json")
+
+    async def store(
+        self, model: type[BaseModel], content: Any, tags: Iterable[str]
+    ) -> Response:
+        """
+        Serialize `content` as `model`, the route's response model, cache it
+        under `tags` and return it as the response.
+        """
+        body = model.model_validate(content).model_dump_json().encode()
+        await self.cache.backend.set(self.key, body, tags)
+        self.cache.metrics(self.route).miss_seconds.append(
+            time.perf_counter() - self._started
+        )
+        return Response(content=body, media_type="application/json")
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._metrics: dict[str, _RouteMetrics] = {}
+        # A shared backend is evicted for every worker by the writer itself
+        if isinstance(backend, LocalBackend):
+            invalidation_bus.subscribe("tag", backend.evict, backend.evict_all)
+
+    def metrics(self, route: str) -> _RouteMetrics:
+        metrics = self._metrics.get(route)
+        if metrics is None:
+            metrics = self._metrics.setdefault(route, _RouteMetrics())
+        return metrics
+
+    def for_request(self, request: Request, scope: str) -> CachedResponse:
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return CachedResponse(self, route, f"{scope}|{request.url.path}?{query}")
+
+    async def invalidate(self, *tags: str) -> None:
+        if tags:
+            await self.backend.invalidate(tags)
+            if isinstance(self.backend, LocalBackend):
+                invalidation_bus.publish("tag", tags)
+
+    def stats(self) -> list[RouteCacheStats]:
+        return [
+            RouteCacheStats(
+                route=route,
+                hits=metrics.hits,
+                misses=metrics.misses,
+                hit_ratio=round(
+                    metrics.hits / max(1, metrics.hits + metrics.misses), 4
+                ),
+                hit_p50_ms=_percentile(metrics.hit_seconds, 0.5),
+                hit_p95_ms=_percentile(metrics.hit_seconds, 0.95),
+                miss_p50_ms=_percentile(metrics.miss_seconds, 0.5),
+                miss_p95_ms=_percentile(metrics.miss_seconds, 0.95),
+            )
+            for route, metrics in sorted(self._metrics.items())
+        ]
+
+
+def _backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "local":
+        return LocalBackend(
+            max_size=settings.RESPONSE_CACHE_MAX_SIZE,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "shared":
+        store: KeyValueStore
+        if settings.RESPONSE_CACHE_URL:
+            import redis.asyncio
+
+            store = redis.asyncio.Redis.from_url(settings.RESPONSE_CACHE_URL)
+        else:
+            store = InMemoryStore()
+        return SharedBackend(store, ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS)
+    return DisabledBackend()
+
+
+response_cache = ResponseCache(_backend())
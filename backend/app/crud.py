@@ -3,13 +3,23 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.core.cache import invalidate_membership, invalidate_user
 from app.core.security import get_password_hash, verify_password
-from app.models import (User, UserCreate, UserUpdate, 
-                        Team, TeamCreate,
-                        UserTeam, UserTeamCreate,
-                        Lab, LabCreate,
-                        Item, ItemCreate,
-                        UserItem, UserItemCreate)
+from app.models import (
+    User,
+    UserCreate,
+    UserUpdate,
+    Team,
+    TeamCreate,
+    UserTeam,
+    UserTeamCreate,
+    Lab,
+    LabCreate,
+    Item,
+    ItemCreate,
+    UserItem,
+    UserItemCreate,
+)
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -32,6 +42,7 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
+    invalidate_user(db_user.user_id)
     session.refresh(db_user)
     return db_user
 
@@ -58,13 +69,24 @@ def create_team(*, session: Session, team_in: TeamCreate, owner_id: uuid.UUID) -
     session.refresh(db_team)
     return db_team
 
-def create_user_team(*, session: Session, user_team_in: UserTeamCreate, user_id: uuid.UUID, team_id: uuid.UUID) -> UserTeam:
-    db_user_team = UserTeam.model_validate(user_team_in, update={"user_id": user_id, "team_id": team_id})
+
+def create_user_team(
+    *,
+    session: Session,
+    user_team_in: UserTeamCreate,
+    user_id: uuid.UUID,
+    team_id: uuid.UUID,
+) -> UserTeam:
+    db_user_team = UserTeam.model_validate(
+        user_team_in, update={"user_id": user_id, "team_id": team_id}
+    )
     session.add(db_user_team)
     session.commit()
+    invalidate_membership(team_id, user_id)
     session.refresh(db_user_team)
     return db_user_team
 
+
 def create_item(*, session: Session, item_in: ItemCreate, team_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"team_id": team_id})
     session.add(db_item)
@@ -72,15 +94,30 @@ def create_item(*, session: Session, item_in: ItemCreate, team_id: uuid.UUID) ->
     session.refresh(db_item)
     return db_item
 
-def create_user_item(*, session: Session, user_item_in: UserItemCreate, user_id: uuid.UUID, item_id: uuid.UUID, lab_id: uuid.UUID) -> UserItem:
-    db_user_item = UserItem.model_validate(user_item_in, update={"user_id": user_id, "item_id": item_id, "lab_id": lab_id})
+
+def create_user_item(
+    *,
+    session: Session,
+    user_item_in: UserItemCreate,
+    user_id: uuid.UUID,
+    item_id: uuid.UUID,
+    lab_id: uuid.UUID,
+) -> UserItem:
+    db_user_item = UserItem.model_validate(
+        user_item_in, update={"user_id": user_id, "item_id": item_id, "lab_id": lab_id}
+    )
     session.add(db_user_item)
     session.commit()
     session.refresh(db_user_item)
     return db_user_item
 
-def create_lab(*, session: Session, lab_in: LabCreate, owner_id: uuid.UUID, team_id: uuid.UUID) -> Lab:
-    db_lab = Lab.model_validate(lab_in, update={"owner_id": owner_id, "team_id": team_id})
+
+def create_lab(
+    *, session: Session, lab_in: LabCreate, owner_id: uuid.UUID, team_id: uuid.UUID
+) -> Lab:
+    db_lab = Lab.model_validate(
+        lab_in, update={"owner_id": owner_id, "team_id": team_id}
+    )
     session.add(db_lab)
     session.commit()
     session.refresh(db_lab)
@@ -0,0 +1,238 @@
+"""
+Send the emails queued in email_outbox.
+
+    python app/email_worker.py [--batch-size 50] [--connections 4] [--poll-interval 1]
+
+Requests do not talk to SMTP: they queue emails in their own transaction
+(app.utils.enqueue_email) and this worker sends them. Due emails are claimed a
+batch at a time with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+workers can run side by side without sending an email twice, and are pushed
+through a pool of SMTP connections kept open from one batch to the next.
+
+A claimed email is leased for LEASE_SECONDS rather than locked while it is
+sent: if the worker dies mid-batch, the email is claimed again once the lease
+runs out. A failed send is retried with exponential backoff, up to
+MAX_ATTEMPTS; emails that run out of attempts stay in the table with their
+last error. The body of an email, which can hold a password or a reset
+token, is cleared once it is sent or out of attempts.
+"""
+
+import argparse
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from emails.backend.smtp import SMTPBackend  # type: ignore
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.utils import build_email, smtp_options
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 8
+# First retry after a minute, doubling up to six hours
+BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+# SMTP servers drop idle connections; let ours go first
+SMTP_IDLE_SECONDS = 30
+
+CLAIM_SQL = text("""
+    UPDATE email_outbox
+    SET attempts = attempts + 1,
+        next_attempt_at = now() + make_interval(secs => :lease_seconds)
+    WHERE email_id IN (
+        SELECT email_id FROM email_outbox
+        WHERE sent_at IS NULL AND next_attempt_at <= now() AND attempts < :max_attempts
+        ORDER BY next_attempt_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING email_id, email_to, subject, html_content, attempts
+""")
+
+MARK_SENT_SQL = text("""
+    UPDATE email_outbox SET sent_at = now(), last_error = NULL, html_content = NULL
+    WHERE email_id = ANY(:email_ids)
+""")
+
+MARK_FAILED_SQL = text("""
+    UPDATE email_outbox
+    SET last_error = failed.error,
+        html_content = CASE
+            WHEN email_outbox.attempts < :max_attempts THEN email_outbox.html_content
+        END,
+        next_attempt_at = now() + make_interval(
+            secs => least(:backoff_seconds * 2 ^ (email_outbox.attempts - 1), :max_backoff_seconds)
+        )
+    FROM unnest(CAST(:email_ids AS uuid[]), CAST(:errors AS text[])) AS failed(email_id, error)
+    WHERE email_outbox.email_id = failed.email_id
+""")
+
+
+@dataclass
+class QueuedEmail:
+    email_id: uuid.UUID
+    email_to: str
+    subject: str
+    html_content: str
+    attempts: int
+
+
+@dataclass
+class OutboxBatch:
+    claimed: int
+    sent: int
+    failed: int
+
+
+class SMTPPool:
+    """
+    Sends emails over up to `connections` SMTP connections at once, each
+    kept open by its sending thread until `close`.
+    """
+
+    def __init__(self, connections: int) -> None:
+        self._executor = ThreadPoolExecutor(connections, thread_name_prefix="smtp")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._backends: list[SMTPBackend] = []
+
+    def _backend(self) -> SMTPBackend:
+        backend = getattr(self._local, "backend", None)
+        if backend is None:
+            backend = SMTPBackend(**smtp_options())
+            self._local.backend = backend
+            with self._lock:
+                self._backends.append(backend)
+        return backend
+
+    def _send(self, email: QueuedEmail) -> str | None:
+        message = build_email(subject=email.subject, html_content=email.html_content)
+        response = message.send(to=email.email_to, smtp=self._backend())
+        if response is not None and response.success:
+            return None
+        if response is None:
+            return "Not sent"
+        return str(response.error or f"{response.status_code} {response.status_text!r}")
+
+    def send(self, emails: list[QueuedEmail]) -> list[str | None]:
+        """
+        Send the emails, returning the error of each, None if it was sent.
+        """
+        return list(self._executor.map(self._send, emails))
+
+    def close(self) -> None:
+        # Reopened on the next send
+        with self._lock:
+            for backend in self._backends:
+                backend.close()
+
+    def shutdown(self) -> None:
+        self.close()
+        self._executor.shutdown()
+
+
+def send_due_emails(
+    session: Session, pool: SMTPPool, *, batch_size: int = 50
+) -> OutboxBatch:
+    emails = [
+        QueuedEmail(*row)
+        for row in session.exec(  # type: ignore
+            CLAIM_SQL,
+            params={
+                "lease_seconds": LEASE_SECONDS,
+                "max_attempts": MAX_ATTEMPTS,
+                "batch_size": batch_size,
+            },
+        )
+    ]
+    # Claimed for the lease: the row locks are not held while sending
+    session.commit()
+    if not emails:
+        return OutboxBatch(claimed=0, sent=0, failed=0)
+
+    errors = pool.send(emails)
+    sent = [
+        email.email_id
+        for email, error in zip(emails, errors, strict=True)
+        if error is None
+    ]
+    failed = [
+        (email, error)
+        for email, error in zip(emails, errors, strict=True)
+        if error is not None
+    ]
+    if sent:
+        session.exec(MARK_SENT_SQL, params={"email_ids": sent})  # type: ignore
+    if failed:
+        session.exec(  # type: ignore
+            MARK_FAILED_SQL,
+            params={
+                "email_ids": [email.email_id for email, _ in failed],
+                "errors": [error for _, error in failed],
+                "max_attempts": MAX_ATTEMPTS,
+                "backoff_seconds": BACKOFF_SECONDS,
+                "max_backoff_seconds": MAX_BACKOFF_SECONDS,
+            },
+        )
+    session.commit()
+    for email, error in failed:
+        log = logger.error if email.attempts >= MAX_ATTEMPTS else logger.warning
+        log(
+            "Sending email %s to %s failed (attempt %d of %d): %s",
+            email.email_id,
+            email.email_to,
+            email.attempts,
+            MAX_ATTEMPTS,
+            error,
+        )
+    return OutboxBatch(claimed=len(emails), sent=len(sent), failed=len(failed))
+
+
+def run(*, batch_size: int, connections: int, poll_interval: float) -> None:
+    pool = SMTPPool(connections)
+    last_sent = time.monotonic()
+    try:
+        while True:
+            with Session(engine) as session:
+                batch = send_due_emails(session, pool, batch_size=batch_size)
+            if batch.claimed:
+                logger.info("Sent %d emails, %d failed", batch.sent, batch.failed)
+                last_sent = time.monotonic()
+            # A full batch means more are probably due: go straight on
+            if batch.claimed < batch_size:
+                if time.monotonic() - last_sent > SMTP_IDLE_SECONDS:
+                    pool.close()
+                time.sleep(poll_interval)
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+    if not settings.emails_enabled:
+        # Not an error: deployments without SMTP still start the worker,
+        # which would otherwise be restarted over and over
+        logger.warning("SMTP_HOST or EMAILS_FROM_EMAIL is not set, not sending emails")
+        return
+    run(
+        batch_size=args.batch_size,
+        connections=args.connections,
+        poll_interval=args.poll_interval,
+    )
+
+
+if __name__ == "__main__":
+    main()
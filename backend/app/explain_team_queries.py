@@ -0,0 +1,118 @@
+"""
+Confirm through EXPLAIN that the hot team queries use index scans.
+
+    python app/explain_team_queries.py [--disable-seqscan]
+
+Sample ids are taken from existing rows. On small tables Postgres prefers a
+sequential scan even when an index exists; pass --disable-seqscan to check
+that the index can serve the query regardless of table size.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, col, select
+
+from app.api.params_filter import params_filters
+from app.api.routes.teams import team_roster_statement
+from app.core.db import engine
+from app.models import Item, Lab, User, UserItem, UserTeam
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def hot_queries(user_id: uuid.UUID, team_id: uuid.UUID) -> dict[str, Any]:
+    return {
+        # Caller's permissions, run by almost every team route
+        "membership": select(UserTeam).where(
+            UserTeam.user_id == user_id, UserTeam.team_id == team_id
+        ),
+        "team roster": team_roster_statement(team_id),
+        "teams of user": select(UserTeam).where(UserTeam.user_id == user_id),
+        "team items": select(Item).where(Item.team_id == team_id),
+        "team labs": select(Lab).where(Lab.team_id == team_id),
+        "items by params": select(Item).where(
+            *params_filters(
+                col(Item.item_params),
+                [("params.voltage", "5"), ("params.wavelength[gte]", "500")],
+            )
+        ),
+        "loans of user": select(UserItem).where(UserItem.user_id == user_id),
+        "overdue loans": select(UserItem)
+        .where(
+            col(UserItem.returned_at).is_(None),
+            col(UserItem.borrowed_at) < datetime.now(timezone.utc) - timedelta(days=14),
+        )
+        .order_by(col(UserItem.borrowed_at)),
+        "loans borrowed in range": select(UserItem).where(
+            col(UserItem.borrowed_at) >= datetime.now(timezone.utc) - timedelta(days=7)
+        ),
+        "members by email": select(User).where(
+            col(User.email).in_(["a@example.com", "b@example.com"])
+        ),
+    }
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(session: Session, statement: Any) -> dict[str, Any]:
+    compiled = statement.compile(
+        dialect=postgresql.dialect(),  # type: ignore[no-untyped-call]
+        compile_kwargs={"literal_binds": True},
+    )
+    row = session.exec(text(f"EXPLAIN (FORMAT JSON) {compiled}")).one()  # type: ignore
+    plan = row[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return dict(plan[0]["Plan"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--disable-seqscan", action="store_true")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.disable_seqscan:
+            session.exec(text("SET enable_seqscan = off"))  # type: ignore
+        sample = session.exec(select(UserTeam).limit(1)).first()
+        user_id = sample.user_id if sample else uuid.uuid4()
+        team_id = sample.team_id if sample else uuid.uuid4()
+
+        failures = 0
+        for name, statement in hot_queries(user_id, team_id).items():
+            nodes = list(plan_nodes(explain(session, statement)))
+            seq_scans = [
+                n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"
+            ]
+            summary = ", ".join(
+                f"{n['Node Type']}"
+                + (f" using {n['Index Name']}" if "Index Name" in n else "")
+                + (f" on {n['Relation Name']}" if "Relation Name" in n else "")
+                for n in nodes
+            )
+            if seq_scans:
+                failures += 1
+                logger.error("%s: sequential scan on %s (%s)", name, seq_scans, summary)
+            else:
+                logger.info("%s: %s", name, summary)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRoute
+from starlette.middleware.base import RequestResponseEndpoint
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.responses import FastJSONResponse
+from app.core import hashing
 from app.core.config import settings
+from app.core.db import async_engine
+from app.core.email_templates import email_templates
+from app.core.invalidation import invalidation_bus
+from app.core.replicas import replica_set
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,10 +24,25 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    email_templates.load()
+    await replica_set.start()
+    await invalidation_bus.start()
+    yield
+    await invalidation_bus.stop()
+    await replica_set.stop()
+    hashing.shutdown()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +55,24 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+
+async def pin_writers_to_primary(
+    request: Request, call_next: RequestResponseEndpoint
+) -> Response:
+    response = await call_next(request)
+    authorization = request.headers.get("Authorization")
+    if (
+        authorization
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer":
+            replica_set.mark_write(token)
+    return response
+
+
+if replica_set.replicas:
+    app.middleware("http")(pin_writers_to_primary)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
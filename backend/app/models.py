@@ -1,5 +1,20 @@
 import uuid
-from pydantic import EmailStr
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+
+from pydantic import EmailStr, computed_field
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -56,7 +71,10 @@ class UserPublic(UserBase):
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    # None when requested with count_strategy=none
+    count: int | None
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: str | None = None
 
 
 class TeamBase(SQLModel):
@@ -74,7 +92,9 @@ class TeamUpdate(TeamBase):
 class Team(TeamBase, table=True):
     __tablename__ = "teams"
     team_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    owner_id: uuid.UUID = Field(foreign_key="users.user_id", nullable=False, ondelete="CASCADE")
+    owner_id: uuid.UUID = Field(
+        foreign_key="users.user_id", nullable=False, ondelete="CASCADE", index=True
+    )
     owner: User = Relationship(back_populates="teams")
     user_teams: list["UserTeam"] = Relationship(back_populates="team")
     items: list["Item"] = Relationship(back_populates="team")
@@ -88,14 +108,25 @@ class TeamPublic(TeamBase):
 
 class TeamsPublic(SQLModel):
     data: list[TeamPublic]
-    count: int
+    # None when requested with count_strategy=none
+    count: int | None
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: str | None = None
 
 
 class UserTeam(SQLModel, table=True):
     __tablename__ = "user_team"
+    # Also serves lookups by user_id alone
+    __table_args__ = (
+        UniqueConstraint("user_id", "team_id", name="uq_user_team_user_id_team_id"),
+    )
     user_team_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="users.user_id", nullable=False, ondelete="CASCADE")
-    team_id: uuid.UUID = Field(foreign_key="teams.team_id", nullable=False, ondelete="CASCADE")
+    user_id: uuid.UUID = Field(
+        foreign_key="users.user_id", nullable=False, ondelete="CASCADE"
+    )
+    team_id: uuid.UUID = Field(
+        foreign_key="teams.team_id", nullable=False, ondelete="CASCADE", index=True
+    )
     can_edit_labs: bool = Field(default=False)
     can_edit_items: bool = Field(default=False)
     can_edit_users: bool = Field(default=False)
@@ -110,6 +141,31 @@ class UserTeamCreate(SQLModel):
     can_edit_users: bool = False
 
 
+class UserTeamsBulkCreate(SQLModel):
+    # One INSERT ... SELECT FROM unnest() of an array per column, so five
+    # bind parameters however many rows; the cap bounds the request size
+    users: list[UserTeamCreate] = Field(min_length=1, max_length=5_000)
+
+
+class UserTeamBulkStatus(str, Enum):
+    added = "added"
+    already_member = "already_member"
+    user_not_found = "user_not_found"
+
+
+class UserTeamBulkResult(SQLModel):
+    # Echoes the validated request email; EmailStr would re-validate it per row
+    email: str
+    status: UserTeamBulkStatus
+    user_id: uuid.UUID | None = None
+
+
+class UserTeamsBulkPublic(SQLModel):
+    # One entry per distinct email, in request order
+    data: list[UserTeamBulkResult]
+    added: int
+
+
 class UserTeamUpdate(SQLModel):
     can_edit_labs: bool = False
     can_edit_items: bool = False
@@ -119,6 +175,7 @@ class UserTeamUpdate(SQLModel):
 class UserTeamDelete(SQLModel):
     user_id: uuid.UUID
 
+
 class UserWithPermissions(SQLModel):
     email: EmailStr
     is_active: bool
@@ -130,13 +187,35 @@ class UserWithPermissions(SQLModel):
     can_edit_users: bool
 
 
+class TeamMembership(SQLModel):
+    """The caller's standing in a team, as resolved for authorization."""
+
+    team_id: uuid.UUID
+    owner_id: uuid.UUID
+    # False for superusers acting on a team they are not in
+    is_member: bool
+    can_edit_labs: bool
+    can_edit_items: bool
+    can_edit_users: bool
+
+
+class UserTeamsPublic(SQLModel):
+    data: list[UserWithPermissions]
+    # None when requested with count_strategy=none
+    count: int | None
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: str | None = None
+
+
 # Shared properties
 class ItemBase(SQLModel):
     item_name: str = Field(min_length=1, max_length=255)
-    quantity: int = Field(default=1)
+    # Stored in a Postgres integer column
+    quantity: int = Field(default=1, ge=-(2**31), le=2**31 - 1)
     item_img_url: str | None = Field(default=None, max_length=255)
     item_vendor: str | None = Field(default=None, max_length=255)
-    item_params: str | None = Field(default=None, max_length=255)
+    # Specs such as {"voltage": 5, "size": "M"}; filter with params.<key>
+    item_params: dict[str, Any] | None = Field(default=None, sa_type=JSONB)
 
 
 # Properties to receive on item creation
@@ -150,23 +229,117 @@ class ItemUpdate(ItemBase):
 
 
 # Database model, database table inferred from class name
+# Weighted full-text document for item search: name, then vendor, then params
+ITEM_SEARCH_VECTOR = Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        "setweight(to_tsvector('english', coalesce(item_name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(item_vendor, '')), 'B') || "
+        "setweight(jsonb_to_tsvector('english', coalesce(item_params, '{}'), "
+        '\'["string", "numeric", "key"]\'), \'C\')',
+        persisted=True,
+    ),
+)
+
+
 class Item(ItemBase, table=True):
     __tablename__ = "items"
+    __table_args__ = (
+        CheckConstraint("on_loan >= 0", name="ck_items_on_loan_non_negative"),
+        Index("ix_items_search_vector", ITEM_SEARCH_VECTOR, postgresql_using="gin"),
+        Index("ix_items_item_params", "item_params", postgresql_using="gin"),
+        # The trigram index on item_name needs pg_trgm and is created by the
+        # migration only
+    )
+    # Only read by search, so not loaded with the rest of the row
+    __mapper_args__ = {"properties": {"search_vector": deferred(ITEM_SEARCH_VECTOR)}}
     item_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    team_id: uuid.UUID = Field(foreign_key="teams.team_id", nullable=False, ondelete="CASCADE")
+    team_id: uuid.UUID = Field(
+        foreign_key="teams.team_id", nullable=False, ondelete="CASCADE", index=True
+    )
+    # Open loans (user_items with returned_at IS NULL), kept in step by
+    # checkout and return; app/reconcile_on_loan.py repairs any drift
+    on_loan: int = Field(
+        default=0, nullable=False, sa_column_kwargs={"server_default": "0"}
+    )
+    search_vector: str | None = Field(
+        default=None, sa_column=ITEM_SEARCH_VECTOR, exclude=True
+    )
     team: Team = Relationship(back_populates="items")
-    user_items: list["UserItem"] = Relationship(back_populates="item", sa_relationship_kwargs={"cascade": "delete"})
+    user_items: list["UserItem"] = Relationship(
+        back_populates="item", sa_relationship_kwargs={"cascade": "delete"}
+    )
 
 
 # Properties to return via API, id is always required
 class ItemPublic(ItemBase):
     item_id: uuid.UUID
     team_id: uuid.UUID
+    on_loan: int
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def available(self) -> int:
+        return max(self.quantity - self.on_loan, 0)
 
 
 class ItemsPublic(SQLModel):
     data: list[ItemPublic]
-    count: int
+    # None when requested with count_strategy=none
+    count: int | None
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class ItemSearchPublic(ItemPublic):
+    # Higher is a better match
+    rank: float
+
+
+class ItemsSearchPublic(SQLModel):
+    data: list[ItemSearchPublic]
+
+
+class ItemBatchUpdate(ItemUpdate):
+    item_id: uuid.UUID
+
+
+class ItemsBatch(SQLModel):
+    create: list[ItemCreate] = Field(default_factory=list, max_length=10_000)
+    update: list[ItemBatchUpdate] = Field(default_factory=list, max_length=10_000)
+    delete: list[uuid.UUID] = Field(default_factory=list, max_length=10_000)
+    # True: apply every row or none. False: apply the rows that can be
+    # applied and report the others
+    atomic: bool = True
+
+
+class ItemBatchOperation(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+
+class ItemBatchStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+    duplicate = "duplicate"
+
+
+class ItemBatchResult(SQLModel):
+    operation: ItemBatchOperation
+    # Position of the row in its request list
+    index: int
+    item_id: uuid.UUID
+    status: ItemBatchStatus
+
+
+class ItemsBatchPublic(SQLModel):
+    data: list[ItemBatchResult]
+    # False when an atomic batch was rejected, so nothing was written
+    applied: bool
 
 
 # Shared properties
@@ -191,12 +364,20 @@ class LabUpdate(LabBase):
 # Database model, database table inferred from class name
 class Lab(LabBase, table=True):
     __tablename__ = "labs"
+    # Serves team-scoped listings in keyset order, and team_id lookups alone
+    __table_args__ = (Index("ix_labs_team_id_lab_id", "team_id", "lab_id"),)
     lab_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    owner_id: uuid.UUID = Field(foreign_key="users.user_id", nullable=False, ondelete="CASCADE")
-    team_id: uuid.UUID = Field(foreign_key="teams.team_id", nullable=False, ondelete="CASCADE")
+    owner_id: uuid.UUID = Field(
+        foreign_key="users.user_id", nullable=False, ondelete="CASCADE", index=True
+    )
+    team_id: uuid.UUID = Field(
+        foreign_key="teams.team_id", nullable=False, ondelete="CASCADE"
+    )
     owner: User = Relationship(back_populates="labs")
     team: Team = Relationship(back_populates="labs")
-    user_items: list["UserItem"] = Relationship(back_populates="lab", sa_relationship_kwargs={"cascade": "delete"})
+    user_items: list["UserItem"] = Relationship(
+        back_populates="lab", sa_relationship_kwargs={"cascade": "delete"}
+    )
 
 
 # Properties to return via API, id is always required
@@ -208,13 +389,16 @@ class LabPublic(LabBase):
 
 class LabsPublic(SQLModel):
     data: list[LabPublic]
-    count: int
+    # None when requested with count_strategy=none
+    count: int | None
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: str | None = None
 
 
 # Shared properties
 class UserItemBase(SQLModel):
-    borrowed_at: str
-    returned_at: str | None = None
+    borrowed_at: datetime = Field(sa_type=DateTime(timezone=True))  # type: ignore[call-overload]
+    returned_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))  # type: ignore[call-overload]
     table_name: str | None = None
     system_name: str | None = None
     item_status: str | None = None
@@ -225,10 +409,18 @@ class UserItemCreate(UserItemBase):
     pass
 
 
+# Properties to receive on item checkout
+class UserItemCheckout(SQLModel):
+    item_id: uuid.UUID
+    lab_id: uuid.UUID
+    table_name: str | None = None
+    system_name: str | None = None
+
+
 # Properties to receive on user item update
 class UserItemUpdate(UserItemBase):
-    borrowed_at: str | None = None
-    returned_at: str | None = None
+    borrowed_at: datetime | None = None  # type: ignore
+    returned_at: datetime | None = None
     table_name: str | None = None
     system_name: str | None = None
     item_status: str | None = None
@@ -237,10 +429,26 @@ class UserItemUpdate(UserItemBase):
 # Database model, database table inferred from class name
 class UserItem(UserItemBase, table=True):
     __tablename__ = "user_items"
+    __table_args__ = (
+        # Open loans ordered by age: overdue and open-loan queries only scan
+        # the (small) set of loans not yet returned
+        Index(
+            "ix_user_items_open_borrowed_at",
+            "borrowed_at",
+            postgresql_where=text("returned_at IS NULL"),
+        ),
+        Index("ix_user_items_borrowed_at", "borrowed_at"),
+    )
     user_item_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="users.user_id", nullable=False, ondelete="CASCADE")
-    item_id: uuid.UUID = Field(foreign_key="items.item_id", nullable=False, ondelete="CASCADE")
-    lab_id: uuid.UUID = Field(foreign_key="labs.lab_id", nullable=False, ondelete="CASCADE")
+    user_id: uuid.UUID = Field(
+        foreign_key="users.user_id", nullable=False, ondelete="CASCADE", index=True
+    )
+    item_id: uuid.UUID = Field(
+        foreign_key="items.item_id", nullable=False, ondelete="CASCADE", index=True
+    )
+    lab_id: uuid.UUID = Field(
+        foreign_key="labs.lab_id", nullable=False, ondelete="CASCADE", index=True
+    )
     user: User = Relationship(back_populates="user_items")
     item: Item = Relationship(back_populates="user_items")
     lab: Lab = Relationship(back_populates="user_items")
@@ -259,6 +467,39 @@ class UserItemsPublic(SQLModel):
     count: int
 
 
+# Emails waiting to be sent by app/email_worker.py, written in the
+# transaction of the request that sends them. html_content can carry
+# passwords and reset tokens: the worker clears it once the email is sent
+# or out of attempts
+class EmailOutbox(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # The worker only ever looks at unsent emails that are due
+        Index(
+            "ix_email_outbox_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
+    email_id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str
+    html_content: str | None
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    next_attempt_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    attempts: int = 0
+    sent_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    last_error: str | None = None
+
+
 # JWT token
 class Token(SQLModel):
     access_token: str
@@ -274,5 +515,6 @@ class NewPassword(SQLModel):
     token: str
     new_password: str = Field(min_length=8, max_length=40)
 
+
 class Message(SQLModel):
     message: str
@@ -0,0 +1,87 @@
+"""
+Recompute Item.on_loan from open loans and report any drift.
+
+    python app/reconcile_on_loan.py [--batch-size 1000]
+
+Checkout, return and the API's user and lab deletes keep the counter in step,
+but loans removed by manual SQL, or cascaded from rows deleted outside the
+API, leave it too high. Items are processed in primary key order, one batch
+per transaction: the batch's rows are locked first so checkouts and returns
+of those items wait instead of racing the recount, then open loans are
+counted in a fresh statement and only mismatched counters are rewritten.
+"""
+
+import argparse
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlmodel import Session, col, select
+
+from app.core.db import engine
+from app.models import Item
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RECONCILE_SQL = text("""
+    WITH actual AS (
+        SELECT items.item_id, items.on_loan AS recorded, count(user_items.user_item_id) AS actual
+        FROM items
+        LEFT JOIN user_items
+          ON user_items.item_id = items.item_id AND user_items.returned_at IS NULL
+        WHERE items.item_id = ANY(:item_ids)
+        GROUP BY items.item_id
+        HAVING items.on_loan <> count(user_items.user_item_id)
+    )
+    UPDATE items SET on_loan = actual.actual
+    FROM actual
+    WHERE items.item_id = actual.item_id
+    RETURNING items.item_id, actual.recorded, actual.actual
+""")
+
+
+@dataclass
+class OnLoanDrift:
+    item_id: uuid.UUID
+    recorded: int
+    actual: int
+
+
+def reconcile_on_loan(session: Session, *, batch_size: int = 1000) -> list[OnLoanDrift]:
+    drifts: list[OnLoanDrift] = []
+    last_id: uuid.UUID | None = None
+    while True:
+        statement = select(Item.item_id).order_by(col(Item.item_id)).limit(batch_size)
+        if last_id is not None:
+            statement = statement.where(col(Item.item_id) > last_id)
+        item_ids = list(session.exec(statement.with_for_update()).all())
+        if not item_ids:
+            break
+        rows = session.exec(RECONCILE_SQL, params={"item_ids": item_ids}).all()  # type: ignore
+        session.commit()
+        drifts.extend(OnLoanDrift(*row) for row in rows)
+        last_id = item_ids[-1]
+    return drifts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        drifts = reconcile_on_loan(session, batch_size=args.batch_size)
+    for drift in drifts:
+        logger.warning(
+            "item %s: on_loan was %d, %d loans are open",
+            drift.item_id,
+            drift.recorded,
+            drift.actual,
+        )
+    logger.info("Reconciled on_loan: %d item(s) corrected", len(drifts))
+
+
+if __name__ == "__main__":
+    main()
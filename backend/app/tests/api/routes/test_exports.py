@@ -0,0 +1,86 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.routes import exports
+from app.core.config import settings
+from app.tests.utils.item import create_random_item
+
+
+def test_export_items_ndjson(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    item.item_params = {"channels": 2}
+    db.add(item)
+    db.commit()
+    response = client.get(
+        f"{settings.API_V1_STR}/exports/items", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert (
+        response.headers["content-disposition"] == 'attachment; filename="items.ndjson"'
+    )
+    rows = {row["item_id"]: row for row in map(json.loads, response.text.splitlines())}
+    assert rows[str(item.item_id)] == {
+        "item_name": item.item_name,
+        "quantity": item.quantity,
+        "item_img_url": item.item_img_url,
+        "item_vendor": item.item_vendor,
+        "item_params": {"channels": 2},
+        "item_id": str(item.item_id),
+        "team_id": str(item.team_id),
+        "on_loan": item.on_loan,
+    }
+
+
+def test_export_users_csv_in_batches(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(exports, "BATCH_SIZE", 1)
+    response = client.get(
+        f"{settings.API_V1_STR}/exports/users",
+        headers=superuser_token_headers,
+        params={"format": "csv"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert "hashed_password" not in rows[0]
+    assert settings.FIRST_SUPERUSER in {row["email"] for row in rows}
+
+
+def test_export_user_items_gzip(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/exports/user-items",
+        headers=superuser_token_headers,
+        params={"format": "csv", "gzip": True},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert (
+        response.headers["content-disposition"]
+        == 'attachment; filename="user_items.csv.gz"'
+    )
+    # The client sees the gzip as the body, not as a content encoding
+    header = gzip.decompress(response.content).decode().splitlines()[0]
+    assert header.startswith("borrowed_at,returned_at,")
+
+
+def test_export_not_enough_privileges(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/exports/items", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
@@ -0,0 +1,207 @@
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, select
+
+from app.api import item_import
+from app.core.config import settings
+from app.models import Item
+from app.tests.utils.item import create_random_item
+from app.tests.utils.team import create_random_team
+
+
+def post_import(
+    client: TestClient,
+    headers: dict[str, str],
+    team_id: Any,
+    body: str,
+    media_type: str,
+) -> list[dict[str, Any]]:
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**headers, "Content-Type": media_type},
+        params={"team_id": str(team_id)},
+        content=body.encode(),
+    )
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_import_items_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    body = (
+        "item_name,quantity,item_vendor,item_params\r\n"
+        'Probe,2,"Rigol, Inc.","{""channels"": 2}"\r\n'
+        'Cable,3,"multi\nline",\r\n'
+        "Broken,many,,\r\n"
+        ",1,,\r\n"
+        "Short,1\r\n"
+        "Relay,,,\r\n"
+    )
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "text/csv"
+    )
+    errors = {e["line"]: e["errors"] for e in events if e["event"] == "error"}
+    assert set(errors) == {5, 6, 7}
+    assert errors[5][0].startswith("quantity:")
+    assert errors[6][0].startswith("item_name:")
+    assert errors[7] == ["Expected 4 fields, found 2"]
+    assert events[-1] == {
+        "event": "done",
+        "rows": 6,
+        "created": 3,
+        "updated": 0,
+        "rejected": 3,
+    }
+
+    items = {
+        item.item_name: item
+        for item in db.exec(select(Item).where(Item.team_id == team.team_id)).all()
+    }
+    assert set(items) == {"Probe", "Cable", "Relay"}
+    assert items["Probe"].item_vendor == "Rigol, Inc."
+    assert items["Probe"].item_params == {"channels": 2}
+    assert items["Cable"].item_vendor == "multi\nline"
+    assert items["Relay"].quantity == 1
+
+
+def test_import_items_ndjson_merges_by_item_id(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    existing = create_random_item(db, team=team)
+    other_team_item = create_random_item(db)
+    lines = [
+        {"item_id": str(existing.item_id), "item_name": "Renamed", "quantity": 4},
+        {"item_name": "New", "item_params": {"voltage": 5}},
+        {"item_id": str(other_team_item.item_id), "item_name": "Stolen"},
+        {"item_id": str(existing.item_id), "item_name": "Again"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n[1]\n"
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "application/x-ndjson"
+    )
+    errors = {e["line"]: e["errors"] for e in events if e["event"] == "error"}
+    assert errors[3] == ["item_id: Item not found"]
+    assert errors[4] == ["item_id: already given on line 1"]
+    assert errors[5][0].startswith("Invalid JSON")
+    assert errors[6] == ["Expected a JSON object"]
+    assert events[-1] == {
+        "event": "done",
+        "rows": 6,
+        "created": 1,
+        "updated": 1,
+        "rejected": 4,
+    }
+
+    db.refresh(existing)
+    db.refresh(other_team_item)
+    assert existing.item_name == "Renamed"
+    assert existing.quantity == 4
+    assert other_team_item.item_name != "Stolen"
+    assert db.exec(
+        select(Item).where(Item.team_id == team.team_id, Item.item_name == "New")
+    ).one().item_params == {"voltage": 5}
+
+
+def test_import_items_reports_progress_per_chunk(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(item_import, "CHUNK_SIZE", 10)
+    team = create_random_team(db)
+    body = "item_name\n" + "".join(f"Item {n}\n" for n in range(25))
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "text/csv"
+    )
+    assert [e["rows"] for e in events if e["event"] == "progress"] == [10, 20, 25]
+    assert events[-1]["created"] == 25
+    count = len(
+        db.exec(select(Item.item_id).where(col(Item.team_id) == team.team_id)).all()
+    )
+    assert count == 25
+
+
+def test_import_items_failed_imports_nothing(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    body = "name,quantity\nProbe,1\n"
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "text/csv"
+    )
+    assert events == [
+        {
+            "event": "failed",
+            "detail": "The CSV header has no item_name column",
+            "rows": 0,
+        }
+    ]
+    assert not db.exec(select(Item).where(Item.team_id == team.team_id)).all()
+
+
+def test_import_items_rejects_out_of_range_quantity(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    body = (
+        json.dumps({"item_name": "big", "quantity": 99999999999})
+        + "\n"
+        + json.dumps({"item_name": "small", "quantity": 2})
+        + "\n"
+    )
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "application/x-ndjson"
+    )
+    errors = {e["line"]: e["errors"] for e in events if e["event"] == "error"}
+    assert list(errors) == [1]
+    assert errors[1][0].startswith("quantity:")
+    assert events[-1]["event"] == "done"
+    assert events[-1]["created"] == 1
+
+
+def test_import_items_reports_rows_refused_by_the_database(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    # jsonb cannot store a NUL character
+    body = json.dumps({"item_name": "nul", "item_params": {"note": "\u0000"}})
+    events = post_import(
+        client, superuser_token_headers, team.team_id, body, "application/x-ndjson"
+    )
+    assert events[-1]["event"] == "failed"
+    assert events[-1]["detail"].startswith("The database refused the import:")
+    assert not db.exec(select(Item).where(Item.team_id == team.team_id)).all()
+
+
+def test_import_items_unsupported_media_type(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**superuser_token_headers, "Content-Type": "application/pdf"},
+        params={"team_id": str(team.team_id)},
+        content=b"%PDF",
+    )
+    assert response.status_code == 415
+
+
+def test_import_items_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**normal_user_token_headers, "Content-Type": "text/csv"},
+        params={"team_id": str(team.team_id)},
+        content=b"item_name\nProbe\n",
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
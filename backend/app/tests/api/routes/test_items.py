@@ -1,27 +1,53 @@
 import uuid
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from app import crud
 from app.core.config import settings
+from app.models import Item, ItemCreate, UserUpdate
 from app.tests.utils.item import create_random_item
+from app.tests.utils.team import add_team_member, create_random_team
+from app.tests.utils.user import (
+    authentication_token_from_email,
+    create_random_user,
+    user_authentication_headers,
+)
+from app.tests.utils.utils import random_lower_string
 
 
 def test_create_item(
-    client: TestClient, superuser_token_headers: dict[str, str]
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
-    data = {"title": "Foo", "description": "Fighters"}
+    team = create_random_team(db)
+    data = {"item_name": "Foo", "item_vendor": "Fighters", "quantity": 3}
     response = client.post(
         f"{settings.API_V1_STR}/items/",
         headers=superuser_token_headers,
+        params={"team_id": str(team.team_id)},
         json=data,
     )
     assert response.status_code == 200
     content = response.json()
-    assert content["title"] == data["title"]
-    assert content["description"] == data["description"]
-    assert "id" in content
-    assert "owner_id" in content
+    assert content["item_name"] == data["item_name"]
+    assert content["item_vendor"] == data["item_vendor"]
+    assert content["quantity"] == data["quantity"]
+    assert "item_id" in content
+    assert content["team_id"] == str(team.team_id)
+
+
+def test_create_item_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        params={"team_id": str(team.team_id)},
+        json={"item_name": "Foo"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
 
 
 def test_read_item(
@@ -29,15 +55,58 @@ def test_read_item(
 ) -> None:
     item = create_random_item(db)
     response = client.get(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 200
     content = response.json()
-    assert content["title"] == item.title
-    assert content["description"] == item.description
-    assert content["id"] == str(item.id)
-    assert content["owner_id"] == str(item.owner_id)
+    assert content["item_name"] == item.item_name
+    assert content["item_vendor"] == item.item_vendor
+    assert content["item_id"] == str(item.item_id)
+    assert content["team_id"] == str(item.team_id)
+
+
+def test_read_item_team_member(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    add_team_member(db, team=team, user=user)
+    item = create_random_item(db, team=team)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/{item.item_id}",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["item_id"] == str(item.item_id)
+
+
+def test_read_item_cached_until_access_is_lost(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    item = create_random_item(db, team=team)
+    url = f"{settings.API_V1_STR}/items/{item.item_id}"
+    owner_headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    member_headers = authentication_token_from_email(
+        client=client, email=member.email, db=db
+    )
+
+    assert client.get(url, headers=member_headers).status_code == 200
+    response = client.put(url, headers=owner_headers, json={"item_name": "Renamed"})
+    assert response.status_code == 200
+    assert client.get(url, headers=member_headers).json()["item_name"] == "Renamed"
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}/remove-user",
+        headers=owner_headers,
+    )
+    assert response.status_code == 200
+    assert client.get(url, headers=member_headers).status_code == 400
 
 
 def test_read_item_not_found(
@@ -57,7 +126,7 @@ def test_read_item_not_enough_permissions(
 ) -> None:
     item = create_random_item(db)
     response = client.get(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=normal_user_token_headers,
     )
     assert response.status_code == 400
@@ -79,28 +148,47 @@ def test_read_items(
     assert len(content["data"]) >= 2
 
 
+def test_read_items_scoped_to_member_teams(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    add_team_member(db, team=team, user=user)
+    item = create_random_item(db, team=team)
+    other_item = create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    item_ids = {i["item_id"] for i in response.json()["data"]}
+    assert str(item.item_id) in item_ids
+    assert str(other_item.item_id) not in item_ids
+
+
 def test_update_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     item = create_random_item(db)
-    data = {"title": "Updated title", "description": "Updated description"}
+    data = {"item_name": "Updated name", "item_vendor": "Updated vendor"}
     response = client.put(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=superuser_token_headers,
         json=data,
     )
     assert response.status_code == 200
     content = response.json()
-    assert content["title"] == data["title"]
-    assert content["description"] == data["description"]
-    assert content["id"] == str(item.id)
-    assert content["owner_id"] == str(item.owner_id)
+    assert content["item_name"] == data["item_name"]
+    assert content["item_vendor"] == data["item_vendor"]
+    assert content["item_id"] == str(item.item_id)
+    assert content["team_id"] == str(item.team_id)
 
 
 def test_update_item_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
-    data = {"title": "Updated title", "description": "Updated description"}
+    data = {"item_name": "Updated name", "item_vendor": "Updated vendor"}
     response = client.put(
         f"{settings.API_V1_STR}/items/{uuid.uuid4()}",
         headers=superuser_token_headers,
@@ -115,9 +203,9 @@ def test_update_item_not_enough_permissions(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
     item = create_random_item(db)
-    data = {"title": "Updated title", "description": "Updated description"}
+    data = {"item_name": "Updated name", "item_vendor": "Updated vendor"}
     response = client.put(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=normal_user_token_headers,
         json=data,
     )
@@ -131,7 +219,7 @@ def test_delete_item(
 ) -> None:
     item = create_random_item(db)
     response = client.delete(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 200
@@ -156,9 +244,347 @@ def test_delete_item_not_enough_permissions(
 ) -> None:
     item = create_random_item(db)
     response = client.delete(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{settings.API_V1_STR}/items/{item.item_id}",
         headers=normal_user_token_headers,
     )
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_read_items_cursor_pagination(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    password = "cursorpass123"
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(password=password))
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    team = create_random_team(db, owner=user)
+    item_ids = {str(create_random_item(db, team=team).item_id) for _ in range(5)}
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_STR}/items/", headers=headers, params=params
+        )
+        assert response.status_code == 200
+        content = response.json()
+        seen.extend(i["item_id"] for i in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": content["next_cursor"]}
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == item_ids
+    assert seen == sorted(seen)
+
+
+def test_read_items_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_read_items_count_strategies(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    create_random_item(db)
+    counts = {}
+    for strategy in ("exact", "estimated", "cached", "none"):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            params={"count_strategy": strategy, "limit": 1},
+        )
+        assert response.status_code == 200
+        counts[strategy] = response.json()["count"]
+    assert counts["exact"] >= 1
+    assert counts["cached"] == counts["exact"]
+    assert isinstance(counts["estimated"], int)
+    assert counts["none"] is None
+
+
+def test_read_items_count_estimated_for_member(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    password = "countpass123"
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(password=password))
+    headers = user_authentication_headers(
+        client=client, email=user.email, password=password
+    )
+    team = create_random_team(db, owner=user)
+    create_random_item(db, team=team)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=headers,
+        params={"count_strategy": "estimated"},
+    )
+    assert response.status_code == 200
+    assert isinstance(response.json()["count"], int)
+
+
+def test_read_items_count_estimated_with_colon_in_filter(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=superuser_token_headers,
+        params={"count_strategy": "estimated", "params.note": " :x"},
+    )
+    assert response.status_code == 200
+    assert isinstance(response.json()["count"], int)
+
+
+def test_search_items_ranked_and_scoped(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    user = crud.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    assert user
+    add_team_member(db, team=team, user=user)
+    token = random_lower_string()
+    by_params = crud.create_item(
+        session=db,
+        item_in=ItemCreate(
+            item_name="Bench supply", item_params={"voltage": 5, "notes": token}
+        ),
+        team_id=team.team_id,
+    )
+    by_name = crud.create_item(
+        session=db,
+        item_in=ItemCreate(item_name=f"{token} oscilloscopes"),
+        team_id=team.team_id,
+    )
+    other_team_item = crud.create_item(
+        session=db,
+        item_in=ItemCreate(item_name=f"{token} oscilloscopes"),
+        team_id=create_random_team(db).team_id,
+    )
+    response = client.get(
+        f"{settings.API_V1_STR}/items/search",
+        headers=normal_user_token_headers,
+        params={"q": token},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [i["item_id"] for i in data] == [
+        str(by_name.item_id),
+        str(by_params.item_id),
+    ]
+    assert data[0]["rank"] > data[1]["rank"]
+    assert str(other_team_item.item_id) not in {i["item_id"] for i in data}
+
+    # Stemming: the singular finds the plural
+    response = client.get(
+        f"{settings.API_V1_STR}/items/search",
+        headers=normal_user_token_headers,
+        params={"q": f"{token} oscilloscope"},
+    )
+    assert [i["item_id"] for i in response.json()["data"]] == [str(by_name.item_id)]
+
+
+def test_search_items_team_not_member(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/search",
+        headers=normal_user_token_headers,
+        params={"q": "anything", "team_id": str(team.team_id)},
+    )
+    assert response.status_code == 403
+
+
+def test_search_items_requires_query(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/search",
+        headers=normal_user_token_headers,
+        params={"q": ""},
+    )
+    assert response.status_code == 422
+
+
+def test_read_items_params_filters(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    key = random_lower_string()
+    specs = [
+        {key: 5, "size": "M"},
+        {key: 12, "dims": {"width": 10}},
+        {key: "5"},
+        {"size": "M"},
+    ]
+    item_ids = [
+        str(
+            crud.create_item(
+                session=db,
+                item_in=ItemCreate(item_name="Spec", item_params=params),
+                team_id=team.team_id,
+            ).item_id
+        )
+        for params in specs
+    ]
+
+    def matching(params: dict[str, str]) -> set[str]:
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            params={**params, "limit": 1000},
+        )
+        assert response.status_code == 200
+        return {i["item_id"] for i in response.json()["data"]} & set(item_ids)
+
+    assert matching({f"params.{key}": "5"}) == {item_ids[0]}
+    assert matching({f"params.{key}": '"5"'}) == {item_ids[2]}
+    assert matching({f"params.{key}[gte]": "5", f"params.{key}[lt]": "12"}) == {
+        item_ids[0]
+    }
+    assert matching({f"params.{key}[gt]": "5"}) == {item_ids[1]}
+    assert matching({f"params.{key}[exists]": "true"}) == set(item_ids[:3])
+    assert matching({f"params.{key}[exists]": "false"}) == {item_ids[3]}
+    assert matching({f"params.{key}": "5", "params.size": "M"}) == {item_ids[0]}
+    assert matching({"params.dims.width": "10"}) == {item_ids[1]}
+
+
+def test_read_items_params_filter_invalid(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    for params in (
+        {"params.voltage[between]": "1"},
+        {"params.voltage[exists]": "maybe"},
+        {"params.voltage[gt]": "true"},
+        {"params..voltage": "1"},
+    ):
+        response = client.get(
+            f"{settings.API_V1_STR}/items/",
+            headers=superuser_token_headers,
+            params=params,
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid params filter")
+
+
+def test_batch_items(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    to_update = create_random_item(db, team=team)
+    to_delete = create_random_item(db, team=team)
+    deleted_id = to_delete.item_id
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=superuser_token_headers,
+        params={"team_id": str(team.team_id)},
+        json={
+            "create": [
+                {"item_name": "Probe", "item_params": {"channels": 2}},
+                {"item_name": "Cable"},
+            ],
+            "update": [{"item_id": str(to_update.item_id), "quantity": 7}],
+            "delete": [str(to_delete.item_id)],
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["applied"] is True
+    assert [(r["operation"], r["index"], r["status"]) for r in content["data"]] == [
+        ("create", 0, "created"),
+        ("create", 1, "created"),
+        ("update", 0, "updated"),
+        ("delete", 0, "deleted"),
+    ]
+    created = db.get(Item, uuid.UUID(content["data"][0]["item_id"]))
+    assert created and created.team_id == team.team_id
+    assert created.item_params == {"channels": 2}
+    db.refresh(to_update)
+    assert to_update.quantity == 7
+    # Fields not sent are left alone
+    assert to_update.item_vendor is not None
+    assert db.exec(select(Item).where(Item.item_id == deleted_id)).first() is None
+
+
+def test_batch_items_atomic_rejects_whole_batch(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    item = create_random_item(db, team=team)
+    other_team_item = create_random_item(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=superuser_token_headers,
+        params={"team_id": str(team.team_id)},
+        json={
+            "create": [{"item_name": "Never written"}],
+            "update": [
+                {"item_id": str(item.item_id), "quantity": 9},
+                {"item_id": str(other_team_item.item_id), "quantity": 9},
+            ],
+            "delete": [str(item.item_id)],
+        },
+    )
+    assert response.status_code == 409
+    content = response.json()
+    assert content["applied"] is False
+    assert [r["status"] for r in content["data"]] == [
+        "created",
+        "updated",
+        "not_found",
+        "duplicate",
+    ]
+    db.refresh(item)
+    db.refresh(other_team_item)
+    assert item.quantity == 1
+    assert other_team_item.quantity == 1
+    assert db.get(Item, uuid.UUID(content["data"][0]["item_id"])) is None
+
+
+def test_batch_items_best_effort(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    item = create_random_item(db, team=team)
+    missing_id = uuid.uuid4()
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=superuser_token_headers,
+        params={"team_id": str(team.team_id)},
+        json={
+            "update": [
+                {"item_id": str(missing_id), "quantity": 3},
+                {"item_id": str(item.item_id), "quantity": 3},
+            ],
+            "atomic": False,
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["applied"] is True
+    assert [(r["item_id"], r["status"]) for r in content["data"]] == [
+        (str(missing_id), "not_found"),
+        (str(item.item_id), "updated"),
+    ]
+    db.refresh(item)
+    assert item.quantity == 3
+
+
+def test_batch_items_not_enough_permissions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch",
+        headers=normal_user_token_headers,
+        params={"team_id": str(team.team_id)},
+        json={"create": [{"item_name": "Foo"}]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough permissions"
@@ -0,0 +1,184 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.tests.utils.lab import create_random_lab
+from app.tests.utils.team import add_team_member, create_random_team
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+
+
+def test_create_lab(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    data = {"lab_place": "Room 101", "lab_university": "Uni", "lab_num": "1"}
+    response = client.post(
+        f"{settings.API_V1_STR}/labs/",
+        headers=superuser_token_headers,
+        params={"team_id": str(team.team_id)},
+        json=data,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["lab_place"] == data["lab_place"]
+    assert content["team_id"] == str(team.team_id)
+    assert "lab_id" in content
+
+
+def test_create_lab_requires_can_edit_labs(client: TestClient, db: Session) -> None:
+    team = create_random_team(db)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=member.email, db=db)
+    response = client.post(
+        f"{settings.API_V1_STR}/labs/",
+        headers=headers,
+        params={"team_id": str(team.team_id)},
+        json={"lab_place": "Room 101"},
+    )
+    assert response.status_code == 403
+
+
+def test_read_lab_team_member(client: TestClient, db: Session) -> None:
+    team = create_random_team(db)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    lab = create_random_lab(db, team=team)
+    headers = authentication_token_from_email(client=client, email=member.email, db=db)
+    response = client.get(f"{settings.API_V1_STR}/labs/{lab.lab_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["lab_id"] == str(lab.lab_id)
+
+
+def test_read_lab_not_a_member(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    lab = create_random_lab(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}", headers=normal_user_token_headers
+    )
+    assert response.status_code == 403
+
+
+def test_read_lab_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/{uuid.uuid4()}", headers=superuser_token_headers
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Lab not found"
+
+
+def test_read_labs_scoped_and_filtered(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    lab = create_random_lab(db, team=team, lab_university="Uni A")
+    other_lab = create_random_lab(db, team=team, lab_university="Uni B")
+    foreign_lab = create_random_lab(db, lab_university="Uni A")
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    response = client.get(f"{settings.API_V1_STR}/labs/", headers=headers)
+    assert response.status_code == 200
+    lab_ids = {lab["lab_id"] for lab in response.json()["data"]}
+    assert lab_ids == {str(lab.lab_id), str(other_lab.lab_id)}
+    assert str(foreign_lab.lab_id) not in lab_ids
+
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/",
+        headers=headers,
+        params={"team_id": str(team.team_id), "lab_university": "Uni A"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [lab["lab_id"] for lab in content["data"]] == [str(lab.lab_id)]
+    assert content["count"] == 1
+
+
+def test_read_labs_cursor_pagination(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    lab_ids = {str(create_random_lab(db, team=team).lab_id) for _ in range(3)}
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"team_id": str(team.team_id), "limit": 2}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_STR}/labs/", headers=headers, params=params
+        )
+        assert response.status_code == 200
+        content = response.json()
+        seen.extend(lab["lab_id"] for lab in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params = {**params, "cursor": content["next_cursor"]}
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == lab_ids
+
+
+def test_read_labs_of_other_team(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    lab = create_random_lab(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/",
+        headers=normal_user_token_headers,
+        params={"team_id": str(lab.team_id)},
+    )
+    assert response.status_code == 403
+
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/",
+        headers=normal_user_token_headers,
+        params={"team_id": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+
+
+def test_update_lab(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    lab = create_random_lab(db, team=team)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+    response = client.put(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}",
+        headers=headers,
+        json={"lab_place": "Room 202"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["lab_place"] == "Room 202"
+    assert content["lab_university"] == lab.lab_university
+
+
+def test_update_lab_requires_can_edit_labs(client: TestClient, db: Session) -> None:
+    team = create_random_team(db)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    lab = create_random_lab(db, team=team)
+    headers = authentication_token_from_email(client=client, email=member.email, db=db)
+    response = client.put(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}",
+        headers=headers,
+        json={"lab_place": "Room 202"},
+    )
+    assert response.status_code == 403
+
+
+def test_delete_lab(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    lab = create_random_lab(db)
+    response = client.delete(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["message"] == "Lab deleted successfully"
+    response = client.get(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}", headers=superuser_token_headers
+    )
+    assert response.status_code == 404
@@ -4,8 +4,8 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
 from app.core.config import settings
-from app.core.security import verify_password
-from app.models import User
+from app.core.security import get_password_hash, verify_password
+from app.models import EmailOutbox, User
 from app.utils import generate_password_reset_token
 
 
@@ -43,7 +43,7 @@ def test_use_access_token(
 
 
 def test_recovery_password(
-    client: TestClient, normal_user_token_headers: dict[str, str]
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
     with (
         patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
@@ -56,6 +56,13 @@ def test_recovery_password(
         )
         assert r.status_code == 200
         assert r.json() == {"message": "Password recovery email sent"}
+        # Queued for the email worker rather than sent inline
+        assert db.exec(
+            select(EmailOutbox).where(
+                EmailOutbox.email_to == email,
+                EmailOutbox.subject.contains("Password recovery"),  # type: ignore
+            )
+        ).first()
 
 
 def test_recovery_password_user_not_exits(
@@ -87,6 +94,11 @@ def test_reset_password(
     assert user
     assert verify_password(data["new_password"], user.hashed_password)
 
+    # Restore the superuser password for the following test modules
+    user.hashed_password = get_password_hash(settings.FIRST_SUPERUSER_PASSWORD)
+    db.add(user)
+    db.commit()
+
 
 def test_reset_password_invalid_token(
     client: TestClient, superuser_token_headers: dict[str, str]
@@ -0,0 +1,318 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.tests.utils.team import add_team_member, create_random_team
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+from app.tests.utils.utils import random_email
+
+
+def test_view_team_users(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users", headers=headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    users = {u["user_id"]: u for u in content["data"]}
+    assert users.keys() == {str(owner.user_id), str(member.user_id)}
+    assert users[str(owner.user_id)]["can_edit_users"] is True
+    assert users[str(member.user_id)]["can_edit_users"] is False
+    assert users[str(member.user_id)]["email"] == member.email
+
+
+def test_view_team_users_cursor_pagination(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    user_ids = {str(owner.user_id)}
+    for _ in range(4):
+        member = create_random_user(db)
+        add_team_member(db, team=team, user=member)
+        user_ids.add(str(member.user_id))
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get(
+            f"{settings.API_V1_STR}/teams/{team.team_id}/users",
+            headers=headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        seen.extend(u["user_id"] for u in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": content["next_cursor"]}
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == user_ids
+
+
+def test_view_team_users_filter_by_permission(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users",
+        headers=headers,
+        params={"can_edit_items": False},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [u["user_id"] for u in content["data"]] == [str(member.user_id)]
+    assert content["count"] == 1
+
+
+def test_view_team_users_not_a_member(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 403
+
+
+def test_view_team_users_team_not_found(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{uuid.uuid4()}/users",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_view_user_in_team(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["email"] == member.email
+    assert content["can_edit_items"] is False
+
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{uuid.uuid4()}",
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+
+def test_update_user_permissions_requires_can_edit_users(
+    client: TestClient, db: Session
+) -> None:
+    team = create_random_team(db)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=member.email, db=db)
+
+    response = client.put(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}/update-permissions",
+        headers=headers,
+        json={"email": member.email, "can_edit_users": True},
+    )
+    assert response.status_code == 403
+
+
+def test_update_user_permissions(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    owner_headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    member_headers = authentication_token_from_email(
+        client=client, email=member.email, db=db
+    )
+    url = f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}/update-permissions"
+    data = {"email": member.email, "can_edit_users": True}
+
+    # Resolve (and cache) the member's permissions before they change
+    assert client.put(url, headers=member_headers, json=data).status_code == 403
+
+    response = client.put(url, headers=owner_headers, json=data)
+    assert response.status_code == 200
+    assert client.put(url, headers=member_headers, json=data).status_code == 200
+
+
+def test_remove_user_from_team_revokes_access(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    owner_headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    member_headers = authentication_token_from_email(
+        client=client, email=member.email, db=db
+    )
+    roster_url = f"{settings.API_V1_STR}/teams/{team.team_id}/users"
+    assert client.get(roster_url, headers=member_headers).status_code == 200
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}/remove-user",
+        headers=owner_headers,
+    )
+    assert response.status_code == 200
+    assert client.get(roster_url, headers=member_headers).status_code == 403
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{member.user_id}/remove-user",
+        headers=owner_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_add_user_to_team_twice(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    user = create_random_user(db)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    def add() -> int:
+        response = client.request(
+            "GET",
+            f"{settings.API_V1_STR}/teams/{team.team_id}/add-users",
+            headers=headers,
+            json={"email": user.email, "can_edit_items": True},
+        )
+        return response.status_code
+
+    assert add() == 200
+    assert add() == 409
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{user.user_id}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["can_edit_items"] is True
+
+
+def test_add_users_to_team(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    existing = create_random_user(db)
+    add_team_member(db, team=team, user=existing)
+    new = create_random_user(db)
+    unknown_email = random_email()
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    response = client.post(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users",
+        headers=headers,
+        json={
+            "users": [
+                {"email": new.email, "can_edit_items": True},
+                {"email": existing.email},
+                {"email": unknown_email},
+                {"email": new.email},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["added"] == 1
+    assert [(r["email"], r["status"]) for r in content["data"]] == [
+        (new.email, "added"),
+        (existing.email, "already_member"),
+        (unknown_email, "user_not_found"),
+    ]
+    assert content["data"][0]["user_id"] == str(new.user_id)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users/{new.user_id}",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["can_edit_items"] is True
+
+
+def test_add_users_to_team_requires_can_edit_users(
+    client: TestClient, db: Session
+) -> None:
+    team = create_random_team(db)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=member.email, db=db)
+
+    response = client.post(
+        f"{settings.API_V1_STR}/teams/{team.team_id}/users",
+        headers=headers,
+        json={"users": [{"email": random_email()}]},
+    )
+    assert response.status_code == 403
+
+
+def test_team_edit_evicts_only_its_cached_responses(
+    client: TestClient, db: Session
+) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    other_team = create_random_team(db, owner=owner)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+    route = f"{settings.API_V1_STR}/teams/{{team_id}}"
+
+    def read(team_id: uuid.UUID) -> dict[str, str]:
+        response = client.get(f"{settings.API_V1_STR}/teams/{team_id}", headers=headers)
+        assert response.status_code == 200
+        team: dict[str, str] = response.json()
+        return team
+
+    def route_stats() -> tuple[int, int]:
+        stats = next(s for s in response_cache.stats() if s.route == route)
+        return stats.hits, stats.misses
+
+    read(team.team_id)
+    read(other_team.team_id)
+    response = client.put(
+        f"{settings.API_V1_STR}/teams/{team.team_id}",
+        headers=headers,
+        json={"team_name": "Renamed"},
+    )
+    assert response.status_code == 200
+
+    hits, misses = route_stats()
+    assert read(team.team_id)["team_name"] == "Renamed"
+    assert route_stats() == (hits, misses + 1)
+    assert read(other_team.team_id)["team_name"] == other_team.team_name
+    assert route_stats() == (hits + 1, misses + 1)
+
+
+def test_membership_change_evicts_cached_roster(
+    client: TestClient, db: Session
+) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    member = create_random_user(db)
+    add_team_member(db, team=team, user=member)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+    url = f"{settings.API_V1_STR}/teams/{team.team_id}/users"
+
+    assert client.get(url, headers=headers).json()["count"] == 2
+    response = client.delete(f"{url}/{member.user_id}/remove-user", headers=headers)
+    assert response.status_code == 200
+    assert client.get(url, headers=headers).json()["count"] == 1
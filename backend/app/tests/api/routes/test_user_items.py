@@ -0,0 +1,220 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, func, select
+
+from app.core.config import settings
+from app.models import UserItem
+from app.tests.utils.item import create_random_item
+from app.tests.utils.lab import create_random_lab
+from app.tests.utils.team import add_team_member, create_random_team
+from app.tests.utils.user import authentication_token_from_email, create_random_user
+
+CHECKOUT_URL = f"{settings.API_V1_STR}/user-items/checkout"
+
+
+def return_url(user_item_id: str) -> str:
+    return f"{settings.API_V1_STR}/user-items/{user_item_id}/return"
+
+
+def test_checkout_and_return(client: TestClient, db: Session) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    item = create_random_item(db, team=team)
+    lab = create_random_lab(db, team=team)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+    data = {"item_id": str(item.item_id), "lab_id": str(lab.lab_id)}
+
+    response = client.post(CHECKOUT_URL, headers=headers, json=data)
+    assert response.status_code == 200
+    loan = response.json()
+    assert loan["user_id"] == str(owner.user_id)
+    assert loan["item_status"] == "borrowed"
+    assert loan["returned_at"] is None
+
+    item_url = f"{settings.API_V1_STR}/items/{item.item_id}"
+    content = client.get(item_url, headers=headers).json()
+    assert (content["on_loan"], content["available"]) == (1, 0)
+
+    response = client.post(CHECKOUT_URL, headers=headers, json=data)
+    assert response.status_code == 409
+
+    response = client.post(return_url(loan["user_item_id"]), headers=headers)
+    assert response.status_code == 200
+    assert response.json()["item_status"] == "returned"
+    assert response.json()["returned_at"] is not None
+    content = client.get(item_url, headers=headers).json()
+    assert (content["on_loan"], content["available"]) == (0, 1)
+
+    response = client.post(return_url(loan["user_item_id"]), headers=headers)
+    assert response.status_code == 409
+
+    response = client.post(CHECKOUT_URL, headers=headers, json=data)
+    assert response.status_code == 200
+
+
+def test_checkout_not_a_member(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    team = create_random_team(db)
+    item = create_random_item(db, team=team)
+    lab = create_random_lab(db, team=team)
+    response = client.post(
+        CHECKOUT_URL,
+        headers=normal_user_token_headers,
+        json={"item_id": str(item.item_id), "lab_id": str(lab.lab_id)},
+    )
+    assert response.status_code == 403
+
+
+def test_checkout_lab_of_another_team(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    lab = create_random_lab(db)
+    response = client.post(
+        CHECKOUT_URL,
+        headers=superuser_token_headers,
+        json={"item_id": str(item.item_id), "lab_id": str(lab.lab_id)},
+    )
+    assert response.status_code == 404
+
+
+def test_checkout_item_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        CHECKOUT_URL,
+        headers=superuser_token_headers,
+        json={"item_id": str(uuid.uuid4()), "lab_id": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Item not found"
+
+
+def test_return_requires_borrower_or_item_editor(
+    client: TestClient, db: Session
+) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    borrower = create_random_user(db)
+    add_team_member(db, team=team, user=borrower)
+    bystander = create_random_user(db)
+    add_team_member(db, team=team, user=bystander)
+    item = create_random_item(db, team=team)
+    lab = create_random_lab(db, team=team)
+    borrower_headers = authentication_token_from_email(
+        client=client, email=borrower.email, db=db
+    )
+    response = client.post(
+        CHECKOUT_URL,
+        headers=borrower_headers,
+        json={"item_id": str(item.item_id), "lab_id": str(lab.lab_id)},
+    )
+    assert response.status_code == 200
+    url = return_url(response.json()["user_item_id"])
+
+    bystander_headers = authentication_token_from_email(
+        client=client, email=bystander.email, db=db
+    )
+    assert client.post(url, headers=bystander_headers).status_code == 403
+
+    owner_headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    assert client.post(url, headers=owner_headers).status_code == 200
+
+
+def test_concurrent_checkouts_never_exceed_quantity(
+    client: TestClient, db: Session
+) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    quantity = 5
+    item = create_random_item(db, team=team, quantity=quantity)
+    other_item = create_random_item(db, team=team, quantity=quantity)
+    lab = create_random_lab(db, team=team)
+    headers = authentication_token_from_email(client=client, email=owner.email, db=db)
+
+    def checkout(item_id: uuid.UUID) -> int:
+        response = client.post(
+            CHECKOUT_URL,
+            headers=headers,
+            json={"item_id": str(item_id), "lab_id": str(lab.lab_id)},
+        )
+        return response.status_code
+
+    # Many parallel clients race for one item while another is checked out too
+    attempts = [item.item_id] * 100 + [other_item.item_id] * 20
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        results = list(pool.map(checkout, attempts))
+
+    statuses = results[:100]
+    assert statuses.count(200) == quantity
+    assert statuses.count(409) == 100 - quantity
+    assert results[100:].count(200) == quantity
+
+    on_loan = db.exec(
+        select(func.count()).where(
+            UserItem.item_id == item.item_id, col(UserItem.returned_at).is_(None)
+        )
+    ).one()
+    assert on_loan == quantity
+    db.refresh(item)
+    assert item.on_loan == quantity
+
+
+def test_deleting_lab_or_borrower_returns_open_loans(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    owner = create_random_user(db)
+    team = create_random_team(db, owner=owner)
+    borrower = create_random_user(db)
+    add_team_member(db, team=team, user=borrower)
+    item = create_random_item(db, team=team, quantity=4)
+    lab = create_random_lab(db, team=team)
+    other_lab = create_random_lab(db, team=team)
+    owner_headers = authentication_token_from_email(
+        client=client, email=owner.email, db=db
+    )
+    borrower_headers = authentication_token_from_email(
+        client=client, email=borrower.email, db=db
+    )
+    item_url = f"{settings.API_V1_STR}/items/{item.item_id}"
+
+    def checkout(headers: dict[str, str], lab_id: uuid.UUID) -> str:
+        response = client.post(
+            CHECKOUT_URL,
+            headers=headers,
+            json={"item_id": str(item.item_id), "lab_id": str(lab_id)},
+        )
+        assert response.status_code == 200
+        return str(response.json()["user_item_id"])
+
+    def on_loan() -> int:
+        return int(client.get(item_url, headers=owner_headers).json()["on_loan"])
+
+    checkout(owner_headers, lab.lab_id)
+    checkout(borrower_headers, lab.lab_id)
+    checkout(borrower_headers, other_lab.lab_id)
+    returned = checkout(borrower_headers, other_lab.lab_id)
+    assert (
+        client.post(return_url(returned), headers=borrower_headers).status_code == 200
+    )
+    assert on_loan() == 3
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/labs/{lab.lab_id}", headers=owner_headers
+    )
+    assert response.status_code == 200
+    assert on_loan() == 1
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/users/{borrower.user_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert on_loan() == 0
+    db.refresh(item)
+    assert item.on_loan == 0
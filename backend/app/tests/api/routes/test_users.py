@@ -7,7 +7,7 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import EmailOutbox, User, UserCreate
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -37,7 +37,6 @@ def test_create_user_new_email(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     with (
-        patch("app.utils.send_email", return_value=None),
         patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
         patch("app.core.config.settings.SMTP_USER", "admin@example.com"),
     ):
@@ -54,6 +53,10 @@ def test_create_user_new_email(
         user = crud.get_user_by_email(session=db, email=username)
         assert user
         assert user.email == created_user["email"]
+        # Queued for the email worker rather than sent inline
+        assert db.exec(
+            select(EmailOutbox).where(EmailOutbox.email_to == username)
+        ).one()
 
 
 def test_get_existing_user(
@@ -63,7 +66,7 @@ def test_get_existing_user(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
-    user_id = user.id
+    user_id = user.user_id
     r = client.get(
         f"{settings.API_V1_STR}/users/{user_id}",
         headers=superuser_token_headers,
@@ -80,7 +83,7 @@ def test_get_existing_user_current_user(client: TestClient, db: Session) -> None
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
-    user_id = user.id
+    user_id = user.user_id
 
     login_data = {
         "username": username,
@@ -330,7 +333,7 @@ def test_update_user(
 
     data = {"full_name": "Updated_full_name"}
     r = client.patch(
-        f"{settings.API_V1_STR}/users/{user.id}",
+        f"{settings.API_V1_STR}/users/{user.user_id}",
         headers=superuser_token_headers,
         json=data,
     )
@@ -374,7 +377,7 @@ def test_update_user_email_exists(
 
     data = {"email": user2.email}
     r = client.patch(
-        f"{settings.API_V1_STR}/users/{user.id}",
+        f"{settings.API_V1_STR}/users/{user.user_id}",
         headers=superuser_token_headers,
         json=data,
     )
@@ -387,7 +390,7 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
-    user_id = user.id
+    user_id = user.user_id
 
     login_data = {
         "username": username,
@@ -405,10 +408,10 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
-    result = db.exec(select(User).where(User.id == user_id)).first()
+    result = db.exec(select(User).where(User.user_id == user_id)).first()
     assert result is None
 
-    user_query = select(User).where(User.id == user_id)
+    user_query = select(User).where(User.user_id == user_id)
     user_db = db.execute(user_query).first()
     assert user_db is None
 
@@ -432,7 +435,7 @@ def test_delete_user_super_user(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
-    user_id = user.id
+    user_id = user.user_id
     r = client.delete(
         f"{settings.API_V1_STR}/users/{user_id}",
         headers=superuser_token_headers,
@@ -440,7 +443,7 @@ def test_delete_user_super_user(
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
-    result = db.exec(select(User).where(User.id == user_id)).first()
+    result = db.exec(select(User).where(User.user_id == user_id)).first()
     assert result is None
 
 
@@ -460,7 +463,7 @@ def test_delete_user_current_super_user_error(
 ) -> None:
     super_user = crud.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER)
     assert super_user
-    user_id = super_user.id
+    user_id = super_user.user_id
 
     r = client.delete(
         f"{settings.API_V1_STR}/users/{user_id}",
@@ -479,7 +482,7 @@ def test_delete_user_without_privileges(
     user = crud.create_user(session=db, user_create=user_in)
 
     r = client.delete(
-        f"{settings.API_V1_STR}/users/{user.id}",
+        f"{settings.API_V1_STR}/users/{user.user_id}",
         headers=normal_user_token_headers,
     )
     assert r.status_code == 403
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_db_pool_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    stats = {pool["engine"]: pool for pool in r.json()}
+    assert stats["async"]["pool_size"] == settings.POSTGRES_POOL_SIZE
+    assert stats["async"]["checkouts"] > 0
+    assert stats["sync"]["checked_out"] >= 0
+
+
+def test_db_pool_stats_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool-stats/",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 403
+
+
+def test_user_cache_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/user-cache-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["max_size"] == settings.USER_CACHE_MAX_SIZE
+
+
+def test_response_cache_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    for _ in range(2):
+        client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/response-cache-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    stats = {s["route"]: s for s in r.json()}
+    users = stats[f"{settings.API_V1_STR}/users/"]
+    assert users["hits"] >= 1
+    assert 0 < users["hit_ratio"] <= 1
+    assert users["hit_p50_ms"] is not None
+
+
+def test_cache_invalidation_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/cache-invalidation-stats/",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["listening"] is True
@@ -0,0 +1,37 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from pydantic_core import to_json
+
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+from app.main import app
+
+CONTENT = {
+    "user_id": uuid.UUID("6f1c1a52-3f6e-4bf3-9a43-6c1e2b7d9f00"),
+    "borrowed_at": datetime(2024, 5, 1, 12, 30, 15, 250, tzinfo=timezone.utc),
+    "local": datetime(2024, 5, 1, 14, 30, tzinfo=timezone(timedelta(hours=2))),
+    "naive": datetime(2024, 5, 1, 12, 30),
+    "day": date(2024, 5, 1),
+    "price": Decimal("9.99"),
+    "name": "Ünïcode",
+    "params": {"voltage": 240, "rated": None, "sizes": [1, 2.5]},
+}
+
+
+def test_fast_json_response_encodes_like_pydantic() -> None:
+    body = FastJSONResponse(CONTENT).body
+    assert body == to_json(CONTENT)
+    assert b'"borrowed_at":"2024-05-01T12:30:15.000250Z"' in body
+    assert b'"user_id":"6f1c1a52-3f6e-4bf3-9a43-6c1e2b7d9f00"' in body
+
+
+def test_fast_json_response_is_the_default(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    assert app.router.default_response_class is FastJSONResponse
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.headers["content-type"] == "application/json"
+    assert uuid.UUID(r.json()["user_id"])
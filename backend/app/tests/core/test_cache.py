@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from app.core.cache import TTLCache, user_cache
+from app.core.config import settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_hit_and_miss() -> None:
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl_seconds=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = FakeClock()
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert cache.stats().size == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_ttl_cache_invalidate() -> None:
+    cache: TTLCache[int] = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_invalidate_where() -> None:
+    cache: TTLCache[int] = TTLCache(max_size=3, ttl_seconds=10)
+    cache.set(("team", "a"), 1)
+    cache.set(("team", "b"), 2)
+    cache.set(("other", "a"), 3)
+    cache.invalidate_where(lambda key: key[0] == "team")  # type: ignore[index]
+    assert cache.get(("team", "a")) is None
+    assert cache.get(("team", "b")) is None
+    assert cache.get(("other", "a")) == 3
+
+
+def test_current_user_served_from_cache(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    hits = user_cache.stats().hits
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 200
+    assert user_cache.stats().hits == hits + 1
+
+
+def test_update_user_me_invalidates_cache(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/me",
+        headers=normal_user_token_headers,
+        json={"full_name": "Cached Name"},
+    )
+    assert r.status_code == 200
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.json()["full_name"] == "Cached Name"
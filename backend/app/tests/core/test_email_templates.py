@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from jinja2 import Environment, Template
+
+from app.core.email_templates import TEMPLATES_DIR, EmailTemplates, email_templates
+
+
+def test_load_compiles_every_template() -> None:
+    assert email_templates.load() == [
+        "new_account.html",
+        "reset_password.html",
+        "test_email.html",
+    ]
+
+
+def test_render_matches_a_standalone_template() -> None:
+    context = {
+        "project_name": "Project",
+        "username": "user@example.com",
+        "email": "user@example.com",
+        "valid_hours": 48,
+        "link": "http://localhost/reset-password?token=abc",
+    }
+    expected = Template((TEMPLATES_DIR / "reset_password.html").read_text()).render(
+        context
+    )
+    assert email_templates.render("reset_password.html", context) == expected
+
+
+def write_template(path: Path, content: str, mtime: int) -> None:
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+
+
+def test_auto_reload_recompiles_changed_templates(tmp_path: Path) -> None:
+    templates_dir, cache_dir = tmp_path / "templates", tmp_path / "cache"
+    templates_dir.mkdir()
+    cache_dir.mkdir()
+    write_template(templates_dir / "hello.html", "Hello {{ name }}", mtime=1_000)
+    reloading = EmailTemplates(
+        templates_dir, auto_reload=True, cache_dir=str(cache_dir)
+    )
+    fixed = EmailTemplates(templates_dir, cache_dir=str(cache_dir))
+    assert reloading.load() == fixed.load() == ["hello.html"]
+
+    write_template(templates_dir / "hello.html", "Goodbye {{ name }}", mtime=2_000)
+    assert reloading.render("hello.html", {"name": "Ada"}) == "Goodbye Ada"
+    assert fixed.render("hello.html", {"name": "Ada"}) == "Hello Ada"
+
+
+def test_bytecode_cache_skips_compilation(tmp_path: Path) -> None:
+    EmailTemplates(TEMPLATES_DIR, cache_dir=str(tmp_path)).load()
+    # As another worker starting up
+    with patch.object(Environment, "compile", side_effect=AssertionError("compiled")):
+        assert len(EmailTemplates(TEMPLATES_DIR, cache_dir=str(tmp_path)).load()) == 3
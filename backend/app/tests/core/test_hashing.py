@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import hashing
+from app.core.config import settings
+
+
+def test_hash_and_verify_password() -> None:
+    async def run() -> tuple[bool, bool]:
+        hashed = await hashing.hash_password("correct horse")
+        return (
+            await hashing.verify_password("correct horse", hashed),
+            await hashing.verify_password("wrong horse", hashed),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_saturated_pool_rejects_with_503(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(hashing.hash_password("correct horse"))
+    assert exc_info.value.status_code == 503
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core import invalidation
+from app.core.invalidation import InvalidationBus
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self.evicted: list[str] = []
+        self.cleared = 0
+
+    def evict(self, keys: list[str]) -> None:
+        self.evicted.extend(keys)
+
+    def clear(self) -> None:
+        self.cleared += 1
+
+
+def worker(channel: str) -> tuple[InvalidationBus, FakeCache]:
+    bus = InvalidationBus(channel)
+    cache = FakeCache()
+    bus.subscribe("user", cache.evict, cache.clear)
+    return bus, cache
+
+
+async def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.001)
+
+
+def test_other_workers_evict_published_keys() -> None:
+    channel = f"test_{uuid.uuid4().hex}"
+    writer, writer_cache = worker(channel)
+    reader, reader_cache = worker(channel)
+
+    async def run() -> float:
+        await writer.start()
+        await reader.start()
+        try:
+            started = time.monotonic()
+            writer.publish("user", ["a", "b"])
+            await wait_for(lambda: reader_cache.evicted == ["a", "b"])
+            return time.monotonic() - started
+        finally:
+            await writer.stop()
+            await reader.stop()
+
+    elapsed = asyncio.run(run())
+    assert elapsed < 0.5
+    # The writer evicted its own copy before publishing
+    assert writer_cache.evicted == []
+    assert reader.stats().received == 1
+
+
+def test_listener_reconnects_and_clears(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(invalidation, "RECONNECT_MIN_SECONDS", 0.05)
+    channel = f"test_{uuid.uuid4().hex}"
+    writer, _ = worker(channel)
+    reader, reader_cache = worker(channel)
+
+    async def run() -> None:
+        await reader.start()
+        try:
+            db.exec(  # type: ignore
+                text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE query = :listen"
+                ),
+                params={"listen": f'LISTEN "{channel}"'},
+            )
+            db.commit()
+            # Whatever was missed while disconnected is dropped
+            await wait_for(lambda: reader_cache.cleared == 1)
+            # Without a running bus the notification is sent at once
+            writer.publish("user", ["a"])
+            await wait_for(lambda: reader_cache.evicted == ["a"])
+        finally:
+            await reader.stop()
+
+    asyncio.run(run())
+    assert reader.stats().reconnects == 1
+
+
+def test_payloads_fit_a_notification() -> None:
+    bus = InvalidationBus("test")
+    events = [("tag", f"team:{uuid.uuid4()}:item-lists") for _ in range(1_000)]
+    payloads = bus._payloads(events)
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) < 8_000 for payload in payloads)
+    keys = [key for payload in payloads for key in json.loads(payload)["keys"]["tag"]]
+    assert keys == [key for _, key in events]
@@ -0,0 +1,85 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus
+from app.core.replicas import ReplicaSet
+
+
+def test_replica_set_round_robin() -> None:
+    # The primary itself stands in for the replicas: it reports no lag
+    uri = str(settings.SQLALCHEMY_DATABASE_URI)
+
+    async def run() -> list[str | None]:
+        replica_set = ReplicaSet([uri, uri])
+        assert replica_set.pick() is None
+        await replica_set.check_all()
+        picked = [replica_set.pick() for _ in range(4)]
+        await replica_set.stop()
+        return [replica.name if replica else None for replica in picked]
+
+    assert asyncio.run(run()) == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_unreachable_replica_leaves_rotation() -> None:
+    bad_uri = str(settings.SQLALCHEMY_DATABASE_URI).replace(
+        f":{settings.POSTGRES_PORT}/", ":1/"
+    )
+
+    async def run() -> bool:
+        replica_set = ReplicaSet([bad_uri])
+        await replica_set.check_all()
+        healthy = replica_set.pick() is not None
+        assert replica_set.replicas[0].last_error
+        await replica_set.stop()
+        return healthy
+
+    assert asyncio.run(run()) is False
+
+
+def test_lagging_replica_leaves_rotation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "POSTGRES_REPLICA_MAX_LAG_SECONDS", -1.0)
+    uri = str(settings.SQLALCHEMY_DATABASE_URI)
+
+    async def run() -> bool:
+        replica_set = ReplicaSet([uri])
+        await replica_set.check_all()
+        healthy = replica_set.pick() is not None
+        await replica_set.stop()
+        return healthy
+
+    assert asyncio.run(run()) is False
+
+
+def test_recent_writers_are_pinned_to_primary() -> None:
+    replica_set = ReplicaSet([])
+    assert not replica_set.recently_wrote("token")
+    replica_set.mark_write("token")
+    assert replica_set.recently_wrote("token")
+    assert not replica_set.recently_wrote("other-token")
+
+
+def test_writers_are_pinned_in_every_worker() -> None:
+    channel = f"test_{uuid.uuid4().hex}"
+    buses = [InvalidationBus(channel), InvalidationBus(channel)]
+    writer = ReplicaSet([], bus=buses[0])
+    reader = ReplicaSet([], bus=buses[1])
+
+    async def run() -> None:
+        for bus in buses:
+            await bus.start()
+        try:
+            writer.mark_write("token")
+            deadline = time.monotonic() + 5
+            while not reader.recently_wrote("token"):
+                assert time.monotonic() < deadline, "timed out"
+                await asyncio.sleep(0.001)
+        finally:
+            for bus in buses:
+                await bus.stop()
+
+    asyncio.run(run())
+    assert not reader.recently_wrote("other-token")
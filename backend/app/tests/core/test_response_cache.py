@@ -0,0 +1,123 @@
+import asyncio
+
+from fastapi import Request
+
+from app.core.response_cache import (
+    DisabledBackend,
+    InMemoryStore,
+    LocalBackend,
+    ResponseCache,
+    SharedBackend,
+    item_tag,
+    item_write_tags,
+    team_item_lists_tag,
+    team_items_tag,
+    team_tag,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_local_backend_invalidates_by_tag() -> None:
+    async def run() -> list[bytes | None]:
+        backend = LocalBackend(max_size=10, ttl_seconds=10)
+        await backend.set("team-a", b"a", [team_tag("a")])
+        await backend.set("team-a-users", b"a-users", [team_tag("a"), "user:1"])
+        await backend.set("team-b", b"b", [team_tag("b")])
+        await backend.invalidate([team_tag("a")])
+        return [await backend.get(key) for key in ("team-a", "team-a-users", "team-b")]
+
+    assert asyncio.run(run()) == [None, None, b"b"]
+
+
+def test_local_backend_evicts_least_recently_used() -> None:
+    async def run() -> LocalBackend:
+        backend = LocalBackend(max_size=2, ttl_seconds=10)
+        await backend.set("a", b"a", ["tag"])
+        await backend.set("b", b"b", ["tag"])
+        await backend.get("a")
+        await backend.set("c", b"c", ["tag"])
+        assert await backend.get("b") is None
+        assert await backend.get("a") == b"a"
+        return backend
+
+    backend = asyncio.run(run())
+    assert len(backend) == 2
+    # Evicted keys leave the tag index too
+    assert backend._keys_by_tag == {"tag": {"a", "c"}}
+
+
+def test_local_backend_expires_entries() -> None:
+    clock = FakeClock()
+    backend = LocalBackend(max_size=2, ttl_seconds=10, clock=clock)
+    asyncio.run(backend.set("a", b"a", [team_tag("a")]))
+    clock.now = 10.5
+    assert asyncio.run(backend.get("a")) is None
+    assert backend._keys_by_tag == {}
+
+
+def test_shared_backend_invalidates_by_tag() -> None:
+    store = InMemoryStore()
+
+    async def run() -> list[bytes | None]:
+        # Two workers sharing the store
+        writer = SharedBackend(store, ttl_seconds=10)
+        reader = SharedBackend(store, ttl_seconds=10)
+        await writer.set("item-1", b"1", [item_tag(1), team_items_tag("t")])
+        await writer.set("item-2", b"2", [item_tag(2), team_items_tag("t")])
+        await writer.set("items", b"[1, 2]", [team_item_lists_tag("t")])
+        assert await reader.get("item-1") == b"1"
+        await reader.invalidate(item_write_tags("t", [1]))
+        return [await writer.get(key) for key in ("item-1", "item-2", "items")]
+
+    assert asyncio.run(run()) == [None, b"2", None]
+
+
+def test_shared_backend_clears_only_its_keys() -> None:
+    store = InMemoryStore()
+
+    async def run() -> list[bytes | None]:
+        backend = SharedBackend(store, ttl_seconds=10)
+        await backend.set("a", b"a", [team_tag("a")])
+        await store.set("session:1", b"other")
+        await backend.clear()
+        return [
+            await backend.get("a"),
+            await store.get("session:1"),
+            *[name async for name in store.scan_iter("response*")],
+        ]
+
+    assert asyncio.run(run()) == [None, b"other"]
+
+
+def test_shared_backend_expires_entries() -> None:
+    clock = FakeClock()
+    backend = SharedBackend(InMemoryStore(clock), ttl_seconds=10)
+    asyncio.run(backend.set("a", b"a", [team_tag("a")]))
+    clock.now = 10.5
+    assert asyncio.run(backend.get("a")) is None
+
+
+def test_keys_keep_query_values_apart() -> None:
+    def key(query_string: bytes) -> str:
+        request = Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/items/",
+                "query_string": query_string,
+                "headers": [],
+            }
+        )
+        return ResponseCache(DisabledBackend()).for_request(request, "user:1").key
+
+    # An escaped "&" or "=" in a value is not a second parameter
+    assert key(b"a=b&c=d") != key(b"a=b%26c%3Dd")
+    # Parameter order does not matter
+    assert key(b"c=d&a=b") == key(b"a=b&c=d")
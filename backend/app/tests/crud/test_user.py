@@ -70,7 +70,7 @@ def test_get_user(db: Session) -> None:
     username = random_email()
     user_in = UserCreate(email=username, password=password, is_superuser=True)
     user = crud.create_user(session=db, user_create=user_in)
-    user_2 = db.get(User, user.id)
+    user_2 = db.get(User, user.user_id)
     assert user_2
     assert user.email == user_2.email
     assert jsonable_encoder(user) == jsonable_encoder(user_2)
@@ -83,9 +83,9 @@ def test_update_user(db: Session) -> None:
     user = crud.create_user(session=db, user_create=user_in)
     new_password = random_lower_string()
     user_in_update = UserUpdate(password=new_password, is_superuser=True)
-    if user.id is not None:
+    if user.user_id is not None:
         crud.update_user(session=db, db_user=user, user_in=user_in_update)
-    user_2 = db.get(User, user.id)
+    user_2 = db.get(User, user.user_id)
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
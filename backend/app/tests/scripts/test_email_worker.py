@@ -0,0 +1,133 @@
+from collections.abc import Generator
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Session, col, delete, select, update
+
+from app.core.db import engine
+from app.email_worker import MAX_ATTEMPTS, OutboxBatch, SMTPPool, send_due_emails
+from app.models import EmailOutbox
+from app.tests.utils.smtp import LocalSMTPServer
+from app.tests.utils.utils import random_email
+from app.utils import enqueue_email
+
+
+@pytest.fixture
+def smtp_server(db: Session) -> Generator[LocalSMTPServer, None, None]:
+    # Emails queued by other tests are not this module's to send
+    db.exec(delete(EmailOutbox))  # type: ignore
+    db.commit()
+    with (
+        LocalSMTPServer() as server,
+        patch("app.core.config.settings.SMTP_HOST", server.host),
+        patch("app.core.config.settings.SMTP_PORT", server.port),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.SMTP_USER", None),
+        patch("app.core.config.settings.SMTP_PASSWORD", None),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "noreply@example.com"),
+    ):
+        yield server
+
+
+@pytest.fixture
+def pool() -> Generator[SMTPPool, None, None]:
+    pool = SMTPPool(1)
+    yield pool
+    pool.shutdown()
+
+
+def queue_emails(db: Session, count: int) -> list[str]:
+    recipients = [random_email() for _ in range(count)]
+    for email_to in recipients:
+        enqueue_email(db, email_to=email_to, subject="Hello", html_content="<p>Hi</p>")
+    db.commit()
+    return recipients
+
+
+def test_send_due_emails_over_one_connection(
+    db: Session, smtp_server: LocalSMTPServer, pool: SMTPPool
+) -> None:
+    recipients = queue_emails(db, 5)
+
+    assert send_due_emails(db, pool, batch_size=3) == OutboxBatch(
+        claimed=3, sent=3, failed=0
+    )
+    assert send_due_emails(db, pool, batch_size=3) == OutboxBatch(
+        claimed=2, sent=2, failed=0
+    )
+    assert send_due_emails(db, pool, batch_size=3) == OutboxBatch(
+        claimed=0, sent=0, failed=0
+    )
+
+    assert sorted(email.rcpt_to[0] for email in smtp_server.received) == sorted(
+        recipients
+    )
+    assert smtp_server.received[0].message["Subject"] == "Hello"
+    assert smtp_server.connections == 1
+    assert all(
+        row.sent_at is not None and row.attempts == 1 and row.html_content is None
+        for row in db.exec(select(EmailOutbox)).all()
+    )
+
+
+def test_send_due_emails_retries_with_backoff(
+    db: Session, smtp_server: LocalSMTPServer, pool: SMTPPool
+) -> None:
+    [email_to] = queue_emails(db, 1)
+    smtp_server.fail_next = 1
+
+    assert send_due_emails(db, pool) == OutboxBatch(claimed=1, sent=0, failed=1)
+    row = db.exec(select(EmailOutbox).where(EmailOutbox.email_to == email_to)).one()
+    db.refresh(row)
+    assert row.sent_at is None
+    assert row.attempts == 1
+    assert row.last_error and "451" in row.last_error
+    assert row.next_attempt_at > datetime.now(timezone.utc)
+    # Not due again until the backoff has passed
+    assert send_due_emails(db, pool).claimed == 0
+
+    db.exec(update(EmailOutbox).values(next_attempt_at=datetime.now(timezone.utc)))  # type: ignore
+    db.commit()
+    assert send_due_emails(db, pool) == OutboxBatch(claimed=1, sent=1, failed=0)
+    db.refresh(row)
+    assert row.sent_at is not None
+    assert row.last_error is None
+    assert [email.rcpt_to for email in smtp_server.received] == [[email_to]]
+
+
+def test_send_due_emails_gives_up_after_max_attempts(
+    db: Session, smtp_server: LocalSMTPServer, pool: SMTPPool
+) -> None:
+    [email_to] = queue_emails(db, 1)
+    db.exec(update(EmailOutbox).values(attempts=MAX_ATTEMPTS - 1))  # type: ignore
+    db.commit()
+    smtp_server.fail_next = 1
+
+    assert send_due_emails(db, pool) == OutboxBatch(claimed=1, sent=0, failed=1)
+    row = db.exec(select(EmailOutbox).where(EmailOutbox.email_to == email_to)).one()
+    db.refresh(row)
+    assert row.attempts == MAX_ATTEMPTS
+    assert row.last_error and "451" in row.last_error
+    # Never sent now, so the body is not kept
+    assert row.html_content is None
+
+    db.exec(update(EmailOutbox).values(next_attempt_at=datetime.now(timezone.utc)))  # type: ignore
+    db.commit()
+    assert send_due_emails(db, pool).claimed == 0
+    assert not smtp_server.received
+
+
+def test_send_due_emails_skips_locked_emails(
+    db: Session, smtp_server: LocalSMTPServer, pool: SMTPPool
+) -> None:
+    locked_to, free_to = queue_emails(db, 2)
+    with Session(engine) as other_worker:
+        # Another worker in the middle of claiming this one
+        other_worker.exec(
+            select(EmailOutbox)
+            .where(col(EmailOutbox.email_to) == locked_to)
+            .with_for_update()
+        ).one()
+        assert send_due_emails(db, pool) == OutboxBatch(claimed=1, sent=1, failed=0)
+    assert [email.rcpt_to for email in smtp_server.received] == [[free_to]]
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Session, col, update
+
+from app import crud
+from app.models import Item, UserItemCreate
+from app.reconcile_on_loan import OnLoanDrift, reconcile_on_loan
+from app.tests.utils.item import create_random_item
+from app.tests.utils.lab import create_random_lab
+from app.tests.utils.team import create_random_team
+
+
+def test_reconcile_on_loan_repairs_drift(db: Session) -> None:
+    team = create_random_team(db)
+    item = create_random_item(db, team=team, quantity=5)
+    in_step = create_random_item(db, team=team, quantity=5)
+    lab = create_random_lab(db, team=team)
+    # Two loans recorded without going through checkout, one already returned
+    for returned_at in (None, datetime.now(timezone.utc)):
+        crud.create_user_item(
+            session=db,
+            user_item_in=UserItemCreate(
+                borrowed_at=datetime.now(timezone.utc),
+                returned_at=returned_at,
+            ),
+            user_id=team.owner_id,
+            item_id=item.item_id,
+            lab_id=lab.lab_id,
+        )
+    db.exec(  # type: ignore
+        update(Item).where(col(Item.item_id) == item.item_id).values(on_loan=3)
+    )
+    db.commit()
+
+    drifts = reconcile_on_loan(db, batch_size=2)
+
+    assert OnLoanDrift(item_id=item.item_id, recorded=3, actual=1) in drifts
+    assert all(drift.item_id != in_step.item_id for drift in drifts)
+    db.refresh(item)
+    assert item.on_loan == 1
+    assert reconcile_on_loan(db) == []
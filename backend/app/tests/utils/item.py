@@ -1,16 +1,19 @@
 from sqlmodel import Session
 
 from app import crud
-from app.models import Item, ItemCreate
-from app.tests.utils.user import create_random_user
+from app.models import Item, ItemCreate, Team
+from app.tests.utils.team import create_random_team
 from app.tests.utils.utils import random_lower_string
 
 
-def create_random_item(db: Session) -> Item:
-    user = create_random_user(db)
-    owner_id = user.id
-    assert owner_id is not None
-    title = random_lower_string()
-    description = random_lower_string()
-    item_in = ItemCreate(title=title, description=description)
-    return crud.create_item(session=db, item_in=item_in, owner_id=owner_id)
+def create_random_item(
+    db: Session, team: Team | None = None, quantity: int = 1
+) -> Item:
+    if team is None:
+        team = create_random_team(db)
+    item_name = random_lower_string()
+    item_vendor = random_lower_string()
+    item_in = ItemCreate(
+        item_name=item_name, item_vendor=item_vendor, quantity=quantity
+    )
+    return crud.create_item(session=db, item_in=item_in, team_id=team.team_id)
@@ -0,0 +1,21 @@
+from sqlmodel import Session
+
+from app import crud
+from app.models import Lab, LabCreate, Team
+from app.tests.utils.team import create_random_team
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_lab(
+    db: Session, team: Team | None = None, lab_university: str | None = None
+) -> Lab:
+    if team is None:
+        team = create_random_team(db)
+    lab_in = LabCreate(
+        lab_place=random_lower_string(),
+        lab_university=lab_university or random_lower_string(),
+        lab_num=random_lower_string(),
+    )
+    return crud.create_lab(
+        session=db, lab_in=lab_in, owner_id=team.owner_id, team_id=team.team_id
+    )
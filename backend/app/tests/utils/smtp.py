@@ -0,0 +1,108 @@
+import email
+import socketserver
+import threading
+from dataclasses import dataclass
+from email.message import Message
+from types import TracebackType
+
+from typing_extensions import Self
+
+
+@dataclass
+class ReceivedEmail:
+    mail_from: str
+    rcpt_to: list[str]
+    message: Message
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: "_SMTPServer"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        stand_in = self.server.stand_in
+        with stand_in.lock:
+            stand_in.connections += 1
+        self.reply("220 localhost SMTP stand-in")
+        mail_from = ""
+        rcpt_to: list[str] = []
+        while line := self.rfile.readline():
+            command, _, argument = line.decode().rstrip("\r\n").partition(" ")
+            command = command.upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                mail_from, rcpt_to = argument.partition(":")[2].strip("<> "), []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                rcpt_to.append(argument.partition(":")[2].strip("<> "))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data += data_line[1:] if data_line.startswith(b".") else data_line
+                with stand_in.lock:
+                    failing = stand_in.fail_next > 0
+                    if failing:
+                        stand_in.fail_next -= 1
+                    else:
+                        stand_in.received.append(
+                            ReceivedEmail(
+                                mail_from, rcpt_to, email.message_from_bytes(data)
+                            )
+                        )
+                self.reply("451 Try again later" if failing else "250 OK")
+            elif command in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    stand_in: "LocalSMTPServer"
+
+
+class LocalSMTPServer:
+    """
+    An SMTP server on localhost for tests, keeping the emails it receives.
+
+    Speaks just enough SMTP for smtplib, without TLS or authentication.
+    Set `fail_next` to answer that many of the next emails with a temporary
+    failure.
+    """
+
+    def __init__(self) -> None:
+        self.received: list[ReceivedEmail] = []
+        self.connections = 0
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        self._server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+        self._server.stand_in = self
+
+    @property
+    def host(self) -> str:
+        return str(self._server.server_address[0])
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    def __enter__(self) -> Self:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,32 @@
+from sqlmodel import Session
+
+from app import crud
+from app.models import Team, TeamCreate, User, UserTeam, UserTeamCreate
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_team(db: Session, owner: User | None = None) -> Team:
+    if owner is None:
+        owner = create_random_user(db)
+    team_in = TeamCreate(team_name=random_lower_string())
+    team = crud.create_team(session=db, team_in=team_in, owner_id=owner.user_id)
+    add_team_member(db, team=team, user=owner, can_edit_all=True)
+    return team
+
+
+def add_team_member(
+    db: Session, *, team: Team, user: User, can_edit_all: bool = False
+) -> UserTeam:
+    user_team_in = UserTeamCreate(
+        email=user.email,
+        can_edit_labs=can_edit_all,
+        can_edit_items=can_edit_all,
+        can_edit_users=can_edit_all,
+    )
+    return crud.create_user_team(
+        session=db,
+        user_team_in=user_team_in,
+        user_id=user.user_id,
+        team_id=team.team_id,
+    )
@@ -0,0 +1,95 @@
+"""
+Throughput of the sync (threadpool) and async database paths.
+
+Simulates N concurrent requests that each run a query taking `--latency`
+seconds on the server. The sync path mirrors the old `def` routes: a
+`Session` used from anyio's worker threads (40 by default). The async path
+mirrors the current routes: an `AsyncSession` awaited on the event loop.
+
+    python -m benchmarks.async_db --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import time
+
+import anyio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+
+async def run_sync(requests: int, concurrency: int, latency: float) -> float:
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        pool_size=concurrency,
+        max_overflow=0,
+    )
+    statement = text("SELECT pg_sleep(:latency)").bindparams(latency=latency)
+
+    def handler() -> None:
+        with Session(engine) as session:
+            session.exec(statement)  # type: ignore
+
+    semaphore = anyio.Semaphore(concurrency)
+
+    async def request() -> None:
+        async with semaphore:
+            await anyio.to_thread.run_sync(handler)
+
+    async def run(n: int) -> None:
+        async with anyio.create_task_group() as tg:
+            for _ in range(n):
+                tg.start_soon(request)
+
+    # Warm up: fill the pool before timing
+    await run(concurrency)
+    start = time.perf_counter()
+    await run(requests)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return requests / elapsed
+
+
+async def run_async(requests: int, concurrency: int, latency: float) -> float:
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        pool_size=concurrency,
+        max_overflow=0,
+    )
+    statement = text("SELECT pg_sleep(:latency)").bindparams(latency=latency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request() -> None:
+        async with semaphore:
+            async with AsyncSession(engine) as session:
+                await session.exec(statement)  # type: ignore
+
+    # Warm up: fill the pool before timing
+    await asyncio.gather(*(request() for _ in range(concurrency)))
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    sync_rps = asyncio.run(run_sync(args.requests, args.concurrency, args.latency))
+    async_rps = asyncio.run(run_async(args.requests, args.concurrency, args.latency))
+    print(f"sync  (threadpool):   {sync_rps:8.1f} req/s")
+    print(f"async (AsyncSession): {async_rps:8.1f} req/s")
+    print(f"speedup:              {async_rps / sync_rps:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
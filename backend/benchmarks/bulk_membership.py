@@ -0,0 +1,113 @@
+"""
+Time to add many members to a team: one bulk request against the
+per-email add-users endpoint.
+
+Seeds `--members` users and an empty team, then adds them all through
+POST /teams/{team_id}/users and, for a sample of `--single-sample` other
+users, one request each through GET /teams/{team_id}/add-users. The seeded
+users and team are deleted afterwards.
+
+    python -m benchmarks.bulk_membership --members 1000
+"""
+
+import argparse
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import create_access_token
+from app.main import app
+
+EMAIL_DOMAIN = "bulk-benchmark.example.com"
+
+OWNER_SQL = [
+    text("""
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+    """),
+    text("""
+        INSERT INTO teams (team_id, team_name, owner_id)
+        VALUES (:team_id, 'bulk benchmark', :owner_id)
+    """),
+    text("""
+        INSERT INTO user_team (user_team_id, user_id, team_id, can_edit_labs, can_edit_items, can_edit_users)
+        VALUES (gen_random_uuid(), :owner_id, :team_id, true, true, true)
+    """),
+]
+
+SEED_SQL = text("""
+    INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+    SELECT gen_random_uuid(), :prefix || n || '@' || :domain, '', true, false
+    FROM generate_series(1, :count) AS n
+""")
+
+
+def run(members: int, single_sample: int) -> None:
+    prefix = f"{uuid.uuid4().hex[:8]}-"
+    owner_id, team_id = uuid.uuid4(), uuid.uuid4()
+    with Session(engine) as session:
+        params = {
+            "owner_id": owner_id,
+            "email": f"{prefix}owner@{EMAIL_DOMAIN}",
+            "team_id": team_id,
+        }
+        for statement in OWNER_SQL:
+            session.exec(statement, params=params)  # type: ignore
+        session.exec(  # type: ignore
+            SEED_SQL,
+            params={"prefix": prefix, "domain": EMAIL_DOMAIN, "count": members + single_sample},
+        )
+        session.commit()
+
+    emails = [f"{prefix}{n}@{EMAIL_DOMAIN}" for n in range(1, members + single_sample + 1)]
+    token = create_access_token(owner_id, expires_delta=timedelta(minutes=10))
+    headers = {"Authorization": f"Bearer {token}"}
+    base = f"{settings.API_V1_STR}/teams/{team_id}"
+    try:
+        with TestClient(app) as client:
+            start = time.perf_counter()
+            response = client.post(
+                f"{base}/users",
+                headers=headers,
+                json={"users": [{"email": email} for email in emails[:members]]},
+            )
+            bulk = time.perf_counter() - start
+            response.raise_for_status()
+            print(f"bulk:       {response.json()['added']} members in {bulk * 1000:.0f} ms")
+
+            if single_sample:
+                start = time.perf_counter()
+                for email in emails[members:]:
+                    client.request(
+                        "GET", f"{base}/add-users", headers=headers, json={"email": email}
+                    ).raise_for_status()
+                single = (time.perf_counter() - start) / single_sample
+                print(
+                    f"per-email:  {single * 1000:.1f} ms each, "
+                    f"~{single * members * 1000:.0f} ms for {members} members"
+                )
+    finally:
+        with Session(engine) as session:
+            session.exec(  # type: ignore
+                text("DELETE FROM users WHERE email LIKE :pattern"),
+                params={"pattern": f"{prefix}%@{EMAIL_DOMAIN}"},
+            )
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=1_000)
+    parser.add_argument("--single-sample", type=int, default=50)
+    args = parser.parse_args()
+    run(args.members, args.single_sample)
+
+
+if __name__ == "__main__":
+    main()
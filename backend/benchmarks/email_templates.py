@@ -0,0 +1,71 @@
+"""
+Throughput of rendering the password reset and new account emails.
+
+Times `--renders` calls each of generate_reset_password_email and
+generate_new_account_email through the compiled template registry, then
+again reading and compiling the template on every call as rendering used
+to. Needs no database.
+
+    python -m benchmarks.email_templates --renders 5000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+from jinja2 import Template
+
+from app.core.email_templates import TEMPLATES_DIR, email_templates
+from app.utils import (
+    EmailData,
+    generate_new_account_email,
+    generate_reset_password_email,
+)
+
+EMAILS: dict[str, Callable[[int], EmailData]] = {
+    "reset password": lambda n: generate_reset_password_email(
+        email_to=f"user{n}@example.com", email=f"user{n}@example.com", token=f"token-{n}"
+    ),
+    "new account": lambda n: generate_new_account_email(
+        email_to=f"user{n}@example.com", username=f"user{n}@example.com", password=f"password-{n}"
+    ),
+}
+
+
+def render_uncached(*, template_name: str, context: dict[str, Any]) -> str:
+    template_str = (TEMPLATES_DIR / template_name).read_text()
+    return Template(template_str).render(context)
+
+
+def time_renders(generate: Callable[[int], EmailData], renders: int) -> float:
+    start = time.perf_counter()
+    for n in range(renders):
+        generate(n)
+    return time.perf_counter() - start
+
+
+def run(renders: int) -> None:
+    email_templates.load()
+    for name, generate in EMAILS.items():
+        cached = time_renders(generate, renders)
+        with patch("app.utils.render_email_template", render_uncached):
+            uncached = time_renders(generate, renders)
+        print(
+            f"{name}: {renders / cached:,.0f}/s compiled once "
+            f"({cached / renders * 1e6:.0f} us each), "
+            f"{renders / uncached:,.0f}/s compiled per call "
+            f"({uncached / renders * 1e6:.0f} us each), {uncached / cached:.0f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=5_000)
+    args = parser.parse_args()
+    run(args.renders)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Time to first byte and memory of the streaming item export.
+
+Seeds a team with `--items` items, then drains
+app.api.routes.exports._export over all items as the response would, and
+reports the time to the first chunk, the total time and the peak of Python
+memory traced during the export. The peak should stay flat as `--items`
+grows. The seeded team and its items are deleted afterwards.
+
+    python -m benchmarks.exports --items 1000000 --format csv --gzip
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.api.routes.exports import ExportFormat, _columns, _export
+from app.core.db import async_engine, engine
+from app.models import Item, ItemPublic
+
+EMAIL_DOMAIN = "export-benchmark.example.com"
+
+SEED_SQL = [
+    text("""
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+    """),
+    text("""
+        INSERT INTO teams (team_id, team_name, owner_id)
+        VALUES (:team_id, 'export benchmark', :owner_id)
+    """),
+    text("""
+        INSERT INTO items (item_id, item_name, quantity, item_vendor, item_params, team_id)
+        SELECT gen_random_uuid(), 'export item ' || n, n % 50 + 1, 'Vendor ' || n % 97,
+               jsonb_build_object('shelf', n % 40), :team_id
+        FROM generate_series(1, :items) AS n
+    """),
+]
+
+
+async def drain(export_format: ExportFormat, gzip: bool) -> tuple[float, int]:
+    start = time.perf_counter()
+    first_byte = 0.0
+    size = 0
+    async for chunk in _export(
+        async_engine, _columns(Item, ItemPublic), export_format, gzip
+    ):
+        if not first_byte:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    return first_byte, size
+
+
+def run(items: int, export_format: ExportFormat, gzip: bool) -> None:
+    owner_id, team_id = uuid.uuid4(), uuid.uuid4()
+    with Session(engine) as session:
+        params = {
+            "owner_id": owner_id,
+            "email": f"{owner_id.hex[:8]}@{EMAIL_DOMAIN}",
+            "team_id": team_id,
+            "items": items,
+        }
+        for statement in SEED_SQL:
+            session.exec(statement, params=params)  # type: ignore
+        session.commit()
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        first_byte, size = asyncio.run(drain(export_format, gzip))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{items} items, {size / 2**20:.1f} MiB in {elapsed:.1f} s "
+            f"({items / elapsed:,.0f} rows/s), first byte after "
+            f"{first_byte * 1000:.1f} ms, peak traced memory {peak / 2**20:.1f} MiB"
+        )
+    finally:
+        with Session(engine) as session:
+            # The team, and its items, go with the owner
+            session.exec(  # type: ignore
+                text("DELETE FROM users WHERE user_id = :owner_id"),
+                params={"owner_id": owner_id},
+            )
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+    run(args.items, args.format, args.gzip)
+
+
+if __name__ == "__main__":
+    main()
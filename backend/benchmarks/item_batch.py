@@ -0,0 +1,133 @@
+"""
+Time to update many items: one batch request against one PUT per item.
+
+Seeds a team with `--items` items, then updates all of them through
+POST /items/batch and, for a sample of `--single-sample` items, one request
+each through PUT /items/{item_id}. Also times creating `--items` items in
+one batch. The seeded rows are deleted afterwards.
+
+    python -m benchmarks.item_batch --items 10000
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import create_access_token
+from app.main import app
+
+EMAIL_DOMAIN = "batch-benchmark.example.com"
+
+SEED_SQL = [
+    text("""
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+    """),
+    text("""
+        INSERT INTO teams (team_id, team_name, owner_id)
+        VALUES (:team_id, 'batch benchmark', :owner_id)
+    """),
+    text("""
+        INSERT INTO user_team (user_team_id, user_id, team_id, can_edit_labs, can_edit_items, can_edit_users)
+        VALUES (gen_random_uuid(), :owner_id, :team_id, false, true, false)
+    """),
+    text("""
+        INSERT INTO items (item_id, item_name, quantity, team_id)
+        SELECT gen_random_uuid(), 'batch item ' || n, 1, :team_id
+        FROM generate_series(1, :items) AS n
+    """),
+]
+
+
+def run(items: int, single_sample: int) -> None:
+    owner_id, team_id = uuid.uuid4(), uuid.uuid4()
+    with Session(engine) as session:
+        params = {
+            "owner_id": owner_id,
+            "email": f"{owner_id.hex[:8]}@{EMAIL_DOMAIN}",
+            "team_id": team_id,
+            "items": items,
+        }
+        for statement in SEED_SQL:
+            session.exec(statement, params=params)  # type: ignore
+        item_ids = [
+            str(item_id)
+            for item_id, in session.exec(  # type: ignore
+                text("SELECT item_id FROM items WHERE team_id = :team_id"),
+                params={"team_id": team_id},
+            )
+        ]
+        session.commit()
+
+    token = create_access_token(owner_id, expires_delta=timedelta(minutes=10))
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        with TestClient(app) as client:
+            start = time.perf_counter()
+            response = client.post(
+                f"{settings.API_V1_STR}/items/batch",
+                headers=headers,
+                params={"team_id": str(team_id)},
+                json={
+                    "update": [
+                        {"item_id": item_id, "quantity": random.randint(1, 50), "item_params": {"shelf": n % 40}}
+                        for n, item_id in enumerate(item_ids)
+                    ]
+                },
+            )
+            batch = time.perf_counter() - start
+            response.raise_for_status()
+            print(f"batch update: {items} items in {batch * 1000:.0f} ms")
+
+            start = time.perf_counter()
+            response = client.post(
+                f"{settings.API_V1_STR}/items/batch",
+                headers=headers,
+                params={"team_id": str(team_id)},
+                json={"create": [{"item_name": f"created {n}", "quantity": 2} for n in range(items)]},
+            )
+            created = time.perf_counter() - start
+            response.raise_for_status()
+            print(f"batch create: {items} items in {created * 1000:.0f} ms")
+
+            if single_sample:
+                start = time.perf_counter()
+                for item_id in item_ids[:single_sample]:
+                    client.put(
+                        f"{settings.API_V1_STR}/items/{item_id}",
+                        headers=headers,
+                        json={"quantity": 3},
+                    ).raise_for_status()
+                single = (time.perf_counter() - start) / single_sample
+                print(
+                    f"per-item PUT: {single * 1000:.1f} ms each, "
+                    f"~{single * items:.1f} s for {items} items"
+                )
+    finally:
+        with Session(engine) as session:
+            # The team, and its items, go with the owner
+            session.exec(  # type: ignore
+                text("DELETE FROM users WHERE user_id = :owner_id"),
+                params={"owner_id": owner_id},
+            )
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--single-sample", type=int, default=100)
+    args = parser.parse_args()
+    run(args.items, args.single_sample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Throughput and memory of the streaming item import.
+
+Feeds app.api.item_import.import_items a generated CSV of `--rows` rows in
+64 KiB chunks, as an upload would arrive, and reports rows per second and
+the peak of Python memory traced during the import. The peak should stay
+flat as `--rows` grows. The seeded team and its items are deleted
+afterwards.
+
+    python -m benchmarks.item_import --rows 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import uuid
+from collections.abc import AsyncIterator
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.api.item_import import ImportFormat, import_items
+from app.core.db import engine
+
+EMAIL_DOMAIN = "import-benchmark.example.com"
+CHUNK_BYTES = 64 * 1024
+
+SEED_SQL = [
+    text("""
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+    """),
+    text("""
+        INSERT INTO teams (team_id, team_name, owner_id)
+        VALUES (:team_id, 'import benchmark', :owner_id)
+    """),
+]
+
+
+async def csv_body(rows: int) -> AsyncIterator[bytes]:
+    buffer = "item_name,quantity,item_vendor,item_params\n"
+    for n in range(rows):
+        buffer += f'Imported item {n},{n % 50 + 1},Vendor {n % 97},"{{""shelf"": {n % 40}}}"\n'
+        if len(buffer) >= CHUNK_BYTES:
+            yield buffer.encode()
+            buffer = ""
+    yield buffer.encode()
+
+
+async def run_import(rows: int, team_id: uuid.UUID) -> dict[str, int]:
+    done: dict[str, int] = {}
+    async for line in import_items(csv_body(rows), ImportFormat.csv, team_id):
+        event = json.loads(line)
+        if event["event"] in ("done", "failed"):
+            done = event
+    return done
+
+
+def run(rows: int) -> None:
+    owner_id, team_id = uuid.uuid4(), uuid.uuid4()
+    with Session(engine) as session:
+        params = {"owner_id": owner_id, "email": f"{owner_id.hex[:8]}@{EMAIL_DOMAIN}", "team_id": team_id}
+        for statement in SEED_SQL:
+            session.exec(statement, params=params)  # type: ignore
+        session.commit()
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        done = asyncio.run(run_import(rows, team_id))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(done)
+        print(
+            f"{rows} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s), "
+            f"peak traced memory {peak / 2**20:.1f} MiB"
+        )
+    finally:
+        with Session(engine) as session:
+            # The team, and its items, go with the owner
+            session.exec(  # type: ignore
+                text("DELETE FROM users WHERE user_id = :owner_id"),
+                params={"owner_id": owner_id},
+            )
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
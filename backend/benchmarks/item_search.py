@@ -0,0 +1,151 @@
+"""
+Latency of GET /items/search on a large inventory.
+
+Seeds `--items` items with generated names, vendors and params, spread over
+`--teams` teams. The caller belongs to `--member-teams` of them, so every
+search is ranked over the whole index but only returns the caller's items.
+Prints p50/p95/max per kind of query. Typo queries only match when the
+database has pg_trgm, through a second query on the trigram index once
+full-text search finds nothing; the 50 ms p95 target is for the full-text
+kinds, typos take longer. The seeded rows are deleted afterwards.
+
+    python -m benchmarks.item_search --items 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.security import create_access_token
+from app.main import app
+
+EMAIL_DOMAIN = "search-benchmark.example.com"
+
+ADJECTIVES = ["digital", "analog", "portable", "precision", "benchtop", "wireless", "compact", "industrial"]
+NOUNS = [
+    "resistor", "capacitor", "oscilloscope", "multimeter", "breadboard", "microcontroller",
+    "sensor", "motor", "cable", "probe", "pipette", "centrifuge", "beaker", "microscope",
+    "thermometer", "battery", "relay", "transistor", "spectrometer", "amplifier",
+]
+VENDORS = ["Keysight", "Tektronix", "Fluke", "Rigol", "Weller", "Arduino", "Bosch", "Eppendorf", "Zeiss", "Siemens"]
+PARAMS = [
+    '{"voltage": 5}', '{"voltage": 12}', '{"resistance": "10k"}', '{"capacitance": "100nF"}',
+    '{"connector": "USB-C"}', '{"channels": 2}', '{"bandwidth": "1 GHz"}', '{"rating": "IP67"}',
+]
+
+QUERIES = {
+    "word": lambda: random.choice(NOUNS),
+    "phrase": lambda: f'"{random.choice(ADJECTIVES)} {random.choice(NOUNS)}"',
+    "word and vendor": lambda: f"{random.choice(NOUNS)} {random.choice(VENDORS)}",
+    "typo": lambda: (lambda w: w[:3] + w[4:])(random.choice(NOUNS)),
+}
+
+
+def _pick(values: list[str]) -> str:
+    quoted = ", ".join("'" + v + "'" for v in values)
+    return f"(ARRAY[{quoted}])[1 + floor(random() * {len(values)})::int]"
+
+
+SEED_SQL = [
+    text("""
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+    """),
+    text("""
+        INSERT INTO teams (team_id, team_name, owner_id)
+        SELECT gen_random_uuid(), 'search benchmark ' || n, :owner_id
+        FROM generate_series(1, :teams) AS n
+    """),
+    text(f"""
+        INSERT INTO items (item_id, item_name, quantity, item_vendor, item_params, team_id)
+        SELECT gen_random_uuid(),
+               {_pick(ADJECTIVES)} || ' ' || {_pick(NOUNS)} || ' ' || n,
+               1, {_pick(VENDORS)}, CAST({_pick(PARAMS)} AS jsonb),
+               team_ids[1 + n % array_length(team_ids, 1)]
+        FROM generate_series(1, :items) AS n,
+             (SELECT array_agg(team_id) AS team_ids FROM teams WHERE owner_id = :owner_id) AS t
+    """),
+    text("""
+        INSERT INTO user_team (user_team_id, user_id, team_id, can_edit_labs, can_edit_items, can_edit_users)
+        SELECT gen_random_uuid(), :owner_id, team_id, false, false, false
+        FROM teams WHERE owner_id = :owner_id
+        ORDER BY team_id
+        LIMIT :member_teams
+    """),
+    text("ANALYZE items"),
+]
+
+
+def run(items: int, teams: int, member_teams: int, queries: int) -> None:
+    owner_id = uuid.uuid4()
+    params = {
+        "owner_id": owner_id,
+        "email": f"{owner_id.hex[:8]}@{EMAIL_DOMAIN}",
+        "teams": teams,
+        "items": items,
+        "member_teams": member_teams,
+    }
+    start = time.perf_counter()
+    with Session(engine) as session:
+        for statement in SEED_SQL:
+            session.exec(statement, params=params)  # type: ignore
+        session.commit()
+    print(f"seeded {items} items in {teams} teams in {time.perf_counter() - start:.0f} s")
+
+    token = create_access_token(owner_id, expires_delta=timedelta(minutes=30))
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        with TestClient(app) as client:
+            # Warm the connection pool and caches
+            client.get(f"{settings.API_V1_STR}/items/search", headers=headers, params={"q": "probe"})
+            for name, make_query in QUERIES.items():
+                timings = []
+                hits = 0
+                for _ in range(queries):
+                    start = time.perf_counter()
+                    response = client.get(
+                        f"{settings.API_V1_STR}/items/search",
+                        headers=headers,
+                        params={"q": make_query()},
+                    )
+                    timings.append((time.perf_counter() - start) * 1000)
+                    response.raise_for_status()
+                    hits += len(response.json()["data"])
+                timings.sort()
+                print(
+                    f"{name:16} p50 {statistics.median(timings):6.1f} ms  "
+                    f"p95 {timings[int(len(timings) * 0.95) - 1]:6.1f} ms  "
+                    f"max {timings[-1]:6.1f} ms  "
+                    f"{hits / queries:.1f} hits/query"
+                )
+    finally:
+        with Session(engine) as session:
+            # Teams, and their items, go with the owner
+            session.exec(  # type: ignore
+                text("DELETE FROM users WHERE user_id = :owner_id"),
+                params={"owner_id": owner_id},
+            )
+            session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--teams", type=int, default=1_000)
+    parser.add_argument("--member-teams", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    run(args.items, args.teams, args.member_teams, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Latency of offset and keyset (cursor) pagination over a large items table.
+
+Seeds a throwaway team with `--rows` items, then times fetching pages
+1..`--max-page` of `--limit` rows with the statements built by
+app.api.pagination. Offset pages get slower linearly with depth; cursor
+pages stay flat. The team and its items are deleted afterwards.
+
+    python -m benchmarks.pagination --rows 1000000 --max-page 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.pagination import encode_cursor, paginate
+from app.core.db import async_engine
+from app.models import Item
+
+SEED_SQL = text("""
+    WITH owner AS (
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        VALUES (:owner_id, :email, '', true, false)
+        RETURNING user_id
+    ), team AS (
+        INSERT INTO teams (team_id, team_name, owner_id)
+        SELECT :team_id, 'pagination benchmark', user_id FROM owner
+        RETURNING team_id
+    )
+    INSERT INTO items (item_id, team_id, item_name, quantity)
+    SELECT gen_random_uuid(), team.team_id, 'item ' || n, 1
+    FROM team, generate_series(1, :rows) AS n
+""")
+
+
+def pages_to_probe(max_page: int) -> list[int]:
+    pages = [1]
+    while pages[-1] * 10 <= max_page:
+        pages.append(pages[-1] * 10)
+    if pages[-1] != max_page:
+        pages.append(max_page)
+    return pages
+
+
+async def time_query(session: AsyncSession, statement: object, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        (await session.exec(statement)).all()  # type: ignore
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def run(rows: int, limit: int, max_page: int, repeat: int) -> None:
+    owner_id, team_id = uuid.uuid4(), uuid.uuid4()
+    async with AsyncSession(async_engine) as session:
+        print(f"seeding {rows} items...")
+        await session.exec(  # type: ignore
+            SEED_SQL,
+            params={
+                "owner_id": owner_id,
+                "email": f"{owner_id}@benchmark.invalid",
+                "team_id": team_id,
+                "rows": rows,
+            },
+        )
+        await session.commit()
+        await session.exec(text("ANALYZE items"))  # type: ignore
+        try:
+            base = select(Item).where(Item.team_id == team_id)
+            key = col(Item.item_id)
+            print(f"{'page':>8} {'offset ms':>10} {'cursor ms':>10}")
+            for page in pages_to_probe(max_page):
+                skip = (page - 1) * limit
+                if skip >= rows:
+                    break
+                offset_ms = await time_query(
+                    session,
+                    paginate(base, key, cursor=None, skip=skip, limit=limit),
+                    repeat,
+                )
+                # The cursor a client holds after reading the previous page
+                previous = (
+                    await session.exec(
+                        select(Item.item_id)
+                        .where(Item.team_id == team_id)
+                        .order_by(key)
+                        .offset(skip - 1)
+                        .limit(1)
+                    )
+                ).first() if skip else None
+                cursor = encode_cursor(previous) if previous else None
+                cursor_ms = await time_query(
+                    session,
+                    paginate(base, key, cursor=cursor, skip=0, limit=limit),
+                    repeat,
+                )
+                print(f"{page:>8} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+        finally:
+            await session.exec(  # type: ignore
+                text("DELETE FROM users WHERE user_id = :owner_id"),
+                params={"owner_id": owner_id},
+            )
+            await session.commit()
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--max-page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.max_page, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Time to serialize list responses, as FastAPI does for a route, with the
+stock JSONResponse and with the application's FastJSONResponse.
+
+Builds UsersPublic, ItemsPublic and UserTeamsPublic payloads of each
+`--rows` size in memory and times the route's response model conversion
+followed by rendering with each class. For reference, it also times
+model_dump_json, which the response cache serializes with. Needs no
+database. Exits with an error when FastJSONResponse is less than
+`--min-speedup` times faster on any payload, to catch regressions.
+
+    python -m benchmarks.serialization --rows 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import uuid
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.api.responses import FastJSONResponse
+from app.main import app
+from app.models import (
+    Item,
+    ItemsPublic,
+    User,
+    UsersPublic,
+    UserTeamsPublic,
+    UserWithPermissions,
+)
+
+
+def users(rows: int) -> UsersPublic:
+    return UsersPublic(
+        data=[
+            User(
+                user_id=uuid.uuid4(),
+                email=f"user{n}@example.com",
+                full_name=f"User {n}",
+                hashed_password="",
+            )
+            for n in range(rows)
+        ],
+        count=rows,
+    )
+
+
+def items(rows: int) -> ItemsPublic:
+    team_id = uuid.uuid4()
+    return ItemsPublic(
+        data=[
+            Item(
+                item_id=uuid.uuid4(),
+                team_id=team_id,
+                item_name=f"item {n}",
+                quantity=n % 7 + 1,
+                item_vendor="vendor",
+                item_params={"voltage": n % 240, "rated": "IP67"},
+                on_loan=n % 2,
+            )
+            for n in range(rows)
+        ],
+        count=rows,
+    )
+
+
+def team_users(rows: int) -> UserTeamsPublic:
+    return UserTeamsPublic(
+        data=[
+            UserWithPermissions(
+                user_id=uuid.uuid4(),
+                email=f"user{n}@example.com",
+                full_name=f"User {n}",
+                is_active=True,
+                is_superuser=False,
+                can_edit_labs=False,
+                can_edit_items=n % 2 == 0,
+                can_edit_users=False,
+            )
+            for n in range(rows)
+        ],
+        count=rows,
+    )
+
+
+PAYLOADS = {
+    "read_users": users,
+    "read_items": items,
+    "view_team_users": team_users,
+}
+
+
+async def time_responses(
+    route: APIRoute, content: Any, response_classes: list[type[Response]], repeat: int
+) -> list[float]:
+    # Best of `repeat` per class, without the collector: allocation-heavy
+    # loops otherwise time whichever run a collection lands in. The classes
+    # take turns, so a noisy stretch of the machine hits them alike
+    timings: list[list[float]] = [[] for _ in response_classes]
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for response_class, class_timings in zip(
+                response_classes, timings, strict=True
+            ):
+                start = time.perf_counter()
+                value = await serialize_response(
+                    field=route.response_field,
+                    response_content=content,
+                    is_coroutine=True,
+                )
+                response_class(value)
+                class_timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return [min(class_timings) * 1000 for class_timings in timings]
+
+
+def time_dump_json(content: BaseModel, repeat: int) -> float:
+    model = type(content)
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            model.model_validate(content).model_dump_json()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(timings) * 1000
+
+
+async def run(rows: list[int], repeat: int, min_speedup: float) -> bool:
+    routes = {
+        route.name: route for route in app.routes if isinstance(route, APIRoute)
+    }
+    passed = True
+    for name, build in PAYLOADS.items():
+        for n in rows:
+            content = build(n)
+            stock, fast = await time_responses(
+                routes[name], content, [JSONResponse, FastJSONResponse], repeat
+            )
+            dump_json = time_dump_json(content, repeat)
+            speedup = stock / fast
+            passed = passed and speedup >= min_speedup
+            print(
+                f"{name} {n:>6,} rows: JSONResponse {stock:7.2f} ms, "
+                f"FastJSONResponse {fast:7.2f} ms ({speedup:.2f}x), "
+                f"model_dump_json {dump_json:7.2f} ms"
+            )
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--min-speedup", type=float, default=1.2)
+    args = parser.parse_args()
+    if not asyncio.run(run(args.rows, args.repeat, args.min_speedup)):
+        sys.exit(f"FastJSONResponse is less than {args.min_speedup}x faster")
+
+
+if __name__ == "__main__":
+    main()
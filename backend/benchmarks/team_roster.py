@@ -0,0 +1,153 @@
+"""
+Latency of building a team roster: the previous four-query implementation of
+view_team_users against the single joined query it now runs. The route's
+authorization lookup is left out of the latter; get_team_membership resolves
+it separately, usually from its cache.
+
+Seeds throwaway teams of each `--sizes` members, then times fetching the
+whole roster both ways, plus the first 100-row page of the new query. The
+seeded users and teams are deleted afterwards.
+
+    python -m benchmarks.team_roster --sizes 100 2000 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import text
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.pagination import paginate
+from app.api.routes.teams import team_roster_statement
+from app.core.db import async_engine
+from app.models import Team, User, UserTeam, UserWithPermissions
+
+EMAIL_DOMAIN = "roster-benchmark.example.com"
+
+SEED_SQL = text("""
+    WITH members AS (
+        INSERT INTO users (user_id, email, hashed_password, is_active, is_superuser)
+        SELECT gen_random_uuid(), :prefix || n || '@' || :domain, '', true, false
+        FROM generate_series(1, :size) AS n
+        RETURNING user_id
+    ), team AS (
+        INSERT INTO teams (team_id, team_name, owner_id)
+        SELECT :team_id, 'roster benchmark', min(user_id::text)::uuid FROM members
+        RETURNING team_id
+    )
+    INSERT INTO user_team (user_team_id, user_id, team_id, can_edit_labs, can_edit_items, can_edit_users)
+    SELECT gen_random_uuid(), members.user_id, team.team_id, random() < 0.5, random() < 0.5, false
+    FROM members, team
+    RETURNING user_id
+""")
+
+
+async def legacy_roster(
+    session: AsyncSession, team_id: uuid.UUID, caller_id: uuid.UUID
+) -> list[UserWithPermissions]:
+    await session.get(Team, team_id)
+    (
+        await session.exec(
+            select(UserTeam).where(
+                UserTeam.user_id == caller_id, UserTeam.team_id == team_id
+            )
+        )
+    ).first()
+    users_team = (
+        await session.exec(select(UserTeam).where(UserTeam.team_id == team_id))
+    ).all()
+    user_ids = [user_team.user_id for user_team in users_team]
+    users = (
+        await session.exec(select(User).where(col(User.user_id).in_(user_ids)))
+    ).all()
+    roster = []
+    for user in users:
+        user_team = next((ut for ut in users_team if ut.user_id == user.user_id), None)
+        if user_team:
+            roster.append(
+                UserWithPermissions(
+                    **user.model_dump(), **user_team.model_dump(exclude={"user_id"})
+                )
+            )
+    return roster
+
+
+async def joined_roster(
+    session: AsyncSession, team_id: uuid.UUID, limit: int
+) -> list[UserWithPermissions]:
+    statement = paginate(
+        team_roster_statement(team_id),
+        col(User.user_id),
+        cursor=None,
+        skip=0,
+        limit=limit,
+    )
+    rows = (await session.exec(statement)).all()
+    return [UserWithPermissions.model_validate(row._mapping) for row in rows]
+
+
+async def time_call(session: AsyncSession, repeat: int, func: Any, *args: Any) -> float:
+    timings = []
+    for _ in range(repeat):
+        session.expunge_all()
+        start = time.perf_counter()
+        await func(session, *args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    prefix = f"{uuid.uuid4().hex[:8]}-"
+    async with AsyncSession(async_engine) as session:
+        try:
+            print(f"{'members':>8} {'4 queries ms':>13} {'joined ms':>10} {'page ms':>8}")
+            for size in sizes:
+                team_id = uuid.uuid4()
+                result = await session.exec(  # type: ignore
+                    SEED_SQL,
+                    params={
+                        "prefix": f"{prefix}{size}-",
+                        "domain": EMAIL_DOMAIN,
+                        "size": size,
+                        "team_id": team_id,
+                    },
+                )
+                caller_id = result.first()[0]
+                await session.commit()
+                await session.exec(text("ANALYZE users, user_team"))  # type: ignore
+
+                legacy_ms = await time_call(
+                    session, repeat, legacy_roster, team_id, caller_id
+                )
+                joined_ms = await time_call(
+                    session, repeat, joined_roster, team_id, size
+                )
+                page_ms = await time_call(
+                    session, repeat, joined_roster, team_id, 100
+                )
+                print(f"{size:>8} {legacy_ms:>13.2f} {joined_ms:>10.2f} {page_ms:>8.2f}")
+        finally:
+            await session.rollback()
+            await session.exec(  # type: ignore
+                text("DELETE FROM users WHERE email LIKE :pattern"),
+                params={"pattern": f"{prefix}%@{EMAIL_DOMAIN}"},
+            )
+            await session.commit()
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 2_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,66 @@ export type Body_login_login_access_token = {
   client_secret?: string | null
 }
 
+export type CacheStats = {
+  size: number
+  max_size: number
+  ttl_seconds: number
+  hits: number
+  misses: number
+  evictions: number
+}
+
+/**
+ * How list endpoints compute `count`.
+ */
+export type CountStrategy = "exact" | "estimated" | "cached" | "none"
+
+export type ExportFormat = "ndjson" | "csv"
+
 export type HTTPValidationError = {
   detail?: Array<ValidationError>
 }
 
+export type InvalidationStats = {
+  listening: boolean
+  published: number
+  received: number
+  reconnects: number
+  mean_delay_ms: number | null
+  max_delay_ms: number | null
+}
+
+export type ItemBatchOperation = "create" | "update" | "delete"
+
+export type ItemBatchResult = {
+  operation: ItemBatchOperation
+  index: number
+  item_id: string
+  status: ItemBatchStatus
+}
+
+export type ItemBatchStatus =
+  | "created"
+  | "updated"
+  | "deleted"
+  | "not_found"
+  | "duplicate"
+
+export type ItemBatchUpdate = {
+  item_name?: string | null
+  quantity?: number
+  item_img_url?: string | null
+  item_vendor?: string | null
+  item_params?: { [key: string]: unknown } | null
+  item_id: string
+}
+
 export type ItemCreate = {
   item_name: string
   quantity?: number
   item_img_url?: string | null
   item_vendor?: string | null
-  item_params?: string | null
+  item_params?: { [key: string]: unknown } | null
 }
 
 export type ItemPublic = {
@@ -24,9 +74,24 @@ export type ItemPublic = {
   quantity?: number
   item_img_url?: string | null
   item_vendor?: string | null
-  item_params?: string | null
+  item_params?: { [key: string]: unknown } | null
   item_id: string
   team_id: string
+  on_loan: number
+  readonly available: number
+}
+
+export type ItemSearchPublic = {
+  item_name: string
+  quantity?: number
+  item_img_url?: string | null
+  item_vendor?: string | null
+  item_params?: { [key: string]: unknown } | null
+  item_id: string
+  team_id: string
+  on_loan: number
+  rank: number
+  readonly available: number
 }
 
 export type ItemUpdate = {
@@ -34,197 +99,225 @@ export type ItemUpdate = {
   quantity?: number
   item_img_url?: string | null
   item_vendor?: string | null
-  item_params?: string | null
+  item_params?: { [key: string]: unknown } | null
 }
 
-export type ItemsPublic = {
-  data: Array<ItemPublic>
-  count: number
+export type ItemsBatch = {
+  create?: Array<ItemCreate>
+  update?: Array<ItemBatchUpdate>
+  delete?: Array<string>
+  atomic?: boolean
 }
 
-export type Message = {
-  message: string
+export type ItemsBatchPublic = {
+  data: Array<ItemBatchResult>
+  applied: boolean
 }
 
-export type NewPassword = {
-  token: string
-  new_password: string
+export type ItemsPublic = {
+  data: Array<ItemPublic>
+  count: number | null
+  next_cursor?: string | null
 }
 
-export type Token = {
-  access_token: string
-  token_type?: string
+export type ItemsSearchPublic = {
+  data: Array<ItemSearchPublic>
 }
 
-export type UpdatePassword = {
-  current_password: string
-  new_password: string
+export type LabCreate = {
+  lab_place?: string | null
+  lab_university?: string | null
+  lab_num?: string | null
 }
 
-export type UserCreate = {
-  email: string
-  is_active?: boolean
-  is_superuser?: boolean
-  full_name?: string | null
-  password: string
+export type LabPublic = {
+  lab_place?: string | null
+  lab_university?: string | null
+  lab_num?: string | null
+  lab_id: string
+  owner_id: string
+  team_id: string
 }
 
-export type UserPublic = {
-  email: string
-  is_active?: boolean
-  is_superuser?: boolean
-  full_name?: string | null
-  user_id: string
+export type LabUpdate = {
+  lab_place?: string | null
+  lab_university?: string | null
+  lab_num?: string | null
 }
 
-export type UserRegister = {
-  email: string
-  password: string
-  full_name?: string | null
+export type LabsPublic = {
+  data: Array<LabPublic>
+  count: number | null
+  next_cursor?: string | null
 }
 
-export type UserUpdate = {
-  email?: string | null
-  is_active?: boolean
-  is_superuser?: boolean
-  full_name?: string | null
-  password?: string | null
+export type Message = {
+  message: string
 }
 
-export type UserUpdateMe = {
-  full_name?: string | null
-  email?: string | null
+export type NewPassword = {
+  token: string
+  new_password: string
 }
 
-export type UsersPublic = {
-  data: Array<UserPublic>
-  count: number
+export type PoolStats = {
+  engine: string
+  pid: number
+  pool_size: number
+  max_overflow: number
+  checked_out: number
+  checked_in: number
+  overflow: number
+  checkouts: number
+  timeouts: number
+  avg_wait_ms: number
+  max_wait_ms: number
 }
 
-export type ValidationError = {
-  loc: Array<string | number>
-  msg: string
-  type: string
+export type RouteCacheStats = {
+  route: string
+  hits: number
+  misses: number
+  hit_ratio: number
+  hit_p50_ms: number | null
+  hit_p95_ms: number | null
+  miss_p50_ms: number | null
+  miss_p95_ms: number | null
 }
 
 export type TeamCreate = {
-  team_name?: string | null
+  team_name: string
 }
 
-export type TeamUpdate = {
+export type TeamPublic = {
+  team_name: string
   team_id: string
   owner_id: string
-  team_name?: string | null
 }
 
-export type TeamPublic = {
+export type TeamUpdate = {
   team_name?: string | null
-  team_id: string
-  owner_id: string
 }
 
 export type TeamsPublic = {
   data: Array<TeamPublic>
-  count: number
+  count: number | null
+  next_cursor?: string | null
 }
 
-export type UserTeam = {
-  user_team_id: string
-  user_id: string
-  team_id: string
-  can_edit_labs?: boolean
-  can_edit_items?: boolean
-  can_edit_users?: boolean
+export type Token = {
+  access_token: string
+  token_type?: string
 }
 
-export type UserTeamCreate = {
+export type UpdatePassword = {
+  current_password: string
+  new_password: string
+}
+
+export type UserCreate = {
   email: string
-  can_edit_labs?: boolean
-  can_edit_items?: boolean
-  can_edit_users?: boolean
+  is_active?: boolean
+  is_superuser?: boolean
+  full_name?: string | null
+  password: string
 }
 
-export type UpdateUserTeam = {
-  can_edit_labs?: boolean
-  can_edit_items?: boolean
-  can_edit_users?: boolean
+export type UserItemCheckout = {
+  item_id: string
+  lab_id: string
+  table_name?: string | null
+  system_name?: string | null
 }
 
-export type UserTeamDelete = {
+export type UserItemPublic = {
+  borrowed_at: string
+  returned_at?: string | null
+  table_name?: string | null
+  system_name?: string | null
+  item_status?: string | null
+  user_item_id: string
   user_id: string
+  item_id: string
+  lab_id: string
 }
 
-export type UserWithPermissions = {
+export type UserPublic = {
   email: string
   is_active?: boolean
   is_superuser?: boolean
   full_name?: string | null
   user_id: string
+}
+
+export type UserRegister = {
+  email: string
+  password: string
+  full_name?: string | null
+}
+
+export type UserTeamBulkResult = {
+  email: string
+  status: UserTeamBulkStatus
+  user_id?: string | null
+}
+
+export type UserTeamBulkStatus = "added" | "already_member" | "user_not_found"
+
+export type UserTeamCreate = {
+  email: string
   can_edit_labs?: boolean
   can_edit_items?: boolean
   can_edit_users?: boolean
 }
 
-export type UserTeamsPublic = {
-  data: Array<UserWithPermissions>
-  count: number
+export type UserTeamsBulkCreate = {
+  users: Array<UserTeamCreate>
 }
 
-export type LabCreate = {
-  lab_place?: string | null
-  lab_university?: string | null
-  lab_num?: string | null
+export type UserTeamsBulkPublic = {
+  data: Array<UserTeamBulkResult>
+  added: number
 }
 
-export type LabUpdate = {
-  lab_place?: string | null
-  lab_university?: string | null
-  lab_num?: string | null
+export type UserTeamsPublic = {
+  data: Array<UserWithPermissions>
+  count: number | null
+  next_cursor?: string | null
 }
 
-export type LabPublic = {
-  lab_place?: string | null
-  lab_university?: string | null
-  lab_num?: string | null
-  lab_id: string
-  owner_id: string
-  team_id: string
+export type UserUpdate = {
+  email?: string | null
+  is_active?: boolean
+  is_superuser?: boolean
+  full_name?: string | null
+  password?: string | null
 }
 
-export type LabsPublic = {
-  data: Array<LabPublic>
-  count: number
+export type UserUpdateMe = {
+  full_name?: string | null
+  email?: string | null
 }
 
-export type UserItemCreate = {
-  borrowed_at: string
-  returned_at?: string | null
-  table_name?: string | null
-  system_name?: string | null
-  item_status?: string | null
+export type UserWithPermissions = {
+  email: string
+  is_active: boolean
+  is_superuser: boolean
+  full_name?: string | null
+  user_id: string
+  can_edit_labs: boolean
+  can_edit_items: boolean
+  can_edit_users: boolean
 }
 
-export type UserItemUpdate = {
-  borrowed_at?: string | null
-  returned_at?: string | null
-  table_name?: string | null
-  system_name?: string | null
-  item_status?: string | null
+export type UsersPublic = {
+  data: Array<UserPublic>
+  count: number | null
+  next_cursor?: string | null
 }
 
-export type UserItemPublic = {
-  borrowed_at: string
-  returned_at?: string | null
-  table_name?: string | null
-  system_name?: string | null
-  item_status?: string | null
-  user_item_id: string
-  user_id: string
-  item_id: string
-  lab_id: string
+export type ValidationError = {
+  loc: Array<string | number>
+  msg: string
+  type: string
 }
-
-export type UserItemsPublic = {
-  data: Array<UserItemPublic>
-  count: number
-}
\ No newline at end of file
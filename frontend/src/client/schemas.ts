@@ -49,6 +49,46 @@ export const $Body_login_login_access_token = {
   },
 } as const
 
+export const $CacheStats = {
+  properties: {
+    size: {
+      type: "number",
+      isRequired: true,
+    },
+    max_size: {
+      type: "number",
+      isRequired: true,
+    },
+    ttl_seconds: {
+      type: "number",
+      isRequired: true,
+    },
+    hits: {
+      type: "number",
+      isRequired: true,
+    },
+    misses: {
+      type: "number",
+      isRequired: true,
+    },
+    evictions: {
+      type: "number",
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $CountStrategy = {
+  type: "Enum",
+  description: `How list endpoints compute \`count\`.`,
+  enum: ["exact", "estimated", "cached", "none"],
+} as const
+
+export const $ExportFormat = {
+  type: "Enum",
+  enum: ["ndjson", "csv"],
+} as const
+
 export const $HTTPValidationError = {
   properties: {
     detail: {
@@ -60,6 +100,150 @@ export const $HTTPValidationError = {
   },
 } as const
 
+export const $InvalidationStats = {
+  properties: {
+    listening: {
+      type: "boolean",
+      isRequired: true,
+    },
+    published: {
+      type: "number",
+      isRequired: true,
+    },
+    received: {
+      type: "number",
+      isRequired: true,
+    },
+    reconnects: {
+      type: "number",
+      isRequired: true,
+    },
+    mean_delay_ms: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
+      isRequired: true,
+    },
+    max_delay_ms: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $ItemBatchOperation = {
+  type: "Enum",
+  enum: ["create", "update", "delete"],
+} as const
+
+export const $ItemBatchResult = {
+  properties: {
+    operation: {
+      type: "ItemBatchOperation",
+      isRequired: true,
+    },
+    index: {
+      type: "number",
+      isRequired: true,
+    },
+    item_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    status: {
+      type: "ItemBatchStatus",
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $ItemBatchStatus = {
+  type: "Enum",
+  enum: ["created", "updated", "deleted", "not_found", "duplicate"],
+} as const
+
+export const $ItemBatchUpdate = {
+  properties: {
+    item_name: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+          maxLength: 255,
+          minLength: 1,
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    quantity: {
+      type: "number",
+      default: 1,
+      maximum: 2147483647,
+      minimum: -2147483648,
+    },
+    item_img_url: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+          maxLength: 255,
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_vendor: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+          maxLength: 255,
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_params: {
+      type: "any-of",
+      contains: [
+        {
+          type: "dictionary",
+          contains: {
+            properties: {},
+          },
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+  },
+} as const
+
 export const $ItemCreate = {
   properties: {
     item_name: {
@@ -71,6 +255,8 @@ export const $ItemCreate = {
     quantity: {
       type: "number",
       default: 1,
+      maximum: 2147483647,
+      minimum: -2147483648,
     },
     item_img_url: {
       type: "any-of",
@@ -100,8 +286,10 @@ export const $ItemCreate = {
       type: "any-of",
       contains: [
         {
-          type: "string",
-          maxLength: 255,
+          type: "dictionary",
+          contains: {
+            properties: {},
+          },
         },
         {
           type: "null",
@@ -122,6 +310,8 @@ export const $ItemPublic = {
     quantity: {
       type: "number",
       default: 1,
+      maximum: 2147483647,
+      minimum: -2147483648,
     },
     item_img_url: {
       type: "any-of",
@@ -148,6 +338,68 @@ export const $ItemPublic = {
       ],
     },
     item_params: {
+      type: "any-of",
+      contains: [
+        {
+          type: "dictionary",
+          contains: {
+            properties: {},
+          },
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    team_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    on_loan: {
+      type: "number",
+      isRequired: true,
+    },
+    available: {
+      type: "number",
+      isReadOnly: true,
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $ItemSearchPublic = {
+  properties: {
+    item_name: {
+      type: "string",
+      isRequired: true,
+      maxLength: 255,
+      minLength: 1,
+    },
+    quantity: {
+      type: "number",
+      default: 1,
+      maximum: 2147483647,
+      minimum: -2147483648,
+    },
+    item_img_url: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+          maxLength: 255,
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_vendor: {
       type: "any-of",
       contains: [
         {
@@ -159,6 +411,20 @@ export const $ItemPublic = {
         },
       ],
     },
+    item_params: {
+      type: "any-of",
+      contains: [
+        {
+          type: "dictionary",
+          contains: {
+            properties: {},
+          },
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
     item_id: {
       type: "string",
       isRequired: true,
@@ -169,6 +435,19 @@ export const $ItemPublic = {
       isRequired: true,
       format: "uuid",
     },
+    on_loan: {
+      type: "number",
+      isRequired: true,
+    },
+    rank: {
+      type: "number",
+      isRequired: true,
+    },
+    available: {
+      type: "number",
+      isReadOnly: true,
+      isRequired: true,
+    },
   },
 } as const
 
@@ -190,6 +469,8 @@ export const $ItemUpdate = {
     quantity: {
       type: "number",
       default: 1,
+      maximum: 2147483647,
+      minimum: -2147483648,
     },
     item_img_url: {
       type: "any-of",
@@ -219,8 +500,10 @@ export const $ItemUpdate = {
       type: "any-of",
       contains: [
         {
-          type: "string",
-          maxLength: 255,
+          type: "dictionary",
+          contains: {
+            properties: {},
+          },
         },
         {
           type: "null",
@@ -230,93 +513,100 @@ export const $ItemUpdate = {
   },
 } as const
 
-export const $ItemsPublic = {
+export const $ItemsBatch = {
   properties: {
-    data: {
+    create: {
       type: "array",
       contains: {
-        type: "ItemPublic",
+        type: "ItemCreate",
       },
-      isRequired: true,
     },
-    count: {
-      type: "number",
-      isRequired: true,
+    update: {
+      type: "array",
+      contains: {
+        type: "ItemBatchUpdate",
+      },
+    },
+    delete: {
+      type: "array",
+      contains: {
+        type: "string",
+        format: "uuid",
+      },
+    },
+    atomic: {
+      type: "boolean",
+      default: true,
     },
   },
 } as const
 
-export const $Message = {
+export const $ItemsBatchPublic = {
   properties: {
-    message: {
-      type: "string",
+    data: {
+      type: "array",
+      contains: {
+        type: "ItemBatchResult",
+      },
+      isRequired: true,
+    },
+    applied: {
+      type: "boolean",
       isRequired: true,
     },
   },
 } as const
 
-export const $NewPassword = {
+export const $ItemsPublic = {
   properties: {
-    token: {
-      type: "string",
-      isRequired: true,
-    },
-    new_password: {
-      type: "string",
+    data: {
+      type: "array",
+      contains: {
+        type: "ItemPublic",
+      },
       isRequired: true,
-      maxLength: 40,
-      minLength: 8,
     },
-  },
-} as const
-
-export const $Token = {
-  properties: {
-    access_token: {
-      type: "string",
+    count: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
       isRequired: true,
     },
-    token_type: {
-      type: "string",
-      default: "bearer",
+    next_cursor: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
     },
   },
 } as const
 
-export const $UpdatePassword = {
+export const $ItemsSearchPublic = {
   properties: {
-    current_password: {
-      type: "string",
-      isRequired: true,
-      maxLength: 40,
-      minLength: 8,
-    },
-    new_password: {
-      type: "string",
+    data: {
+      type: "array",
+      contains: {
+        type: "ItemSearchPublic",
+      },
       isRequired: true,
-      maxLength: 40,
-      minLength: 8,
     },
   },
 } as const
 
-export const $UserCreate = {
+export const $LabCreate = {
   properties: {
-    email: {
-      type: "string",
-      isRequired: true,
-      format: "email",
-      maxLength: 255,
-    },
-    is_active: {
-      type: "boolean",
-      default: true,
-    },
-    is_superuser: {
-      type: "boolean",
-      default: false,
-    },
-    full_name: {
+    lab_place: {
       type: "any-of",
       contains: [
         {
@@ -328,32 +618,7 @@ export const $UserCreate = {
         },
       ],
     },
-    password: {
-      type: "string",
-      isRequired: true,
-      maxLength: 40,
-      minLength: 8,
-    },
-  },
-} as const
-
-export const $UserPublic = {
-  properties: {
-    email: {
-      type: "string",
-      isRequired: true,
-      format: "email",
-      maxLength: 255,
-    },
-    is_active: {
-      type: "boolean",
-      default: true,
-    },
-    is_superuser: {
-      type: "boolean",
-      default: false,
-    },
-    full_name: {
+    lab_university: {
       type: "any-of",
       contains: [
         {
@@ -365,29 +630,7 @@ export const $UserPublic = {
         },
       ],
     },
-    user_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
-    },
-  },
-} as const
-
-export const $UserRegister = {
-  properties: {
-    email: {
-      type: "string",
-      isRequired: true,
-      format: "email",
-      maxLength: 255,
-    },
-    password: {
-      type: "string",
-      isRequired: true,
-      maxLength: 40,
-      minLength: 8,
-    },
-    full_name: {
+    lab_num: {
       type: "any-of",
       contains: [
         {
@@ -402,14 +645,13 @@ export const $UserRegister = {
   },
 } as const
 
-export const $UserUpdate = {
+export const $LabPublic = {
   properties: {
-    email: {
+    lab_place: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          format: "email",
           maxLength: 255,
         },
         {
@@ -417,15 +659,7 @@ export const $UserUpdate = {
         },
       ],
     },
-    is_active: {
-      type: "boolean",
-      default: true,
-    },
-    is_superuser: {
-      type: "boolean",
-      default: false,
-    },
-    full_name: {
+    lab_university: {
       type: "any-of",
       contains: [
         {
@@ -437,25 +671,39 @@ export const $UserUpdate = {
         },
       ],
     },
-    password: {
+    lab_num: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 40,
-          minLength: 8,
+          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
+    lab_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    owner_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    team_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
   },
 } as const
 
-export const $UserUpdateMe = {
+export const $LabUpdate = {
   properties: {
-    full_name: {
+    lab_place: {
       type: "any-of",
       contains: [
         {
@@ -467,12 +715,23 @@ export const $UserUpdateMe = {
         },
       ],
     },
-    email: {
+    lab_university: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+          maxLength: 255,
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    lab_num: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          format: "email",
           maxLength: 255,
         },
         {
@@ -483,71 +742,188 @@ export const $UserUpdateMe = {
   },
 } as const
 
-export const $UsersPublic = {
+export const $LabsPublic = {
   properties: {
     data: {
       type: "array",
       contains: {
-        type: "UserPublic",
+        type: "LabPublic",
       },
       isRequired: true,
     },
     count: {
-      type: "number",
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
       isRequired: true,
     },
+    next_cursor: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
   },
 } as const
 
-export const $ValidationError = {
+export const $Message = {
   properties: {
-    loc: {
-      type: "array",
-      contains: {
-        type: "any-of",
-        contains: [
-          {
-            type: "string",
-          },
-          {
-            type: "number",
-          },
-        ],
-      },
+    message: {
+      type: "string",
       isRequired: true,
     },
-    msg: {
+  },
+} as const
+
+export const $NewPassword = {
+  properties: {
+    token: {
       type: "string",
       isRequired: true,
     },
-    type: {
+    new_password: {
       type: "string",
       isRequired: true,
+      maxLength: 40,
+      minLength: 8,
     },
   },
 } as const
 
-export const $TeamCreate = {
+export const $PoolStats = {
   properties: {
-    team_name: {
+    engine: {
       type: "string",
       isRequired: true,
     },
+    pid: {
+      type: "number",
+      isRequired: true,
+    },
+    pool_size: {
+      type: "number",
+      isRequired: true,
+    },
+    max_overflow: {
+      type: "number",
+      isRequired: true,
+    },
+    checked_out: {
+      type: "number",
+      isRequired: true,
+    },
+    checked_in: {
+      type: "number",
+      isRequired: true,
+    },
+    overflow: {
+      type: "number",
+      isRequired: true,
+    },
+    checkouts: {
+      type: "number",
+      isRequired: true,
+    },
+    timeouts: {
+      type: "number",
+      isRequired: true,
+    },
+    avg_wait_ms: {
+      type: "number",
+      isRequired: true,
+    },
+    max_wait_ms: {
+      type: "number",
+      isRequired: true,
+    },
   },
 } as const
 
-export const $TeamUpdate = {
+export const $RouteCacheStats = {
   properties: {
-    team_name: {
+    route: {
+      type: "string",
+      isRequired: true,
+    },
+    hits: {
+      type: "number",
+      isRequired: true,
+    },
+    misses: {
+      type: "number",
+      isRequired: true,
+    },
+    hit_ratio: {
+      type: "number",
+      isRequired: true,
+    },
+    hit_p50_ms: {
       type: "any-of",
       contains: [
         {
-          type: "string",
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
+      isRequired: true,
+    },
+    hit_p95_ms: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
         },
         {
           type: "null",
         },
       ],
+      isRequired: true,
+    },
+    miss_p50_ms: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
+      isRequired: true,
+    },
+    miss_p95_ms: {
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $TeamCreate = {
+  properties: {
+    team_name: {
+      type: "string",
+      isRequired: true,
     },
   },
 } as const
@@ -571,6 +947,22 @@ export const $TeamPublic = {
   },
 } as const
 
+export const $TeamUpdate = {
+  properties: {
+    team_name: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+  },
+} as const
+
 export const $TeamsPublic = {
   properties: {
     data: {
@@ -581,67 +973,68 @@ export const $TeamsPublic = {
       isRequired: true,
     },
     count: {
-      type: "number",
+      type: "any-of",
+      contains: [
+        {
+          type: "number",
+        },
+        {
+          type: "null",
+        },
+      ],
       isRequired: true,
     },
+    next_cursor: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
   },
 } as const
 
-export const $UserTeamCreate = {
+export const $Token = {
   properties: {
-    email: {
+    access_token: {
       type: "string",
       isRequired: true,
-      format: "email",
-    },
-    can_edit_labs: {
-      type: "boolean",
-      default: false,
     },
-    can_edit_items: {
-      type: "boolean",
-      default: false,
-    },
-    can_edit_users: {
-      type: "boolean",
-      default: false,
+    token_type: {
+      type: "string",
+      default: "bearer",
     },
   },
 } as const
 
-export const $UserTeamUpdate = {
+export const $UpdatePassword = {
   properties: {
-    can_edit_labs: {
-      type: "boolean",
-      default: false,
-    },
-    can_edit_items: {
-      type: "boolean",
-      default: false,
-    },
-    can_edit_users: {
-      type: "boolean",
-      default: false,
+    current_password: {
+      type: "string",
+      isRequired: true,
+      maxLength: 40,
+      minLength: 8,
     },
-  },
-} as const
-
-export const $UserTeamDelete = {
-  properties: {
-    user_id: {
+    new_password: {
       type: "string",
       isRequired: true,
-      format: "uuid",
+      maxLength: 40,
+      minLength: 8,
     },
   },
 } as const
 
-export const $UserWithPermissions = {
+export const $UserCreate = {
   properties: {
     email: {
       type: "string",
       isRequired: true,
       format: "email",
+      maxLength: 255,
     },
     is_active: {
       type: "boolean",
@@ -663,110 +1056,144 @@ export const $UserWithPermissions = {
         },
       ],
     },
-    user_id: {
+    password: {
       type: "string",
       isRequired: true,
-      format: "uuid",
-    },
-    can_edit_labs: {
-      type: "boolean",
-      default: false,
-    },
-    can_edit_items: {
-      type: "boolean",
-      default: false,
-    },
-    can_edit_users: {
-      type: "boolean",
-      default: false,
+      maxLength: 40,
+      minLength: 8,
     },
   },
 } as const
 
-export const $UserTeamsPublic = {
+export const $UserItemCheckout = {
   properties: {
-    data: {
-      type: "array",
-      contains: {
-        type: "UserWithPermissions",
-      },
+    item_id: {
+      type: "string",
       isRequired: true,
+      format: "uuid",
     },
-    count: {
-      type: "number",
+    lab_id: {
+      type: "string",
       isRequired: true,
+      format: "uuid",
     },
-  },
-} as const;
-
-export const $LabCreate = {
-  properties: {
-    lab_place: {
+    table_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    lab_university: {
+    system_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    lab_num: {
+  },
+} as const
+
+export const $UserItemPublic = {
+  properties: {
+    borrowed_at: {
+      type: "string",
+      isRequired: true,
+      format: "date-time",
+    },
+    returned_at: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
+          format: "date-time",
         },
         {
           type: "null",
         },
       ],
     },
-  },
-} as const
-
-export const $LabUpdate = {
-  properties: {
-    lab_place: {
+    table_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    lab_university: {
+    system_name: {
+      type: "any-of",
+      contains: [
+        {
+          type: "string",
+        },
+        {
+          type: "null",
+        },
+      ],
+    },
+    item_status: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    lab_num: {
+    user_item_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    user_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    item_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    lab_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+  },
+} as const
+
+export const $UserPublic = {
+  properties: {
+    email: {
+      type: "string",
+      isRequired: true,
+      format: "email",
+      maxLength: 255,
+    },
+    is_active: {
+      type: "boolean",
+      default: true,
+    },
+    is_superuser: {
+      type: "boolean",
+      default: false,
+    },
+    full_name: {
       type: "any-of",
       contains: [
         {
@@ -778,24 +1205,29 @@ export const $LabUpdate = {
         },
       ],
     },
+    user_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
   },
 } as const
 
-export const $LabPublic = {
+export const $UserRegister = {
   properties: {
-    lab_place: {
-      type: "any-of",
-      contains: [
-        {
-          type: "string",
-          maxLength: 255,
-        },
-        {
-          type: "null",
-        },
-      ],
+    email: {
+      type: "string",
+      isRequired: true,
+      format: "email",
+      maxLength: 255,
     },
-    lab_university: {
+    password: {
+      type: "string",
+      isRequired: true,
+      maxLength: 40,
+      minLength: 8,
+    },
+    full_name: {
       type: "any-of",
       contains: [
         {
@@ -807,92 +1239,111 @@ export const $LabPublic = {
         },
       ],
     },
-    lab_num: {
+  },
+} as const
+
+export const $UserTeamBulkResult = {
+  properties: {
+    email: {
+      type: "string",
+      isRequired: true,
+    },
+    status: {
+      type: "UserTeamBulkStatus",
+      isRequired: true,
+    },
+    user_id: {
       type: "any-of",
       contains: [
         {
           type: "string",
-          maxLength: 255,
+          format: "uuid",
         },
         {
           type: "null",
         },
       ],
     },
-    lab_id: {
+  },
+} as const
+
+export const $UserTeamBulkStatus = {
+  type: "Enum",
+  enum: ["added", "already_member", "user_not_found"],
+} as const
+
+export const $UserTeamCreate = {
+  properties: {
+    email: {
       type: "string",
       isRequired: true,
-      format: "uuid",
+      format: "email",
     },
-    owner_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
+    can_edit_labs: {
+      type: "boolean",
+      default: false,
     },
-    team_id: {
-      type: "string",
+    can_edit_items: {
+      type: "boolean",
+      default: false,
+    },
+    can_edit_users: {
+      type: "boolean",
+      default: false,
+    },
+  },
+} as const
+
+export const $UserTeamsBulkCreate = {
+  properties: {
+    users: {
+      type: "array",
+      contains: {
+        type: "UserTeamCreate",
+      },
       isRequired: true,
-      format: "uuid",
     },
   },
 } as const
 
-export const $LabsPublic = {
+export const $UserTeamsBulkPublic = {
   properties: {
     data: {
       type: "array",
       contains: {
-        type: "LabPublic",
+        type: "UserTeamBulkResult",
       },
       isRequired: true,
     },
-    count: {
+    added: {
       type: "number",
       isRequired: true,
     },
   },
 } as const
 
-export const $UserItemCreate = {
+export const $UserTeamsPublic = {
   properties: {
-    borrowed_at: {
-      type: "string",
+    data: {
+      type: "array",
+      contains: {
+        type: "UserWithPermissions",
+      },
       isRequired: true,
     },
-    returned_at: {
-      type: "any-of",
-      contains: [
-        {
-          type: "string",
-        },
-        {
-          type: "null",
-        },
-      ],
-    },
-    table_name: {
-      type: "any-of",
-      contains: [
-        {
-          type: "string",
-        },
-        {
-          type: "null",
-        },
-      ],
-    },
-    system_name: {
+    count: {
       type: "any-of",
       contains: [
         {
-          type: "string",
+          type: "number",
         },
         {
           type: "null",
         },
       ],
+      isRequired: true,
     },
-    item_status: {
+    next_cursor: {
       type: "any-of",
       contains: [
         {
@@ -906,57 +1357,78 @@ export const $UserItemCreate = {
   },
 } as const
 
-export const $UserItemUpdate = {
+export const $UserUpdate = {
   properties: {
-    borrowed_at: {
+    email: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          format: "email",
+          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    returned_at: {
+    is_active: {
+      type: "boolean",
+      default: true,
+    },
+    is_superuser: {
+      type: "boolean",
+      default: false,
+    },
+    full_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    table_name: {
+    password: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          maxLength: 40,
+          minLength: 8,
         },
         {
           type: "null",
         },
       ],
     },
-    system_name: {
+  },
+} as const
+
+export const $UserUpdateMe = {
+  properties: {
+    full_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    item_status: {
+    email: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          format: "email",
+          maxLength: 255,
         },
         {
           type: "null",
@@ -966,46 +1438,75 @@ export const $UserItemUpdate = {
   },
 } as const
 
-export const $UserItemPublic = {
+export const $UserWithPermissions = {
   properties: {
-    borrowed_at: {
+    email: {
       type: "string",
       isRequired: true,
+      format: "email",
     },
-    returned_at: {
-      type: "any-of",
-      contains: [
-        {
-          type: "string",
-        },
-        {
-          type: "null",
-        },
-      ],
+    is_active: {
+      type: "boolean",
+      isRequired: true,
     },
-    table_name: {
+    is_superuser: {
+      type: "boolean",
+      isRequired: true,
+    },
+    full_name: {
       type: "any-of",
       contains: [
         {
           type: "string",
+          maxLength: 255,
         },
         {
           type: "null",
         },
       ],
     },
-    system_name: {
+    user_id: {
+      type: "string",
+      isRequired: true,
+      format: "uuid",
+    },
+    can_edit_labs: {
+      type: "boolean",
+      isRequired: true,
+    },
+    can_edit_items: {
+      type: "boolean",
+      isRequired: true,
+    },
+    can_edit_users: {
+      type: "boolean",
+      isRequired: true,
+    },
+  },
+} as const
+
+export const $UsersPublic = {
+  properties: {
+    data: {
+      type: "array",
+      contains: {
+        type: "UserPublic",
+      },
+      isRequired: true,
+    },
+    count: {
       type: "any-of",
       contains: [
         {
-          type: "string",
+          type: "number",
         },
         {
           type: "null",
         },
       ],
+      isRequired: true,
     },
-    item_status: {
+    next_cursor: {
       type: "any-of",
       contains: [
         {
@@ -1016,41 +1517,33 @@ export const $UserItemPublic = {
         },
       ],
     },
-    user_item_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
-    },
-    user_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
-    },
-    item_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
-    },
-    lab_id: {
-      type: "string",
-      isRequired: true,
-      format: "uuid",
-    },
   },
 } as const
 
-export const $UserItemsPublic = {
+export const $ValidationError = {
   properties: {
-    data: {
+    loc: {
       type: "array",
       contains: {
-        type: "UserItemPublic",
+        type: "any-of",
+        contains: [
+          {
+            type: "string",
+          },
+          {
+            type: "number",
+          },
+        ],
       },
       isRequired: true,
     },
-    count: {
-      type: "number",
+    msg: {
+      type: "string",
+      isRequired: true,
+    },
+    type: {
+      type: "string",
       isRequired: true,
     },
   },
-} as const
\ No newline at end of file
+} as const
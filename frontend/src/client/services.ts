@@ -8,32 +8,40 @@ import type {
   NewPassword,
   Token,
   UserPublic,
+  CountStrategy,
   UpdatePassword,
   UserCreate,
   UserRegister,
   UsersPublic,
   UserUpdate,
   UserUpdateMe,
+  CacheStats,
+  InvalidationStats,
+  PoolStats,
+  RouteCacheStats,
   ItemCreate,
   ItemPublic,
+  ItemsBatch,
+  ItemsBatchPublic,
   ItemsPublic,
+  ItemsSearchPublic,
   ItemUpdate,
   TeamCreate,
   TeamPublic,
   TeamsPublic,
   TeamUpdate,
   UserTeamCreate,
+  UserTeamsBulkCreate,
+  UserTeamsBulkPublic,
+  UserTeamsPublic,
   UserWithPermissions,
-  UpdateUserTeam,
   LabCreate,
   LabPublic,
   LabsPublic,
   LabUpdate,
-  UserItemCreate,
+  UserItemCheckout,
   UserItemPublic,
-  UserItemsPublic,
-  UserItemUpdate,
-  UserTeamsPublic,
+  ExportFormat,
 } from "./models"
 
 export type TDataLoginAccessToken = {
@@ -151,6 +159,8 @@ export class LoginService {
 }
 
 export type TDataReadUsers = {
+  countStrategy?: CountStrategy
+  cursor?: string | null
   limit?: number
   skip?: number
 }
@@ -167,14 +177,14 @@ export type TDataRegisterUser = {
   requestBody: UserRegister
 }
 export type TDataReadUserById = {
-  user_id: string
+  userId: string
 }
 export type TDataUpdateUser = {
   requestBody: UserUpdate
-  user_id: string
+  userId: string
 }
 export type TDataDeleteUser = {
-  user_id: string
+  userId: string
 }
 
 export class UsersService {
@@ -187,13 +197,15 @@ export class UsersService {
   public static readUsers(
     data: TDataReadUsers = {},
   ): CancelablePromise<UsersPublic> {
-    const { limit = 100, skip = 0 } = data
+    const { countStrategy = "exact", cursor, limit = 100, skip = 0 } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/users/",
       query: {
         skip,
         limit,
+        cursor,
+        count_strategy: countStrategy,
       },
       errors: {
         422: `Validation Error`,
@@ -320,12 +332,12 @@ export class UsersService {
   public static readUserById(
     data: TDataReadUserById,
   ): CancelablePromise<UserPublic> {
-    const { user_id } = data
+    const { userId } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/users/{user_id}",
       path: {
-        user_id,
+        user_id: userId,
       },
       errors: {
         422: `Validation Error`,
@@ -342,12 +354,12 @@ export class UsersService {
   public static updateUser(
     data: TDataUpdateUser,
   ): CancelablePromise<UserPublic> {
-    const { requestBody, user_id } = data
+    const { requestBody, userId } = data
     return __request(OpenAPI, {
       method: "PATCH",
       url: "/api/v1/users/{user_id}",
       path: {
-        user_id,
+        user_id: userId,
       },
       body: requestBody,
       mediaType: "application/json",
@@ -364,12 +376,12 @@ export class UsersService {
    * @throws ApiError
    */
   public static deleteUser(data: TDataDeleteUser): CancelablePromise<Message> {
-    const { user_id } = data
+    const { userId } = data
     return __request(OpenAPI, {
       method: "DELETE",
       url: "/api/v1/users/{user_id}",
       path: {
-        user_id,
+        user_id: userId,
       },
       errors: {
         422: `Validation Error`,
@@ -403,6 +415,62 @@ export class UtilsService {
     })
   }
 
+  /**
+   * User Cache Stats
+   * Hit/miss counters of this worker's authenticated user cache.
+   * @returns CacheStats Successful Response
+   * @throws ApiError
+   */
+  public static userCacheStats(): CancelablePromise<CacheStats> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/utils/user-cache-stats/",
+    })
+  }
+
+  /**
+   * Db Pool Stats
+   * Connection pool usage and checkout wait times of this worker.
+   * @returns Array<PoolStats> Successful Response
+   * @throws ApiError
+   */
+  public static dbPoolStats(): CancelablePromise<Array<PoolStats>> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/utils/db-pool-stats/",
+    })
+  }
+
+  /**
+   * Response Cache Stats
+   * Hit ratio and serving latency of cached responses per route, in this
+   * worker.
+   * @returns Array<RouteCacheStats> Successful Response
+   * @throws ApiError
+   */
+  public static responseCacheStats(): CancelablePromise<
+    Array<RouteCacheStats>
+  > {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/utils/response-cache-stats/",
+    })
+  }
+
+  /**
+   * Cache Invalidation Stats
+   * Cache invalidations this worker broadcast and received, and how long
+   * they took to arrive.
+   * @returns InvalidationStats Successful Response
+   * @throws ApiError
+   */
+  public static cacheInvalidationStats(): CancelablePromise<InvalidationStats> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/utils/cache-invalidation-stats/",
+    })
+  }
+
   /**
    * Health Check
    * @returns boolean Successful Response
@@ -417,41 +485,60 @@ export class UtilsService {
 }
 
 export type TDataReadItems = {
+  countStrategy?: CountStrategy
+  cursor?: string | null
   limit?: number
   skip?: number
 }
 export type TDataCreateItem = {
   requestBody: ItemCreate
+  teamId: string
+}
+export type TDataSearchItems = {
+  q: string
+  limit?: number
+  teamId?: string | null
 }
 export type TDataReadItem = {
-  item_id: string
+  itemId: string
 }
 export type TDataUpdateItem = {
-  item_id: string
+  itemId: string
   requestBody: ItemUpdate
 }
 export type TDataDeleteItem = {
-  item_id: string
-  team_id: string
+  itemId: string
+}
+export type TDataBatchItems = {
+  requestBody: ItemsBatch
+  teamId: string
+}
+export type TDataImportItems = {
+  teamId: string
 }
 
 export class ItemsService {
   /**
    * Read Items
    * Retrieve items.
+   *
+   * Filter on item_params with `params.<key>=<value>`, `params.<key>[gte]=<value>`
+   * (also gt, lt, lte) and `params.<key>[exists]=true`.
    * @returns ItemsPublic Successful Response
    * @throws ApiError
    */
   public static readItems(
     data: TDataReadItems = {},
   ): CancelablePromise<ItemsPublic> {
-    const { limit = 100, skip = 0 } = data
+    const { countStrategy = "exact", cursor, limit = 100, skip = 0 } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/items/",
       query: {
         skip,
         limit,
+        cursor,
+        count_strategy: countStrategy,
       },
       errors: {
         422: `Validation Error`,
@@ -461,17 +548,20 @@ export class ItemsService {
 
   /**
    * Create Item
-   * Create new item.
+   * Create new item in a team.
    * @returns ItemPublic Successful Response
    * @throws ApiError
    */
   public static createItem(
     data: TDataCreateItem,
   ): CancelablePromise<ItemPublic> {
-    const { requestBody } = data
+    const { requestBody, teamId } = data
     return __request(OpenAPI, {
       method: "POST",
       url: "/api/v1/items/",
+      query: {
+        team_id: teamId,
+      },
       body: requestBody,
       mediaType: "application/json",
       errors: {
@@ -480,6 +570,34 @@ export class ItemsService {
     })
   }
 
+  /**
+   * Search Items
+   * Search items by name, vendor and params, best matches first.
+   *
+   * `q` accepts web search syntax (quoted phrases, `or`, `-word`). Where the
+   * database has pg_trgm and nothing matches `q` as words, item names within
+   * a typo of `q` match instead.
+   * @returns ItemsSearchPublic Successful Response
+   * @throws ApiError
+   */
+  public static searchItems(
+    data: TDataSearchItems,
+  ): CancelablePromise<ItemsSearchPublic> {
+    const { q, limit = 20, teamId } = data
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/items/search",
+      query: {
+        q,
+        team_id: teamId,
+        limit,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    })
+  }
+
   /**
    * Read Item
    * Get item by ID.
@@ -487,12 +605,12 @@ export class ItemsService {
    * @throws ApiError
    */
   public static readItem(data: TDataReadItem): CancelablePromise<ItemPublic> {
-    const { item_id } = data
+    const { itemId } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/items/{item_id}",
       path: {
-        item_id,
+        item_id: itemId,
       },
       errors: {
         422: `Validation Error`,
@@ -509,12 +627,12 @@ export class ItemsService {
   public static updateItem(
     data: TDataUpdateItem,
   ): CancelablePromise<ItemPublic> {
-    const { item_id, requestBody } = data
+    const { itemId, requestBody } = data
     return __request(OpenAPI, {
       method: "PUT",
       url: "/api/v1/items/{item_id}",
       path: {
-        item_id,
+        item_id: itemId,
       },
       body: requestBody,
       mediaType: "application/json",
@@ -531,13 +649,69 @@ export class ItemsService {
    * @throws ApiError
    */
   public static deleteItem(data: TDataDeleteItem): CancelablePromise<Message> {
-    const { item_id, team_id } = data
+    const { itemId } = data
     return __request(OpenAPI, {
       method: "DELETE",
       url: "/api/v1/items/{item_id}",
       path: {
-        item_id,
-        team_id
+        item_id: itemId,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    })
+  }
+
+  /**
+   * Batch Items
+   * Create, update and delete many items of a team in one transaction.
+   *
+   * Every row gets an outcome. Updates and deletes of an item outside the
+   * team, or of an item already named earlier in the batch, fail; when the
+   * batch is `atomic` any failure rejects it whole with a 409.
+   * @returns ItemsBatchPublic Successful Response
+   * @throws ApiError
+   */
+  public static batchItems(
+    data: TDataBatchItems,
+  ): CancelablePromise<ItemsBatchPublic> {
+    const { requestBody, teamId } = data
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/v1/items/batch",
+      query: {
+        team_id: teamId,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    })
+  }
+
+  /**
+   * Import Items
+   * Import items into a team from a CSV (`text/csv`, with a header row) or
+   * NDJSON (`application/x-ndjson`) request body.
+   *
+   * Columns or keys are those of an item, plus an optional `item_id`: rows
+   * with the id of an item of the team replace its fields, other rows create
+   * items. The response streams NDJSON events as the file is read: `error`
+   * for each rejected row, `progress` per chunk and a final `done`, or
+   * `failed` when the file cannot be read and nothing was imported.
+   * @returns unknown Successful Response
+   * @throws ApiError
+   */
+  public static importItems(
+    data: TDataImportItems,
+  ): CancelablePromise<unknown> {
+    const { teamId } = data
+    return __request(OpenAPI, {
+      method: "POST",
+      url: "/api/v1/items/import",
+      query: {
+        team_id: teamId,
       },
       errors: {
         422: `Validation Error`,
@@ -547,6 +721,8 @@ export class ItemsService {
 }
 
 export type TDataReadTeams = {
+  countStrategy?: CountStrategy
+  cursor?: string | null
   limit?: number
   skip?: number
 }
@@ -554,14 +730,44 @@ export type TDataCreateTeam = {
   requestBody: TeamCreate
 }
 export type TDataReadTeam = {
-  team_id: string
+  teamId: string
 }
 export type TDataUpdateTeam = {
-  team_id: string
   requestBody: TeamUpdate
+  teamId: string
 }
 export type TDataDeleteTeam = {
-  team_id: string
+  teamId: string
+}
+export type TDataAddUserToTeam = {
+  requestBody: UserTeamCreate
+  teamId: string
+}
+export type TDataAddUsersToTeam = {
+  requestBody: UserTeamsBulkCreate
+  teamId: string
+}
+export type TDataViewTeamUsers = {
+  teamId: string
+  canEditItems?: boolean | null
+  canEditLabs?: boolean | null
+  canEditUsers?: boolean | null
+  countStrategy?: CountStrategy
+  cursor?: string | null
+  limit?: number
+}
+export type TDataViewUserInTeam = {
+  teamId: string
+  userId: string
+}
+export type TDataRemoveUserFromTeam = {
+  teamId: string
+  userId: string
+}
+export type TDataUpdateUserPermissions = {
+  requestBody: UserTeamCreate
+  teamId: string
+  userId: string
 }
 
 export class TeamsService {
@@ -574,13 +780,15 @@ export class TeamsService {
   public static readTeams(
     data: TDataReadTeams = {},
   ): CancelablePromise<TeamsPublic> {
-    const { limit = 100, skip = 0 } = data
+    const { countStrategy = "exact", cursor, limit = 100, skip = 0 } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/teams/",
       query: {
         skip,
         limit,
+        cursor,
+        count_strategy: countStrategy,
       },
       errors: {
         422: `Validation Error`,
@@ -611,17 +819,17 @@ export class TeamsService {
 
   /**
    * Read Team
-   * Get team by ID.
+   * Retrieve team by ID.
    * @returns TeamPublic Successful Response
    * @throws ApiError
    */
   public static readTeam(data: TDataReadTeam): CancelablePromise<TeamPublic> {
-    const { team_id } = data
+    const { teamId } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/teams/{team_id}",
       path: {
-        team_id,
+        team_id: teamId,
       },
       errors: {
         422: `Validation Error`,
@@ -631,19 +839,19 @@ export class TeamsService {
 
   /**
    * Update Team
-   * Update a team.
+   * Update team by ID.
    * @returns TeamPublic Successful Response
    * @throws ApiError
    */
   public static updateTeam(
     data: TDataUpdateTeam,
   ): CancelablePromise<TeamPublic> {
-    const { team_id, requestBody } = data
+    const { requestBody, teamId } = data
     return __request(OpenAPI, {
       method: "PUT",
       url: "/api/v1/teams/{team_id}",
       path: {
-        team_id,
+        team_id: teamId,
       },
       body: requestBody,
       mediaType: "application/json",
@@ -655,192 +863,240 @@ export class TeamsService {
 
   /**
    * Delete Team
-   * Delete a team.
+   * Delete team by ID.
    * @returns Message Successful Response
    * @throws ApiError
    */
   public static deleteTeam(data: TDataDeleteTeam): CancelablePromise<Message> {
-    const { team_id } = data
+    const { teamId } = data
     return __request(OpenAPI, {
       method: "DELETE",
       url: "/api/v1/teams/{team_id}",
       path: {
-        team_id,
+        team_id: teamId,
       },
       errors: {
         422: `Validation Error`,
       },
     })
   }
-}
-export type TDataViewTeamUsers = {
-  team_id: string;
-}
-
-export type TDataViewTeamUser = {
-  user_id: string;
-  team_id: string;
-}
-
-export type TDataCreateUserTeam = {
-  team_id: string;
-  requestBody: UserTeamCreate;
-};
 
-export type TDataUpdateUserTeam = {
-  team_id: string;
-  user_id: string;
-  requestBody: UpdateUserTeam;
-};
-
-export type TDataDeleteUserTeam = {
-  team_id: string;
-  user_id: string;
-};
-
-export class UserTeamsService {
   /**
-   * Create User Team
-   * Create new user team.
-   * @returns UserWithPermissions Successful Response
+   * Add User To Team
+   * Add a user to a team by providing an email and their permissions.
+   * @returns Message Successful Response
    * @throws ApiError
    */
-  public static viewTeamUsers(
-    data: TDataViewTeamUsers,
-  ): CancelablePromise<UserTeamsPublic> {
-    const { team_id } = data
+  public static addUserToTeam(
+    data: TDataAddUserToTeam,
+  ): CancelablePromise<Message> {
+    const { requestBody, teamId } = data
     return __request(OpenAPI, {
       method: "GET",
-      url: "/api/v1/teams/{team_id}/users",
+      url: "/api/v1/teams/{team_id}/add-users",
       path: {
-        team_id,
+        team_id: teamId,
       },
+      body: requestBody,
+      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
     })
   }
 
-  public static viewTeamUser(
-    data: TDataViewTeamUser,
-  ): CancelablePromise<UserWithPermissions> {
-    const { team_id, user_id } = data
+  /**
+   * Add Users To Team
+   * Add many users to a team at once by email, each with their permissions.
+   *
+   * Unknown emails and existing members are reported rather than rejected.
+   * @returns UserTeamsBulkPublic Successful Response
+   * @throws ApiError
+   */
+  public static addUsersToTeam(
+    data: TDataAddUsersToTeam,
+  ): CancelablePromise<UserTeamsBulkPublic> {
+    const { requestBody, teamId } = data
     return __request(OpenAPI, {
-      method: "GET",
-      url: "/api/v1/teams/{team_id}/users/{user_id}",
+      method: "POST",
+      url: "/api/v1/teams/{team_id}/users",
       path: {
-        team_id,
-        user_id,
+        team_id: teamId,
       },
+      body: requestBody,
+      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
     })
   }
 
-
-  public static createUserTeam(
-    data: TDataCreateUserTeam,
-  ): CancelablePromise<UserWithPermissions> {
-    const { team_id, requestBody } = data;
+  /**
+   * View Team Users
+   * View users in a team.
+   * @returns UserTeamsPublic Successful Response
+   * @throws ApiError
+   */
+  public static viewTeamUsers(
+    data: TDataViewTeamUsers,
+  ): CancelablePromise<UserTeamsPublic> {
+    const {
+      teamId,
+      canEditItems,
+      canEditLabs,
+      canEditUsers,
+      countStrategy = "exact",
+      cursor,
+      limit = 100,
+    } = data
     return __request(OpenAPI, {
-      method: "POST",
-      url: `/api/v1/teams/{team_id}/add-users`,
+      method: "GET",
+      url: "/api/v1/teams/{team_id}/users",
       path: {
-        team_id
+        team_id: teamId,
+      },
+      query: {
+        limit,
+        cursor,
+        can_edit_labs: canEditLabs,
+        can_edit_items: canEditItems,
+        can_edit_users: canEditUsers,
+        count_strategy: countStrategy,
       },
-      body: requestBody,
-      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
-    });
+    })
   }
 
   /**
-   * Update User Team
-   * Update a user team.
+   * View User In Team
+   * View a specific user in a team.
    * @returns UserWithPermissions Successful Response
    * @throws ApiError
    */
-  public static updateUserTeam(
-    data: TDataUpdateUserTeam,
+  public static viewUserInTeam(
+    data: TDataViewUserInTeam,
   ): CancelablePromise<UserWithPermissions> {
-    const { team_id, user_id, requestBody } = data;
+    const { teamId, userId } = data
     return __request(OpenAPI, {
-      method: "PUT",
-      url: `/api/v1/teams/{team_id}/users/{user_id}/update-permissions`,
+      method: "GET",
+      url: "/api/v1/teams/{team_id}/users/{user_id}",
       path: {
-        team_id,
-        user_id,
+        team_id: teamId,
+        user_id: userId,
       },
-      body: requestBody,
-      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
-    });
+    })
   }
 
   /**
-   * Delete User Team
-   * Delete a user team.
+   * Remove User From Team
+   * Remove a user from a team.
    * @returns Message Successful Response
    * @throws ApiError
    */
-  public static deleteUserTeam(
-    data: TDataDeleteUserTeam,
+  public static removeUserFromTeam(
+    data: TDataRemoveUserFromTeam,
   ): CancelablePromise<Message> {
-    const { team_id, user_id } = data
+    const { teamId, userId } = data
     return __request(OpenAPI, {
       method: "DELETE",
       url: "/api/v1/teams/{team_id}/users/{user_id}/remove-user",
       path: {
-        team_id,
-        user_id,
+        team_id: teamId,
+        user_id: userId,
       },
       errors: {
         422: `Validation Error`,
       },
     })
   }
+
+  /**
+   * Update User Permissions
+   * Update user permissions in a team.
+   * @returns Message Successful Response
+   * @throws ApiError
+   */
+  public static updateUserPermissions(
+    data: TDataUpdateUserPermissions,
+  ): CancelablePromise<Message> {
+    const { requestBody, teamId, userId } = data
+    return __request(OpenAPI, {
+      method: "PUT",
+      url: "/api/v1/teams/{team_id}/users/{user_id}/update-permissions",
+      path: {
+        team_id: teamId,
+        user_id: userId,
+      },
+      body: requestBody,
+      mediaType: "application/json",
+      errors: {
+        422: `Validation Error`,
+      },
+    })
+  }
 }
 
 export type TDataReadLabs = {
+  countStrategy?: CountStrategy
+  cursor?: string | null
+  labPlace?: string | null
+  labUniversity?: string | null
   limit?: number
   skip?: number
+  teamId?: string | null
 }
 export type TDataCreateLab = {
   requestBody: LabCreate
+  teamId: string
 }
 export type TDataReadLab = {
-  lab_id: string
+  labId: string
 }
 export type TDataUpdateLab = {
-  lab_id: string
+  labId: string
   requestBody: LabUpdate
 }
 export type TDataDeleteLab = {
-  lab_id: string
+  labId: string
 }
 
 export class LabsService {
   /**
    * Read Labs
    * Retrieve labs.
+   *
+   * Lists the labs of `team_id`, or of every team the caller belongs to.
    * @returns LabsPublic Successful Response
    * @throws ApiError
    */
   public static readLabs(
     data: TDataReadLabs = {},
   ): CancelablePromise<LabsPublic> {
-    const { limit = 100, skip = 0 } = data
+    const {
+      countStrategy = "exact",
+      cursor,
+      labPlace,
+      labUniversity,
+      limit = 100,
+      skip = 0,
+      teamId,
+    } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/labs/",
       query: {
+        team_id: teamId,
+        lab_university: labUniversity,
+        lab_place: labPlace,
         skip,
         limit,
+        cursor,
+        count_strategy: countStrategy,
       },
       errors: {
         422: `Validation Error`,
@@ -854,13 +1110,14 @@ export class LabsService {
    * @returns LabPublic Successful Response
    * @throws ApiError
    */
-  public static createLab(
-    data: TDataCreateLab,
-  ): CancelablePromise<LabPublic> {
-    const { requestBody } = data
+  public static createLab(data: TDataCreateLab): CancelablePromise<LabPublic> {
+    const { requestBody, teamId } = data
     return __request(OpenAPI, {
       method: "POST",
       url: "/api/v1/labs/",
+      query: {
+        team_id: teamId,
+      },
       body: requestBody,
       mediaType: "application/json",
       errors: {
@@ -876,12 +1133,12 @@ export class LabsService {
    * @throws ApiError
    */
   public static readLab(data: TDataReadLab): CancelablePromise<LabPublic> {
-    const { lab_id } = data
+    const { labId } = data
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/labs/{lab_id}",
       path: {
-        lab_id,
+        lab_id: labId,
       },
       errors: {
         422: `Validation Error`,
@@ -895,15 +1152,13 @@ export class LabsService {
    * @returns LabPublic Successful Response
    * @throws ApiError
    */
-  public static updateLab(
-    data: TDataUpdateLab,
-  ): CancelablePromise<LabPublic> {
-    const { lab_id, requestBody } = data
+  public static updateLab(data: TDataUpdateLab): CancelablePromise<LabPublic> {
+    const { labId, requestBody } = data
     return __request(OpenAPI, {
       method: "PUT",
       url: "/api/v1/labs/{lab_id}",
       path: {
-        lab_id,
+        lab_id: labId,
       },
       body: requestBody,
       mediaType: "application/json",
@@ -920,12 +1175,12 @@ export class LabsService {
    * @throws ApiError
    */
   public static deleteLab(data: TDataDeleteLab): CancelablePromise<Message> {
-    const { lab_id } = data
+    const { labId } = data
     return __request(OpenAPI, {
       method: "DELETE",
       url: "/api/v1/labs/{lab_id}",
       path: {
-        lab_id,
+        lab_id: labId,
       },
       errors: {
         422: `Validation Error`,
@@ -934,42 +1189,29 @@ export class LabsService {
   }
 }
 
-export type TDataReadUserItems = {
-  limit?: number
-  skip?: number
-}
-export type TDataCreateUserItem = {
-  requestBody: UserItemCreate
-}
-export type TDataReadUserItem = {
-  user_item_id: string
+export type TDataCheckoutItem = {
+  requestBody: UserItemCheckout
 }
-export type TDataUpdateUserItem = {
-  user_item_id: string
-  requestBody: UserItemUpdate
-}
-export type TDataDeleteUserItem = {
-  user_item_id: string
+export type TDataReturnItem = {
+  userItemId: string
 }
 
 export class UserItemsService {
   /**
-   * Read User Items
-   * Retrieve user items.
-   * @returns UserItemsPublic Successful Response
+   * Checkout Item
+   * Borrow one unit of an item into a lab of the same team.
+   * @returns UserItemPublic Successful Response
    * @throws ApiError
    */
-  public static readUserItems(
-    data: TDataReadUserItems = {},
-  ): CancelablePromise<UserItemsPublic> {
-    const { limit = 100, skip = 0 } = data
+  public static checkoutItem(
+    data: TDataCheckoutItem,
+  ): CancelablePromise<UserItemPublic> {
+    const { requestBody } = data
     return __request(OpenAPI, {
-      method: "GET",
-      url: "/api/v1/user-items/",
-      query: {
-        skip,
-        limit,
-      },
+      method: "POST",
+      url: "/api/v1/user-items/checkout",
+      body: requestBody,
+      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
@@ -977,41 +1219,60 @@ export class UserItemsService {
   }
 
   /**
-   * Create User Item
-   * Create new user item.
+   * Return Item
+   * Return a borrowed item.
+   *
+   * Allowed for the borrower and for team members who can edit items.
    * @returns UserItemPublic Successful Response
    * @throws ApiError
    */
-  public static createUserItem(
-    data: TDataCreateUserItem,
+  public static returnItem(
+    data: TDataReturnItem,
   ): CancelablePromise<UserItemPublic> {
-    const { requestBody } = data
+    const { userItemId } = data
     return __request(OpenAPI, {
       method: "POST",
-      url: "/api/v1/user-items/",
-      body: requestBody,
-      mediaType: "application/json",
+      url: "/api/v1/user-items/{user_item_id}/return",
+      path: {
+        user_item_id: userItemId,
+      },
       errors: {
         422: `Validation Error`,
       },
     })
   }
+}
 
+export type TDataExportUsers = {
+  format?: ExportFormat
+  gzip?: boolean
+}
+export type TDataExportItems = {
+  format?: ExportFormat
+  gzip?: boolean
+}
+export type TDataExportUserItems = {
+  format?: ExportFormat
+  gzip?: boolean
+}
+
+export class ExportsService {
   /**
-   * Read User Item
-   * Get user item by ID.
-   * @returns UserItemPublic Successful Response
+   * Export Users
+   * Export every user as NDJSON or CSV, optionally gzipped.
+   * @returns unknown Successful Response
    * @throws ApiError
    */
-  public static readUserItem(
-    data: TDataReadUserItem,
-  ): CancelablePromise<UserItemPublic> {
-    const { user_item_id } = data
+  public static exportUsers(
+    data: TDataExportUsers = {},
+  ): CancelablePromise<unknown> {
+    const { format = "ndjson", gzip = false } = data
     return __request(OpenAPI, {
       method: "GET",
-      url: "/api/v1/user-items/{user_item_id}",
-      path: {
-        user_item_id,
+      url: "/api/v1/exports/users",
+      query: {
+        format,
+        gzip,
       },
       errors: {
         422: `Validation Error`,
@@ -1020,23 +1281,24 @@ export class UserItemsService {
   }
 
   /**
-   * Update User Item
-   * Update a user item.
-   * @returns UserItemPublic Successful Response
+   * Export Items
+   * Export every item as NDJSON or CSV, optionally gzipped.
+   *
+   * The CSV can be imported back through POST /items/import.
+   * @returns unknown Successful Response
    * @throws ApiError
    */
-  public static updateUserItem(
-    data: TDataUpdateUserItem,
-  ): CancelablePromise<UserItemPublic> {
-    const { user_item_id, requestBody } = data
+  public static exportItems(
+    data: TDataExportItems = {},
+  ): CancelablePromise<unknown> {
+    const { format = "ndjson", gzip = false } = data
     return __request(OpenAPI, {
-      method: "PUT",
-      url: "/api/v1/user-items/{user_item_id}",
-      path: {
-        user_item_id,
+      method: "GET",
+      url: "/api/v1/exports/items",
+      query: {
+        format,
+        gzip,
       },
-      body: requestBody,
-      mediaType: "application/json",
       errors: {
         422: `Validation Error`,
       },
@@ -1044,24 +1306,25 @@ export class UserItemsService {
   }
 
   /**
-   * Delete User Item
-   * Delete a user item.
-   * @returns Message Successful Response
+   * Export User Items
+   * Export every loan as NDJSON or CSV, optionally gzipped.
+   * @returns unknown Successful Response
    * @throws ApiError
    */
-  public static deleteUserItem(
-    data: TDataDeleteUserItem,
-  ): CancelablePromise<Message> {
-    const { user_item_id } = data
+  public static exportUserItems(
+    data: TDataExportUserItems = {},
+  ): CancelablePromise<unknown> {
+    const { format = "ndjson", gzip = false } = data
     return __request(OpenAPI, {
-      method: "DELETE",
-      url: "/api/v1/user-items/{user_item_id}",
-      path: {
-        user_item_id,
+      method: "GET",
+      url: "/api/v1/exports/user-items",
+      query: {
+        format,
+        gzip,
       },
       errors: {
         422: `Validation Error`,
       },
     })
   }
-}
\ No newline at end of file
+}
@@ -9,11 +9,11 @@ import {
 import { BsThreeDotsVertical } from "react-icons/bs"
 import { FiEdit, FiTrash } from "react-icons/fi"
 
-import type { ItemPublic, TeamPublic, UserPublic, UserTeam } from "../../client"
+import type { ItemPublic, TeamPublic, UserPublic } from "../../client"
 import EditUser from "../Admin/EditUser"
 import EditItem from "../Items/EditItem"
 import EditTeam from "../Teams/EditTeam"
-import EditUserTeam from "../UserTeam/EditUserTeam"
+import EditUserTeam, { type UserTeam } from "../UserTeam/EditUserTeam"
 import Delete from "./DeleteAlert"
 
 interface ActionsMenuProps {
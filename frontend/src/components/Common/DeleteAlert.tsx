@@ -10,7 +10,7 @@ import { useMutation, useQueryClient } from "@tanstack/react-query"
 import React from "react"
 import { useForm } from "react-hook-form"
 
-import { ItemsService, UsersService, TeamsService, UserTeamsService } from "../../client"
+import { ItemsService, UsersService, TeamsService } from "../../client"
 import useCustomToast from "../../hooks/useCustomToast"
 
 interface DeleteProps {
@@ -33,25 +33,25 @@ const Delete = ({ type, user_id, team_id, item_id, isOpen, onClose }: DeleteProp
 
   const deleteEntity = async () => {
     if (type === "Item") {
-      if (!item_id || !team_id) {
-        throw new Error("Item ID and Team ID are required for deleting an item.")
+      if (!item_id) {
+        throw new Error("Item ID is required for deleting an item.")
       }
-      await ItemsService.deleteItem({ item_id, team_id })
+      await ItemsService.deleteItem({ itemId: item_id })
     } else if (type === "User") {
       if (!user_id) {
         throw new Error("User ID is required for deleting a user.")
       }
-      await UsersService.deleteUser({ user_id })
+      await UsersService.deleteUser({ userId: user_id })
     } else if (type === "Lab") {
       if (!team_id) {
         throw new Error("Lab ID is required for deleting a lab.")
       }
-      await TeamsService.deleteTeam({ team_id })
+      await TeamsService.deleteTeam({ teamId: team_id })
     } else if (type === "UserTeam") {
       if (!user_id || !team_id) {
         throw new Error("User ID and Team ID are required for deleting a user team.")
       }
-      await UserTeamsService.deleteUserTeam({ user_id, team_id })
+      await TeamsService.removeUserFromTeam({ teamId: team_id, userId: user_id })
     } else {
       throw new Error(`Unexpected type: ${type}`)
     }
@@ -17,14 +17,17 @@ import { type SubmitHandler, useForm } from "react-hook-form"
 
 import { type ApiError, type ItemCreate, ItemsService } from "../../client"
 import useCustomToast from "../../hooks/useCustomToast"
-import { handleError } from "../../utils"
+import { handleError, parseParams } from "../../utils"
+
+type ItemForm = Omit<ItemCreate, "item_params"> & { item_params?: string }
 
 interface AddItemProps {
   isOpen: boolean
   onClose: () => void
+  team_id?: string
 }
 
-const AddItem = ({ isOpen, onClose }: AddItemProps) => {
+const AddItem = ({ isOpen, onClose, team_id }: AddItemProps) => {
   const queryClient = useQueryClient()
   const showToast = useCustomToast()
   const {
@@ -32,7 +35,7 @@ const AddItem = ({ isOpen, onClose }: AddItemProps) => {
     handleSubmit,
     reset,
     formState: { errors, isSubmitting },
-  } = useForm<ItemCreate>({
+  } = useForm<ItemForm>({
     mode: "onBlur",
     criteriaMode: "all",
     defaultValues: {
@@ -45,8 +48,12 @@ const AddItem = ({ isOpen, onClose }: AddItemProps) => {
   })
 
   const mutation = useMutation({
-    mutationFn: (data: ItemCreate) =>
-      ItemsService.createItem({ requestBody: data }),
+    mutationFn: (data: ItemCreate) => {
+      if (!team_id) {
+        throw new Error("Team ID is required for creating an item.")
+      }
+      return ItemsService.createItem({ teamId: team_id, requestBody: data })
+    },
     onSuccess: () => {
       showToast("Success!", "Item created successfully.", "success")
       reset()
@@ -60,8 +67,8 @@ const AddItem = ({ isOpen, onClose }: AddItemProps) => {
     },
   })
 
-  const onSubmit: SubmitHandler<ItemCreate> = (data) => {
-    mutation.mutate(data)
+  const onSubmit: SubmitHandler<ItemForm> = (data) => {
+    mutation.mutate({ ...data, item_params: parseParams(data.item_params) })
   }
 
   return (
@@ -22,7 +22,9 @@ import {
   ItemsService,
 } from "../../client"
 import useCustomToast from "../../hooks/useCustomToast"
-import { handleError } from "../../utils"
+import { formatParams, handleError, parseParams } from "../../utils"
+
+type ItemForm = Omit<ItemUpdate, "item_params"> & { item_params?: string }
 
 interface EditItemProps {
   item: ItemPublic
@@ -38,7 +40,7 @@ const EditItem = ({ item, isOpen, onClose }: EditItemProps) => {
     handleSubmit,
     reset,
     formState: { isSubmitting, errors, isDirty },
-  } = useForm<ItemUpdate>({
+  } = useForm<ItemForm>({
     mode: "onBlur",
     criteriaMode: "all",
     defaultValues: {
@@ -46,13 +48,13 @@ const EditItem = ({ item, isOpen, onClose }: EditItemProps) => {
       quantity: item.quantity,
       item_img_url: item.item_img_url,
       item_vendor: item.item_vendor,
-      item_params: item.item_params,
+      item_params: formatParams(item.item_params),
     },
   })
 
   const mutation = useMutation({
     mutationFn: (data: ItemUpdate) =>
-      ItemsService.updateItem({ item_id: item.item_id, requestBody: data }),
+      ItemsService.updateItem({ itemId: item.item_id, requestBody: data }),
     onSuccess: () => {
       showToast("Success!", "Item updated successfully.", "success")
       onClose()
@@ -65,8 +67,8 @@ const EditItem = ({ item, isOpen, onClose }: EditItemProps) => {
     },
   })
 
-  const onSubmit: SubmitHandler<ItemUpdate> = async (data) => {
-    mutation.mutate(data)
+  const onSubmit: SubmitHandler<ItemForm> = async (data) => {
+    mutation.mutate({ ...data, item_params: parseParams(data.item_params) })
   }
 
   const onCancel = () => {
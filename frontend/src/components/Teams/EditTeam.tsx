@@ -46,7 +46,7 @@ import {
   
     const mutation = useMutation({
       mutationFn: (data: TeamPublic) =>
-        TeamsService.updateTeam({ team_id: team.team_id, requestBody: data }),
+        TeamsService.updateTeam({ teamId: team.team_id, requestBody: data }),
       onSuccess: () => {
         showToast("Success!", "Team updated successfully.", "success")
         onClose()
@@ -16,7 +16,7 @@ import {
   import { useMutation, useQueryClient } from "@tanstack/react-query"
   import { type SubmitHandler, useForm } from "react-hook-form"
   
-  import { type ApiError, type UserTeamCreate, UserTeamsService } from "../../client"
+  import { type ApiError, TeamsService, type UserTeamCreate } from "../../client"
   import useCustomToast from "../../hooks/useCustomToast"
   import { handleError } from "../../utils"
   
@@ -47,7 +47,7 @@ import {
   
     const mutation = useMutation({
       mutationFn: (data: UserTeamCreate) => {
-          return UserTeamsService.createUserTeam({ team_id: teamId, requestBody: data });
+          return TeamsService.addUserToTeam({ teamId, requestBody: data });
       },
       onSuccess: () => {
           showToast("Success!", "User added to Team successfully.", "success");
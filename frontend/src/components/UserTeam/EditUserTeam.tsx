@@ -16,13 +16,16 @@ import {
   
   import {
     type ApiError,
-    type UpdateUserTeam,
-    UserTeamsService,
-    UserTeam,
+    TeamsService,
+    type UserTeamCreate,
+    type UserWithPermissions,
   } from "../../client"
   import useCustomToast from "../../hooks/useCustomToast"
   import { handleError } from "../../utils"
   
+  export type UserTeam = UserWithPermissions & { team_id: string }
+  type UpdateUserTeam = Omit<UserTeamCreate, "email">
+  
   interface UpdateUserTeamProps {
     userteam: UserTeam
     isOpen: boolean
@@ -46,7 +49,7 @@ import {
   
     const mutation = useMutation({
       mutationFn: (data: UpdateUserTeam) =>
-        UserTeamsService.updateUserTeam({ team_id: userteam.team_id, user_id: userteam.user_id, requestBody: data }),
+        TeamsService.updateUserPermissions({ teamId: userteam.team_id, userId: userteam.user_id, requestBody: { ...data, email: userteam.email } }),
       onSuccess: () => {
         showToast("Success!", "User permissions updated successfully.", "success")
         onClose()
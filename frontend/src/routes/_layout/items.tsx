@@ -21,6 +21,7 @@ import { ItemsService } from "../../client"
 import ActionsMenu from "../../components/Common/ActionsMenu"
 import Navbar from "../../components/Common/Navbar"
 import AddItem from "../../components/Items/AddItem"
+import { formatParams } from "../../utils"
 
 const itemsSearchSchema = z.object({
   page: z.number().catch(1),
@@ -107,7 +108,7 @@ function ItemsTable() {
                     {item.item_vendor || "N/A"}
                   </Td>
                   <Td isTruncated maxWidth="150px">
-                    {item.item_params || "N/A"}
+                    {formatParams(item.item_params) || "N/A"}
                   </Td>
                   <Td>
                     <ActionsMenu type={"Item"} value={item} />
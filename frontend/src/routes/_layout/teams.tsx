@@ -39,7 +39,7 @@ function getTeamsQueryOptions() {
 
 function getUserQueryOptions({ owner_id }: { owner_id: string }) {
   return {
-    queryFn: () => UsersService.readUserById({ user_id: owner_id }),
+    queryFn: () => UsersService.readUserById({ userId: owner_id }),
     queryKey: ["user", { owner_id }],
   }
 }
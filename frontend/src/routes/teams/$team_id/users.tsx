@@ -15,7 +15,7 @@ import {
   import { createFileRoute } from "@tanstack/react-router";
   import { z } from "zod";
   
-  import { UserTeamsService, UserPublic, UserWithPermissions } from "../../../client";
+  import { TeamsService, UserPublic, UserWithPermissions } from "../../../client";
   import Navbar from "../../../components/Common/Navbar";
   import AddUserTeam from "../../../components/UserTeam/AddUserTeam";
   import ActionsMenu from "../../../components/Common/ActionsMenu";
@@ -34,7 +34,7 @@ import {
     return {
       queryFn: () => {
         console.log("y", team_id);
-        return UserTeamsService.viewTeamUsers({ team_id });
+        return TeamsService.viewTeamUsers({ teamId: team_id });
       },
       queryKey: ["teams", team_id],
     };
@@ -44,7 +44,7 @@ import {
     return {
       queryFn: () => {
         console.log("x", user_id, "and team_id:", team_id);
-        return UserTeamsService.viewTeamUser({ team_id, user_id });
+        return TeamsService.viewUserInTeam({ teamId: team_id, userId: user_id });
       },
       queryKey: ["teams", team_id, "users", user_id],
     };
@@ -79,8 +79,7 @@ import {
             </Card>
           ))
         ) : (
-          Array.isArray(users) &&
-          users.map((user: UserWithPermissions) => (
+          users?.data.map((user: UserWithPermissions) => (
             <UserLabCard key={user.user_id} user={user} currentUser={currentUser} />
           ))
         )}
@@ -51,3 +51,28 @@ export const handleError = (err: ApiError, showToast: any) => {
   }
   showToast("Error", errorMessage, "error")
 }
+
+export type ItemParams = { [key: string]: unknown }
+
+// Item params are edited as "voltage=5, size=M"
+export const formatParams = (params?: ItemParams | null): string =>
+  params
+    ? Object.entries(params)
+        .map(
+          ([key, value]) =>
+            `${key}=${typeof value === "string" ? value : JSON.stringify(value)}`,
+        )
+        .join(", ")
+    : ""
+
+export const parseParams = (text?: string | null): ItemParams | null => {
+  const params: ItemParams = {}
+  for (const part of (text ?? "").split(/[,;]/)) {
+    const [key, ...rest] = part.split("=")
+    if (!key.trim()) continue
+    const value = rest.join("=").trim()
+    params[key.trim()] =
+      value !== "" && !Number.isNaN(Number(value)) ? Number(value) : value
+  }
+  return Object.keys(params).length ? params : null
+}